@@ -15,10 +15,15 @@ from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.responses import Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
+from ..core.media.clip_extractor import ClipExtractor
+from ..core.media.ffmpeg_builders import PREVIEW_DIR_NAME
+from ..core.media.keyframe_index import KeyframeIndex
+
 dotenv_path = find_dotenv()
 load_dotenv(dotenv_path)
 CUSTOM_VIDEO_ROOT_DIR = os.getenv("CUSTOM_VIDEO_ROOT_DIR")
 VIDEO_API_PORT = os.getenv("VIDEO_API_PORT") or 6007
+CLIP_MAX_WORKERS = int(os.getenv("CLIP_MAX_WORKERS") or 2)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -30,6 +35,23 @@ os.makedirs(VIDEO_DIR, exist_ok=True)
 VIDEO_META_CACHE = TTLCache(maxsize=50, ttl=300)
 CHUNK_CACHE = TTLCache(maxsize=25, ttl=60)
 
+# Rolling HLS windows written by active recordings, see TeeCommandBuilder
+LIVE_PREVIEW_DIR = VIDEO_DIR / PREVIEW_DIR_NAME
+LIVE_PLAYLIST_CACHE = TTLCache(maxsize=100, ttl=1)
+# Bounded by the total size of the cached segments, viewers mostly request the last few of each recording
+LIVE_SEGMENT_CACHE = TTLCache(maxsize=64 * 1024 * 1024, ttl=30, getsizeof=len)
+LIVE_READ_LOCKS: dict[str, asyncio.Lock] = {}
+LIVE_CONTENT_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".ts": "video/mp2t",
+}
+SEEK_CONTENT_TYPES = {
+    ".flv": "video/x-flv",
+    ".ts": "video/mp2t",
+}
+KEYFRAME_INDEX_CACHE = TTLCache(maxsize=50, ttl=300)
+CLIP_EXTRACTOR = ClipExtractor.get_instance(max_workers=CLIP_MAX_WORKERS)
+
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
@@ -59,11 +81,78 @@ def validate_filename(filename: str):
         raise HTTPException(status_code=400, detail="Invalid filename")
 
 
+def resolve_video_path(filename: str, subfolder: str | None) -> Path:
+    try:
+        validate_filename(filename)
+        if subfolder:
+            video_path = VIDEO_DIR / subfolder / filename
+        else:
+            video_path = VIDEO_DIR / filename
+
+    except Exception as e:
+        logger.exception("Invalid filename or subfolder")
+        raise e
+
+    # Prevent path traversal attacks, '..' in the subfolder and symlinks are only caught on the resolved paths
+    try:
+        video_path.resolve().relative_to(VIDEO_DIR.resolve())
+    except ValueError:
+        logger.exception(f"Path traversal attempt: {video_path}")
+        raise HTTPException(status_code=400, detail="Invalid file path")
+
+    if not video_path.is_file():
+        logger.error(f"File not found: {video_path}")
+        raise HTTPException(status_code=404, detail="Video file not found")
+    return video_path
+
+
+async def get_keyframe_index(video_path: Path) -> KeyframeIndex | None:
+    """Load the keyframe sidecar of a FLV/TS recording, building it on first use for older recordings."""
+    if not KeyframeIndex.is_supported(str(video_path)):
+        return None
+    stat = video_path.stat()
+    cache_key = f"{video_path}-{stat.st_mtime_ns}-{stat.st_size}"
+    index = KEYFRAME_INDEX_CACHE.get(cache_key)
+    if index is None:
+        index = await asyncio.to_thread(KeyframeIndex.load_or_build, str(video_path))
+        if index is not None:
+            KEYFRAME_INDEX_CACHE[cache_key] = index
+    return index
+
+
+@app.get("/api/videos/keyframes")
+async def get_video_keyframe(
+        filename: str = Query(...),
+        subfolder: str | None = None,
+        t: float = Query(0.0, ge=0)
+):
+    """
+    Byte range of the keyframe at or before time t (seconds), so a player can issue a Range request
+    starting at offset, prefixed with the first header_size bytes of the file.
+    """
+    video_path = resolve_video_path(filename, subfolder)
+    index = await get_keyframe_index(video_path)
+    if not index or not index.entries:
+        raise HTTPException(status_code=404, detail="Keyframe index not available")
+
+    timestamp, offset = index.lookup(t)
+    next_keyframe = index.lookup_next(t)
+    return {
+        "timestamp": timestamp / 1000,
+        "offset": offset,
+        "next_offset": next_keyframe[1] if next_keyframe else None,
+        "header_size": index.header_size,
+        "duration": index.duration,
+        "file_size": video_path.stat().st_size,
+    }
+
+
 @app.get("/api/videos")
 async def get_video(
         request: Request,
         filename: str = Query(...),
-        subfolder: str | None = None
+        subfolder: str | None = None,
+        start: float | None = Query(None, ge=0)
 ):
 
     cache_key = f"{filename}-{subfolder}"
@@ -79,27 +168,20 @@ async def get_video(
             if datetime.strptime(if_modified_since, "%a, %d %b %Y %H:%M:%S GMT") >= last_modified:
                 return Response(status_code=304)
 
-    try:
-        validate_filename(filename)
-        if subfolder:
-            video_path = VIDEO_DIR / subfolder / filename
-        else:
-            video_path = VIDEO_DIR / filename
-
-    except Exception as e:
-        logger.exception("Invalid filename or subfolder")
-        raise e
-
-    if not video_path.is_file():
-        logger.error(f"File not found: {video_path}")
-        raise HTTPException(status_code=404, detail="Video file not found")
-
-    # Prevent path traversal attacks
-    try:
-        video_path.relative_to(VIDEO_DIR)
-    except ValueError:
-        logger.exception(f"Path traversal attempt: {video_path}")
-        raise HTTPException(status_code=400, detail="Invalid file path")
+    video_path = resolve_video_path(filename, subfolder)
+
+    if start is not None:
+        # Play from the keyframe before start: the file header followed by everything from that keyframe
+        index = await get_keyframe_index(video_path)
+        if index and index.entries:
+            timestamp, offset = index.lookup(start)
+            file_size = video_path.stat().st_size
+            headers = {
+                "Content-Length": str(index.header_size + file_size - offset),
+                "Content-Type": SEEK_CONTENT_TYPES.get(video_path.suffix.lower(), "video/mp4"),
+                "X-Keyframe-Timestamp": str(timestamp / 1000),
+            }
+            return StreamingResponse(file_sender_from_keyframe(video_path, index.header_size, offset), headers=headers)
 
     stat = video_path.stat()
     file_size = stat.st_size
@@ -150,6 +232,97 @@ async def get_video(
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+def serialize_clip_job(job: dict) -> dict:
+    """Job state with paths relative to the video directory, the clip can be fetched from /api/videos."""
+    result = None
+    if job["result"]:
+        clip_path = Path(job["result"]["output_path"]).relative_to(VIDEO_DIR)
+        result = {
+            "filename": clip_path.name,
+            "subfolder": clip_path.parent.as_posix() if clip_path.parent != Path(".") else None,
+            "start": job["result"]["start"],
+            "end": job["result"]["end"],
+            "bytes": job["result"]["bytes"],
+        }
+    return {"id": job["id"], "status": job["status"], "result": result, "error": job["error"]}
+
+
+@app.post("/api/clips", status_code=202)
+async def create_clip(
+        filename: str = Query(...),
+        subfolder: str | None = None,
+        start: float = Query(..., ge=0),
+        end: float = Query(..., gt=0)
+):
+    """Queue a lossless clip of a FLV/TS recording, poll /api/clips/{job_id} for the result."""
+    video_path = resolve_video_path(filename, subfolder)
+    if not KeyframeIndex.is_supported(str(video_path)):
+        raise HTTPException(status_code=400, detail="Clips are only supported for FLV and TS files")
+    if end <= start:
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+
+    job = CLIP_EXTRACTOR.submit(str(video_path), start, end)
+    return serialize_clip_job(job)
+
+
+@app.get("/api/clips/{job_id}")
+async def get_clip(job_id: str):
+    job = CLIP_EXTRACTOR.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Clip job not found")
+    return serialize_clip_job(job)
+
+
+@app.get("/api/live/{rec_id}/{name}")
+async def get_live_preview(rec_id: str, name: str):
+    """
+    Serve the local HLS window of an active recording. Every viewer shares the files written by the
+    recorder, and concurrent requests for the same file are coalesced into a single disk read.
+    """
+    validate_filename(rec_id)
+    validate_filename(name)
+    suffix = Path(name).suffix.lower()
+    content_type = LIVE_CONTENT_TYPES.get(suffix)
+    if not content_type:
+        raise HTTPException(status_code=400, detail="Invalid preview file")
+
+    file_path = LIVE_PREVIEW_DIR / rec_id / name
+    try:
+        file_path.resolve().relative_to(LIVE_PREVIEW_DIR.resolve())
+        stat = file_path.stat()
+    except ValueError:
+        logger.exception(f"Path traversal attempt: {file_path}")
+        raise HTTPException(status_code=400, detail="Invalid file path")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Live preview not found")
+
+    is_playlist = suffix == ".m3u8"
+    cache = LIVE_PLAYLIST_CACHE if is_playlist else LIVE_SEGMENT_CACHE
+    cache_key = f"{rec_id}/{name}-{stat.st_mtime_ns}-{stat.st_size}"
+    content = cache.get(cache_key)
+    if content is None:
+        lock = LIVE_READ_LOCKS.setdefault(cache_key, asyncio.Lock())
+        try:
+            async with lock:
+                content = cache.get(cache_key)
+                if content is None:
+                    try:
+                        async with aiofiles.open(file_path, "rb") as file:
+                            content = await file.read()
+                    except FileNotFoundError:
+                        raise HTTPException(status_code=404, detail="Live preview not found")
+                    if cache.getsizeof(content) <= cache.maxsize:
+                        cache[cache_key] = content
+        finally:
+            LIVE_READ_LOCKS.pop(cache_key, None)
+
+    headers = {
+        "Cache-Control": "no-cache" if is_playlist else "public, max-age=60",
+        "Content-Length": str(len(content)),
+    }
+    return Response(content=content, media_type=content_type, headers=headers)
+
+
 # Async file sender (full content)
 async def file_sender(video_path: Path):
     async with aiofiles.open(video_path, "rb") as file:
@@ -160,6 +333,19 @@ async def file_sender(video_path: Path):
             yield chunk
 
 
+# Async file sender (file header followed by the content from a keyframe)
+async def file_sender_from_keyframe(video_path: Path, header_size: int, offset: int):
+    async with aiofiles.open(video_path, "rb") as file:
+        if header_size:
+            yield await file.read(header_size)
+        await file.seek(offset)
+        while True:
+            chunk = await file.read(65536)
+            if not chunk:
+                break
+            yield chunk
+
+
 # Async file sender (range content)
 async def file_sender_range(video_path: Path, start: int, end: int):
     cache_key = f"{video_path.name}-{start}-{end}"
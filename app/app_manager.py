@@ -5,9 +5,11 @@ import flet as ft
 
 from . import execute_dir
 from .core.config.config_manager import ConfigManager
+from .core.config.config_watcher import ConfigWatcher
 from .core.config.language_manager import LanguageManager
+from .core.media.clip_extractor import ClipExtractor
 from .core.recording.record_manager import RecordingManager
-from .core.runtime.process_manager import AsyncProcessManager
+from .core.runtime.process_manager import AsyncProcessManager, ProcessRole
 from .core.update.update_checker import UpdateChecker
 from .initialization.installation_manager import InstallationManager
 from .ui.components.business.recording_card import RecordingCardManager
@@ -29,6 +31,7 @@ class App:
         self.run_path = execute_dir
         self.assets_dir = os.path.join(execute_dir, "assets")
         self.process_manager = AsyncProcessManager()
+        self.clip_extractor = ClipExtractor.get_instance()
         self.config_manager = ConfigManager(self.run_path)
         self.is_web_mode = False
         self.auth_manager = None
@@ -72,8 +75,10 @@ class App:
         self.recording_enabled = True
         self.install_manager = InstallationManager(self)
         self.update_checker = UpdateChecker(self)
+        self.config_watcher = ConfigWatcher.get_instance(self.config_manager)
         self.page.run_task(self.install_manager.check_env)
         self.page.run_task(self.record_manager.check_free_space)
+        self.page.run_task(self.record_manager.recover_interrupted_recordings)
         self.page.run_task(self._check_for_updates)
 
     def initialize_pages(self):
@@ -112,8 +117,8 @@ class App:
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
 
-    def add_ffmpeg_process(self, process):
-        self.process_manager.add_process(process)
+    def add_ffmpeg_process(self, process, role: str = ProcessRole.RECORD, rec_id: str | None = None):
+        self.process_manager.add_process(process, role, rec_id)
 
     async def _check_for_updates(self):
         """Check for updates when the application starts"""
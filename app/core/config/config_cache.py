@@ -0,0 +1,82 @@
+import copy
+import json
+import os
+import threading
+
+
+class ConfigCache:
+    """
+    Parsed JSON config files shared by every ConfigManager and its callers. A file is parsed again only
+    when its mtime, inode or size changed, so repeated reads cost a single stat call.
+    The returned objects are shared and must not be modified, ConfigManager hands copies to the callers
+    that edit a config before saving it.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        # path -> signature of the file after the app last saved it
+        self.saved_signatures = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_signature(path: str) -> tuple[int, int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_ino, stat.st_size
+
+    def load(self, path: str):
+        """Return the parsed content of a JSON file, raises like open() and json.load() do."""
+        path = os.path.abspath(path)
+        signature = self.get_signature(path)
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        with self.lock:
+            self.entries[path] = (signature, data)
+            self.misses += 1
+        return data
+
+    def refresh(self, path: str, data) -> None:
+        """
+        Keep a copy of the data that was just saved to a file, so the next read does not parse it again.
+        The saver keeps editing its own object, so the cache must not share it.
+        """
+        path = os.path.abspath(path)
+        with self.lock:
+            try:
+                signature = self.get_signature(path)
+            except OSError:
+                self.entries.pop(path, None)
+                self.saved_signatures.pop(path, None)
+                return
+            self.saved_signatures[path] = signature
+            if path in self.entries:
+                self.entries[path] = (signature, copy.deepcopy(data))
+
+    def is_saved_by_app(self, path: str) -> bool:
+        """Whether the file is unchanged since the app last saved it."""
+        path = os.path.abspath(path)
+        try:
+            signature = self.get_signature(path)
+        except OSError:
+            return False
+        with self.lock:
+            return self.saved_signatures.get(path) == signature
+
+    def invalidate(self, path: str | None = None) -> None:
+        with self.lock:
+            if path is None:
+                self.entries.clear()
+                self.saved_signatures.clear()
+            else:
+                self.entries.pop(os.path.abspath(path), None)
+                self.saved_signatures.pop(os.path.abspath(path), None)
+
+
+config_cache = ConfigCache()
@@ -1,3 +1,4 @@
+import copy
 import json
 import os
 import shutil
@@ -5,7 +6,9 @@ from typing import TypeVar
 
 import aiofiles
 
+from ...utils import utils
 from ...utils.logger import logger
+from .config_cache import config_cache
 
 T = TypeVar("T")
 
@@ -19,8 +22,12 @@ class ConfigManager:
         self.cookies_config_path = os.path.join(self.config_path, "cookies.json")
         self.about_config_path = os.path.join(self.config_path, "version.json")
         self.recordings_config_path = os.path.join(self.config_path, "recordings.json")
+        self.recordings_journal_path = os.path.join(self.config_path, "recordings.journal.jsonl")
+        self.recordings_db_path = os.path.join(self.config_path, "recordings.db")
         self.accounts_config_path = os.path.join(self.config_path, "accounts.json")
         self.web_auth_config_path = os.path.join(self.config_path, "web_auth.json")
+        self.probe_profiles_config_path = os.path.join(self.config_path, "probe_profiles.json")
+        self.session_history_db_path = os.path.join(self.config_path, "session_history.db")
 
         os.makedirs(os.path.dirname(self.default_config_path), exist_ok=True)
         self.init()
@@ -32,6 +39,7 @@ class ConfigManager:
         self.init_accounts_config()
         self.init_recordings_config()
         self.init_web_auth_config()
+        self.init_probe_profiles_config()
 
     @staticmethod
     def _init_config(config_path, default_config=None):
@@ -71,10 +79,23 @@ class ConfigManager:
         cookies_config = {}
         self._init_config(self.web_auth_config_path, cookies_config)
 
+    def init_probe_profiles_config(self):
+        probe_profiles_config = {}
+        self._init_config(self.probe_profiles_config_path, probe_profiles_config)
+
     @staticmethod
-    def _load_config(config_path, error_message):
-        """Load configuration from a JSON file."""
+    def _load_config(config_path, error_message, cached=True, editable=False):
+        """
+        Load configuration from a JSON file.
+
+        :param cached: Share the parsed object through the config cache, it is parsed again only after the file changed.
+        :param editable: Return a copy of the cached object, for callers that modify the config before saving it,
+            so their unsaved changes stay out of the objects other web sessions read.
+        """
         try:
+            if cached:
+                config = config_cache.load(config_path)
+                return copy.deepcopy(config) if editable else config
             with open(config_path, encoding="utf-8") as file:
                 return json.load(file)
         except json.JSONDecodeError:
@@ -91,16 +112,25 @@ class ConfigManager:
         return self._load_config(self.default_config_path, "An error occurred while loading default config")
 
     def load_user_config(self):
-        return self._load_config(self.user_config_path, "An error occurred while loading user config")
+        return self._load_config(
+            self.user_config_path, "An error occurred while loading user config", editable=True
+        )
 
     def load_recordings_config(self):
-        return self._load_config(self.recordings_config_path, "An error occurred while loading recordings config")
+        # Loaded once at startup and modified by the recording stores, so it is not shared
+        return self._load_config(
+            self.recordings_config_path, "An error occurred while loading recordings config", cached=False
+        )
 
     def load_accounts_config(self):
-        return self._load_config(self.accounts_config_path, "An error occurred while loading accounts config")
+        return self._load_config(
+            self.accounts_config_path, "An error occurred while loading accounts config", editable=True
+        )
 
     def load_cookies_config(self):
-        return self._load_config(self.cookies_config_path, "An error occurred while loading cookies config")
+        return self._load_config(
+            self.cookies_config_path, "An error occurred while loading cookies config", editable=True
+        )
 
     def load_about_config(self):
         return self._load_config(self.about_config_path, "An error occurred while loading about config")
@@ -113,20 +143,40 @@ class ConfigManager:
         return self._load_config(path, "An error occurred while loading i18n config")
 
     def load_web_auth_config(self):
-        return self._load_config(self.web_auth_config_path, "An error occurred while loading web auth config")
+        return self._load_config(
+            self.web_auth_config_path, "An error occurred while loading web auth config", editable=True
+        )
+
+    def load_probe_profiles_config(self):
+        return self._load_config(
+            self.probe_profiles_config_path, "An error occurred while loading probe profiles config", editable=True
+        )
 
     @staticmethod
-    async def _save_config(config_path, config, success_message, error_message):
-        """Save configuration to a JSON file."""
+    async def _save_config(config_path, config, success_message, error_message) -> bool:
+        """Save configuration to a JSON file, atomically so a crash never leaves a truncated file."""
+        temp_path = None
         try:
-            async with aiofiles.open(config_path, "w", encoding="utf-8") as file:
+            # A temp file per save, so saves of the same file from different sessions never write into each other
+            temp_path = utils.make_temp_path(config_path)
+            async with aiofiles.open(temp_path, "w", encoding="utf-8") as file:
                 await file.write(json.dumps(config, ensure_ascii=False, indent=4))
+                await file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, config_path)
+            config_cache.refresh(config_path, config)
             logger.info(success_message)
+            return True
         except Exception as e:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            # The cached object may hold the changes that were not saved
+            config_cache.invalidate(config_path)
             logger.error(f"{error_message}: {e}")
+            return False
 
-    async def save_recordings_config(self, config):
-        await self._save_config(
+    async def save_recordings_config(self, config) -> bool:
+        return await self._save_config(
             self.recordings_config_path,
             config,
             success_message="Recordings configuration saved.",
@@ -165,7 +215,16 @@ class ConfigManager:
             error_message="An error occurred while saving cookies config",
         )
 
+    async def save_probe_profiles_config(self, config):
+        await self._save_config(
+            self.probe_profiles_config_path,
+            config,
+            success_message="Probe profiles configuration saved.",
+            error_message="An error occurred while saving probe profiles config",
+        )
+
     def get_config_value(self, key: str, default: T = None) -> T:
-        user_config = self.load_user_config()
+        # Read only, so the shared object is used instead of a copy
+        user_config = self._load_config(self.user_config_path, "An error occurred while loading user config")
         default_config = self.load_default_config()
         return user_config.get(key, default_config.get(key, default))
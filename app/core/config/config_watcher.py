@@ -0,0 +1,220 @@
+import asyncio
+import copy
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+
+from ...utils.logger import logger
+from .config_cache import config_cache
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class InotifyWatch:
+    """Minimal inotify binding over ctypes reporting the names of files written or replaced in a directory."""
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed: {directory}")
+
+    def read_names(self) -> set[str]:
+        names = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            _, _, _, name_length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            names.add(data[offset:offset + name_length].rstrip(b"\0").decode(errors="replace"))
+            offset += name_length
+        return names
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class ConfigWatcher:
+    """
+    Applies changes that other programs make to user_settings.json, cookies.json and accounts.json while the
+    app is running. The config directory is watched with inotify on Linux and polled elsewhere, writes of the
+    app itself are recognized through the config cache and ignored. Running recordings keep the settings
+    they were started with, new checks and recordings use the new ones.
+
+    One watcher runs per process and applies the changes to the app of every web session that finished
+    loading. It starts with the first registered app and stops when the last one is unregistered.
+    """
+
+    POLL_INTERVAL = 2.0
+    DEBOUNCE_DELAY = 0.5
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls, config_manager):
+        if cls._instance is None:
+            cls._instance = ConfigWatcher(config_manager)
+        return cls._instance
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.apps = []
+        self.watched_files = {
+            os.path.basename(self.config_manager.user_config_path): self.reload_user_config,
+            os.path.basename(self.config_manager.cookies_config_path): self.reload_cookies_config,
+            os.path.basename(self.config_manager.accounts_config_path): self.reload_accounts_config,
+        }
+        self.loop = None
+        self.inotify = None
+        self.poll_task = None
+        self.pending_names = set()
+        self.reload_handle = None
+
+    async def register(self, app) -> None:
+        """Apply config changes to an app from now on, the first app starts watching."""
+        if app not in self.apps:
+            self.apps.append(app)
+        if self.loop is None:
+            await self.start()
+
+    def unregister(self, app) -> None:
+        """Stop applying config changes to an app, can be called from any thread, e.g. on disconnect."""
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._unregister, app)
+
+    def _unregister(self, app) -> None:
+        if app in self.apps:
+            self.apps.remove(app)
+        if not self.apps and self.loop is not None:
+            self._stop()
+            logger.info("Config hot reload: stopped, no app is open")
+
+    async def start(self) -> None:
+        self.loop = loop = asyncio.get_running_loop()
+        if sys.platform.startswith("linux"):
+            try:
+                self.inotify = InotifyWatch(self.config_manager.config_path)
+                loop.add_reader(self.inotify.fd, self._on_inotify_event)
+                logger.info("Config hot reload: watching with inotify")
+                return
+            except (OSError, AttributeError, NotImplementedError) as e:
+                logger.warning(f"Config hot reload: inotify unavailable, polling instead: {e}")
+                self.inotify = None
+        self.poll_task = loop.create_task(self._poll())
+        logger.info("Config hot reload: polling for changes")
+
+    def _stop(self) -> None:
+        if self.inotify is not None:
+            self.loop.remove_reader(self.inotify.fd)
+            self.inotify.close()
+            self.inotify = None
+        if self.poll_task is not None:
+            self.poll_task.cancel()
+            self.poll_task = None
+        if self.reload_handle is not None:
+            self.reload_handle.cancel()
+            self.reload_handle = None
+        self.pending_names = set()
+        self.loop = None
+
+    def _on_inotify_event(self) -> None:
+        names = self.inotify.read_names() & self.watched_files.keys()
+        if names:
+            self._schedule_reload(names)
+
+    async def _poll(self) -> None:
+        signatures = {name: self._get_signature(name) for name in self.watched_files}
+        while True:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            for name in self.watched_files:
+                signature = self._get_signature(name)
+                if signature != signatures[name]:
+                    signatures[name] = signature
+                    self._schedule_reload({name})
+
+    def _get_signature(self, name: str) -> tuple | None:
+        try:
+            return config_cache.get_signature(os.path.join(self.config_manager.config_path, name))
+        except OSError:
+            return None
+
+    def _schedule_reload(self, names: set[str]) -> None:
+        """Collect the files changed within DEBOUNCE_DELAY, editors and scripts often write several times."""
+        self.pending_names |= names
+        if self.reload_handle is None:
+            self.reload_handle = self.loop.call_later(self.DEBOUNCE_DELAY, self._reload_pending)
+
+    def _reload_pending(self) -> None:
+        self.reload_handle = None
+        names, self.pending_names = self.pending_names, set()
+        for name in names:
+            for app in list(self.apps):
+                try:
+                    self.watched_files[name](app)
+                except Exception as e:
+                    logger.error(f"Config hot reload failed for {name}: {e}")
+
+    @staticmethod
+    def _load(path: str, current: dict) -> dict | None:
+        """
+        Return a copy of the new content of a config file for the settings to edit,
+        None if it is unchanged, invalid or written by the app.
+        """
+        if config_cache.is_saved_by_app(path):
+            return None
+        try:
+            config = config_cache.load(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Config hot reload: keeping the current settings, cannot read {path}: {e}")
+            return None
+        if not isinstance(config, dict) or config == current:
+            return None
+        return copy.deepcopy(config)
+
+    def reload_user_config(self, app) -> None:
+        settings = app.settings
+        config = self._load(self.config_manager.user_config_path, settings.user_config)
+        if config is None:
+            return
+        previous = settings.user_config
+        changed_keys = {key for key in previous.keys() | config.keys() if previous.get(key) != config.get(key)}
+        settings.user_config = config
+        logger.info(f"Config hot reload: user settings changed: {sorted(changed_keys)}")
+        app.record_manager.apply_settings_changes(changed_keys)
+        self._refresh_settings_page(app)
+
+    def reload_cookies_config(self, app) -> None:
+        settings = app.settings
+        config = self._load(self.config_manager.cookies_config_path, settings.cookies_config)
+        if config is not None:
+            settings.cookies_config = config
+            logger.info("Config hot reload: cookies changed")
+            app.record_manager.apply_settings_changes({"cookies"})
+            self._refresh_settings_page(app)
+
+    def reload_accounts_config(self, app) -> None:
+        settings = app.settings
+        config = self._load(self.config_manager.accounts_config_path, settings.accounts_config)
+        if config is not None:
+            settings.accounts_config = config
+            logger.info("Config hot reload: accounts changed")
+            app.record_manager.apply_settings_changes({"accounts"})
+            self._refresh_settings_page(app)
+
+    @staticmethod
+    def _refresh_settings_page(app) -> None:
+        if app.current_page is app.settings:
+            app.page.run_task(app.settings.load)
@@ -0,0 +1,299 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from ...utils import utils
+from ...utils.logger import logger
+
+
+class RecordingStorageBackend:
+    JSON = "json"
+    JOURNAL = "journal"
+    SQLITE = "sqlite"
+
+    @staticmethod
+    def get_backends() -> list[str]:
+        return [RecordingStorageBackend.JSON, RecordingStorageBackend.JOURNAL, RecordingStorageBackend.SQLITE]
+
+
+class JsonRecordingStore:
+    """Keeps all recordings in recordings.json, every save rewrites the whole file."""
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+
+    def load(self) -> list[dict]:
+        return self.config_manager.load_recordings_config()
+
+    @staticmethod
+    def snapshot(recordings: list, dirty_rec_ids: set | None) -> list[dict]:
+        return [rec.to_dict() for rec in recordings]
+
+    async def save(self, payload: list[dict]) -> None:
+        if not await self.config_manager.save_recordings_config(payload):
+            raise OSError("recordings.json was not saved")
+
+    def get_updated_at(self) -> float:
+        path = self.config_manager.recordings_config_path
+        return os.path.getmtime(path) if os.path.exists(path) else 0.0
+
+    def import_records(self, records: list[dict]) -> None:
+        path = self.config_manager.recordings_config_path
+        temp_path = utils.make_temp_path(path)
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(records, file, ensure_ascii=False, indent=4)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+class JournalRecordingStore:
+    """
+    Keeps a snapshot in recordings.json plus an append-only JSONL journal of per-recording changes.
+    A save appends one line per added, changed or removed recording with only the fields that changed,
+    so its cost follows the size of the change instead of the number of recordings. Loading replays the
+    journal on top of the snapshot, and once the journal outgrows the snapshot it is compacted into it.
+    """
+
+    COMPACT_MIN_ENTRIES = 1000
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.journal_path = config_manager.recordings_journal_path
+        # Last saved state of every recording, the base the next deltas are computed against
+        self.persisted = {}
+        self.entry_count = 0
+
+    def _replay(self) -> dict[str, dict]:
+        records = {record["rec_id"]: record for record in self.config_manager.load_recordings_config()}
+        self.entry_count = 0
+        try:
+            with open(self.journal_path, encoding="utf-8") as file:
+                for line_number, line in enumerate(file, start=1):
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash in the middle of an append leaves a torn last line
+                        logger.warning(f"Skipped invalid recordings journal line {line_number}")
+                        continue
+                    self.entry_count += 1
+                    if entry["op"] == "add":
+                        records[entry["record"]["rec_id"]] = entry["record"]
+                    elif entry["op"] == "set" and entry["rec_id"] in records:
+                        records[entry["rec_id"]].update(entry["fields"])
+                    elif entry["op"] == "delete":
+                        records.pop(entry["rec_id"], None)
+        except FileNotFoundError:
+            pass
+        return records
+
+    def load(self) -> list[dict]:
+        self.persisted = self._replay()
+        if self.entry_count:
+            logger.info(f"Replayed {self.entry_count} recordings journal entries")
+        return [dict(record) for record in self.persisted.values()]
+
+    def get_updated_at(self) -> float:
+        paths = (self.config_manager.recordings_config_path, self.journal_path)
+        return max((os.path.getmtime(path) for path in paths if os.path.exists(path)), default=0.0)
+
+    def snapshot(self, recordings: list, dirty_rec_ids: set | None) -> dict:
+        """
+        Compute the journal entries of the changed recordings against the last saved state.
+
+        :param dirty_rec_ids: rec_ids added, changed or removed since the last save, None compacts all of them.
+        """
+        if dirty_rec_ids is not None:
+            entries = []
+            current = {}
+            for recording in recordings:
+                if recording.rec_id in dirty_rec_ids:
+                    current[recording.rec_id] = recording.to_dict()
+            for rec_id in dirty_rec_ids - current.keys():
+                if self.persisted.pop(rec_id, None) is not None:
+                    entries.append({"op": "delete", "rec_id": rec_id})
+            # Added recordings are appended in list order, so replay keeps the order of the list
+            for rec_id, record in current.items():
+                previous = self.persisted.get(rec_id)
+                if previous is None:
+                    entries.append({"op": "add", "record": record})
+                    self.persisted[rec_id] = record
+                else:
+                    fields = {key: value for key, value in record.items() if previous.get(key) != value}
+                    if fields:
+                        entries.append({"op": "set", "rec_id": rec_id, "fields": fields})
+                        previous.update(fields)
+            if self.entry_count + len(entries) <= max(self.COMPACT_MIN_ENTRIES, len(self.persisted)):
+                return {"entries": entries, "records": None}
+
+        records = [recording.to_dict() for recording in recordings]
+        self.persisted = {record["rec_id"]: dict(record) for record in records}
+        return {"entries": [], "records": records}
+
+    def append(self, entries: list[dict]) -> None:
+        lines = [json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries]
+        with open(self.journal_path, "a", encoding="utf-8") as file:
+            file.writelines(lines)
+            file.flush()
+            os.fsync(file.fileno())
+        self.entry_count += len(entries)
+
+    def compact(self, records: list[dict]) -> None:
+        """Write the records as the new snapshot and start an empty journal."""
+        JsonRecordingStore(self.config_manager).import_records(records)
+        # Entries left behind by a crash before the truncation are idempotent on top of the new snapshot
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        self.entry_count = 0
+
+    def write(self, payload: dict) -> None:
+        if payload["records"] is not None:
+            self.compact(payload["records"])
+            logger.info(f"Recordings journal compacted: {len(payload['records'])} recordings")
+        elif payload["entries"]:
+            self.append(payload["entries"])
+
+    async def save(self, payload: dict) -> None:
+        await asyncio.to_thread(self.write, payload)
+
+    def import_records(self, records: list[dict]) -> None:
+        self.compact(records)
+        self.persisted = {record["rec_id"]: dict(record) for record in records}
+
+    def fold(self) -> None:
+        """Merge the journal into recordings.json and remove it, used when switching to another backend."""
+        records = self.load()
+        if self.entry_count:
+            JsonRecordingStore(self.config_manager).import_records(records)
+            logger.info(f"Merged {self.entry_count} recordings journal entries into recordings.json")
+        os.remove(self.journal_path)
+
+
+class SqliteRecordingStore:
+    """
+    Keeps recordings in a SQLite database with one row per recording, keyed by rec_id and kept in the
+    order they were added. Saves only touch the rows of the recordings that changed, lookups are served
+    by the in-memory RecordingIndex.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS recordings (
+            rec_id TEXT PRIMARY KEY,
+            position INTEGER NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_recordings_position ON recordings (position);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        DROP INDEX IF EXISTS idx_recordings_url;
+        DROP INDEX IF EXISTS idx_recordings_platform_key;
+        DROP INDEX IF EXISTS idx_recordings_monitor_status;
+    """
+    UPSERT_SQL = """
+        INSERT INTO recordings (rec_id, position, data)
+        VALUES (?, (SELECT IFNULL(MAX(position), 0) + 1 FROM recordings), ?)
+        ON CONFLICT (rec_id) DO UPDATE SET data = excluded.data
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+
+    def load(self) -> list[dict]:
+        with self.lock:
+            rows = self.connection.execute("SELECT data FROM recordings ORDER BY position").fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def get_updated_at(self) -> float:
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'updated_at'").fetchone()
+        return float(row[0]) if row else 0.0
+
+    @staticmethod
+    def _to_row(record: dict) -> tuple:
+        return record["rec_id"], json.dumps(record, ensure_ascii=False)
+
+    @staticmethod
+    def snapshot(recordings: list, dirty_rec_ids: set | None) -> dict:
+        """
+        Serialize the rows to write.
+
+        :param dirty_rec_ids: rec_ids added, changed or removed since the last save, None rewrites all rows.
+        """
+        if dirty_rec_ids is None:
+            return {"full": True, "records": [rec.to_dict() for rec in recordings], "deleted": []}
+        records = [rec.to_dict() for rec in recordings if rec.rec_id in dirty_rec_ids]
+        deleted = list(dirty_rec_ids - {record["rec_id"] for record in records})
+        return {"full": False, "records": records, "deleted": deleted}
+
+    def write(self, payload: dict) -> None:
+        with self.lock, self.connection:
+            if payload["full"]:
+                self.connection.execute("DELETE FROM recordings")
+            self.connection.executemany(self.UPSERT_SQL, [self._to_row(record) for record in payload["records"]])
+            self.connection.executemany("DELETE FROM recordings WHERE rec_id = ?", [(i,) for i in payload["deleted"]])
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('updated_at', ?)", (str(time.time()),)
+            )
+
+    async def save(self, payload: dict) -> None:
+        await asyncio.to_thread(self.write, payload)
+        logger.info(
+            f"Recordings database saved: {len(payload['records'])} updated, {len(payload['deleted'])} deleted"
+        )
+
+    def import_records(self, records: list[dict]) -> None:
+        self.write({"full": True, "records": records, "deleted": []})
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
+def create_recording_store(config_manager, backend: str):
+    """
+    Open the recording store of the configured backend.
+    When the other backend holds newer data, e.g. right after switching, it is migrated first.
+    """
+    if backend != RecordingStorageBackend.JOURNAL and os.path.exists(config_manager.recordings_journal_path):
+        JournalRecordingStore(config_manager).fold()
+
+    if backend == RecordingStorageBackend.JOURNAL:
+        file_store = JournalRecordingStore(config_manager)
+    else:
+        file_store = JsonRecordingStore(config_manager)
+    db_path = config_manager.recordings_db_path
+
+    if backend == RecordingStorageBackend.SQLITE:
+        try:
+            store = SqliteRecordingStore(db_path)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to open recordings database, using JSON storage: {e}")
+            return file_store
+        # A new database has no updated_at yet, so it always imports the existing JSON
+        if file_store.get_updated_at() > store.get_updated_at():
+            records = file_store.load()
+            if records:
+                store.import_records(records)
+                logger.info(f"Migrated {len(records)} recordings from JSON to SQLite")
+        return store
+
+    if os.path.exists(db_path):
+        try:
+            sqlite_store = SqliteRecordingStore(db_path)
+            if sqlite_store.get_updated_at() > file_store.get_updated_at():
+                records = sqlite_store.load()
+                file_store.import_records(records)
+                logger.info(f"Migrated {len(records)} recordings from SQLite to {backend}")
+            sqlite_store.close()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read recordings database: {e}")
+    return file_store
@@ -0,0 +1,57 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ...utils.logger import logger
+
+
+class WriteBehindPersister:
+    """
+    Coalesces save requests for a config file. The first request schedules a single write after `delay`
+    seconds and every request in between only marks the data dirty, the data is serialized when the write
+    actually happens. flush() writes pending changes immediately, e.g. on shutdown. A failed write keeps
+    the data dirty and is retried after RETRY_DELAY seconds.
+    """
+
+    RETRY_DELAY = 5.0
+
+    def __init__(self, snapshot: Callable[[], Any], save: Callable[[Any], Awaitable[None]], delay: float = 1.0):
+        """
+        :param snapshot: Returns the data to save, called once per write.
+        :param save: Coroutine function that writes the data.
+        :param delay: Seconds changes are collected before they are written.
+        """
+        self.snapshot = snapshot
+        self.save = save
+        self.delay = delay
+        self.is_dirty = False
+        self.task = None
+        self.lock = asyncio.Lock()
+        self.write_count = 0
+
+    def mark_dirty(self) -> None:
+        self.is_dirty = True
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self._delayed_flush())
+
+    async def _delayed_flush(self, delay: float | None = None) -> None:
+        try:
+            await asyncio.sleep(self.delay if delay is None else delay)
+        finally:
+            # Changes made while the write below is running schedule the next write
+            self.task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        async with self.lock:
+            if not self.is_dirty:
+                return
+            self.is_dirty = False
+            try:
+                await self.save(self.snapshot())
+                self.write_count += 1
+            except Exception as e:
+                self.is_dirty = True
+                logger.error(f"Write-behind flush failed, retrying in {self.RETRY_DELAY} seconds: {e}")
+                if self.task is None:
+                    self.task = asyncio.get_running_loop().create_task(self._delayed_flush(self.RETRY_DELAY))
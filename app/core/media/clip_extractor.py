@@ -0,0 +1,141 @@
+import asyncio
+import os
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from ...utils.logger import logger
+from .keyframe_index import KeyframeIndex
+
+
+class ClipJobStatus:
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ClipExtractor:
+    """
+    Cuts clips out of FLV/TS recordings without re-encoding.
+    The keyframe index resolves start and end to keyframe-aligned byte offsets, so a clip only reads
+    the file header and the bytes between those keyframes. Jobs run on a bounded thread pool,
+    there is one extractor per process so that all web sessions share the pool and the job list.
+    """
+
+    COPY_CHUNK_SIZE = 1024 * 1024
+    MAX_JOBS = 100
+    _instance = None
+
+    @classmethod
+    def get_instance(cls, max_workers: int = 2):
+        """The process-wide extractor, max_workers only applies to the first call."""
+        if cls._instance is None:
+            cls._instance = ClipExtractor(max_workers=max_workers)
+        return cls._instance
+
+    def __init__(self, max_workers: int = 2):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="clip")
+        self.jobs = OrderedDict()
+
+    @staticmethod
+    def parse_time(value: str | float) -> float:
+        """Seconds from a number or a '[HH:]MM:SS[.ms]' string."""
+        if isinstance(value, (int, float)):
+            return float(value)
+        seconds = 0.0
+        for part in value.strip().split(":"):
+            seconds = seconds * 60 + float(part)
+        return seconds
+
+    @staticmethod
+    def get_clip_path(video_path: str, start: float, end: float) -> str:
+        base, extension = os.path.splitext(video_path)
+        return f"{base}_clip_{int(start)}-{int(end)}{extension}"
+
+    @classmethod
+    def extract(cls, video_path: str, start: float, end: float, output_path: str | None = None) -> dict:
+        """
+        Copy the keyframe-aligned range covering [start, end] into a new file of the same container, blocking.
+        The clip starts at the keyframe before start and ends at the keyframe after end.
+
+        :return: Clip info with output_path, the actual start and end and the number of bytes written.
+        """
+        if end <= start:
+            raise ValueError("End time must be after start time")
+        index = KeyframeIndex.load_or_build(video_path)
+        if not index or not index.entries:
+            raise ValueError("No keyframe index available for this file")
+        if start > index.duration:
+            raise ValueError(f"Start time is beyond the last keyframe ({index.duration:.1f}s)")
+
+        start_timestamp, start_offset = index.lookup(start)
+        next_keyframe = index.lookup_next(end)
+        end_offset = next_keyframe[1] if next_keyframe else os.path.getsize(video_path)
+        end_timestamp = next_keyframe[0] if next_keyframe else None
+
+        output_path = output_path or cls.get_clip_path(video_path, start, end)
+        temp_path = output_path + ".part"
+        written = 0
+        try:
+            with open(video_path, "rb") as source, open(temp_path, "wb") as target:
+                ranges = ((0, index.header_size), (start_offset, end_offset))
+                for range_start, range_end in ranges:
+                    source.seek(range_start)
+                    remaining = range_end - range_start
+                    while remaining > 0:
+                        chunk = source.read(min(cls.COPY_CHUNK_SIZE, remaining))
+                        if not chunk:
+                            break
+                        target.write(chunk)
+                        remaining -= len(chunk)
+                        written += len(chunk)
+            os.replace(temp_path, output_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        logger.info(f"Clip extracted: {output_path}, {written} bytes")
+        return {
+            "output_path": output_path,
+            "start": start_timestamp / 1000,
+            "end": end_timestamp / 1000 if end_timestamp is not None else None,
+            "bytes": written,
+        }
+
+    def submit(self, video_path: str, start: float, end: float, output_path: str | None = None) -> dict:
+        """Queue a clip job, the returned job dict is updated in place as the job progresses."""
+        job = {
+            "id": uuid.uuid4().hex,
+            "video_path": video_path,
+            "start": start,
+            "end": end,
+            "status": ClipJobStatus.PENDING,
+            "result": None,
+            "error": None,
+        }
+        self.jobs[job["id"]] = job
+        while len(self.jobs) > self.MAX_JOBS:
+            self.jobs.popitem(last=False)
+        job["future"] = self.executor.submit(self._run_job, job, output_path)
+        return job
+
+    def _run_job(self, job: dict, output_path: str | None) -> dict:
+        job["status"] = ClipJobStatus.RUNNING
+        try:
+            job["result"] = self.extract(job["video_path"], job["start"], job["end"], output_path)
+            job["status"] = ClipJobStatus.DONE
+        except Exception as e:
+            logger.error(f"Clip extraction failed: {job['video_path']}, {e}")
+            job["error"] = str(e)
+            job["status"] = ClipJobStatus.FAILED
+        return job
+
+    async def run(self, video_path: str, start: float, end: float, output_path: str | None = None) -> dict:
+        """Queue a clip job and wait for it to finish."""
+        job = self.submit(video_path, start, end, output_path)
+        await asyncio.wrap_future(job["future"])
+        return job
+
+    def get_job(self, job_id: str) -> dict | None:
+        return self.jobs.get(job_id)
@@ -1,6 +1,8 @@
 from typing import Any
 
 from .audio import AACCommandBuilder, M4ACommandBuilder, MP3CommandBuilder, WAVCommandBuilder, WMACommandBuilder
+from .base import PIPE_INPUT_URL
+from .tee import PREVIEW_DIR_NAME, PREVIEW_PLAYLIST_NAME, TEE_AUDIO_BUILDERS, TEE_VIDEO_FORMATS, TeeCommandBuilder
 from .video import FLVCommandBuilder, MKVCommandBuilder, MOVCommandBuilder, MP4CommandBuilder, TSCommandBuilder
 
 
@@ -2,13 +2,15 @@ from ..base import FFmpegCommandBuilder
 
 
 class M4ACommandBuilder(FFmpegCommandBuilder):
+    AUDIO_CODEC_OPTIONS = ["-c:a", "aac", "-b:a", "320k"]
+    OUTPUT_FORMAT = "mp4"
+
     def build_command(self) -> list[str]:
         command = self._get_basic_ffmpeg_command()
 
         if self.segment_record:
             additional_commands = [
-                "-c:a", "aac",
-                "-b:a","320k",
+                *self.AUDIO_CODEC_OPTIONS,
                 "-map", "0:a",
                 "-f", "segment",
                 "-segment_time", str(self.segment_time),
@@ -18,9 +20,8 @@ class M4ACommandBuilder(FFmpegCommandBuilder):
         else:
             additional_commands = [
                 "-map", "0:a",
-                "-c:a", "aac",
-                "-b:a", "320k",
-                "-f", "mp4",
+                *self.AUDIO_CODEC_OPTIONS,
+                "-f", self.OUTPUT_FORMAT,
                 self.full_path,
             ]
 
@@ -16,6 +16,8 @@ OVERSEAS_CONFIG = {
     "max_muxing_queue_size": "2048",
 }
 
+PIPE_INPUT_URL = "pipe:0"
+
 FFMPEG_USER_AGENT = (
     "Mozilla/5.0 (Linux; Android 11; SAMSUNG SM-G973U) AppleWebKit/537.36 (KHTML, like Gecko) "
     "SamsungBrowser/14.2 Chrome/87.0.4280.141 Mobile Safari/537.36"
@@ -36,6 +38,7 @@ class FFmpegCommandBuilder(abc.ABC):
         full_path: str | None = None,
         headers: str | None = None,
         proxy: str | None = None,
+        probe_options: dict | None = None,
     ):
         """
         Initializes the FFmpegCommandBuilder.
@@ -47,6 +50,7 @@ class FFmpegCommandBuilder(abc.ABC):
         :param full_path: Full path where the output file will be saved.
         :param headers: Additional headers to include in the request.
         :param proxy: Proxy server URL to use for the connection.
+        :param probe_options: Overrides for 'analyzeduration' and 'probesize', e.g. from a learned probe profile.
         """
         self.record_url = record_url
         self.is_overseas = is_overseas
@@ -55,6 +59,7 @@ class FFmpegCommandBuilder(abc.ABC):
         self.full_path = full_path or ""
         self.proxy = proxy or ""
         self.headers = headers or ""
+        self.probe_options = probe_options or {}
 
     @abc.abstractmethod
     def build_command(self) -> list[str]:
@@ -67,6 +72,38 @@ class FFmpegCommandBuilder(abc.ABC):
         :return: List of strings representing the FFmpeg command components.
         """
         config = OVERSEAS_CONFIG if self.is_overseas else DEFAULT_CONFIG
+        config = {**config, **self.probe_options}
+        output_options = [
+            "-bufsize", config["bufsize"],
+            "-sn",
+            "-dn",
+            "-reconnect_delay_max", "60",
+            "-reconnect_streamed",
+            "-reconnect_at_eof",
+            "-max_muxing_queue_size", config["max_muxing_queue_size"],
+            "-correct_ts_overflow", "1",
+            "-avoid_negative_ts", "1",
+            "-flush_packets", "1",
+            "-progress", "pipe:1",
+            "-nostats"
+        ]
+
+        if self.record_url == PIPE_INPUT_URL:
+            # The FLV stream is written to stdin by the hot standby buffer, so no network options apply
+            return [
+                "ffmpeg",
+                "-y",
+                "-loglevel", "error",
+                "-hide_banner",
+                "-thread_queue_size", "1024",
+                "-analyzeduration", config["analyzeduration"],
+                "-probesize", config["probesize"],
+                "-fflags", "+discardcorrupt+igndts",
+                "-f", "flv",
+                "-i", PIPE_INPUT_URL,
+                *output_options
+            ]
+
         command = [
             "ffmpeg",
             "-y",
@@ -82,16 +119,7 @@ class FFmpegCommandBuilder(abc.ABC):
             "-fflags", "+discardcorrupt+igndts",
             "-re",
             "-i", self.record_url,
-            "-bufsize", config["bufsize"],
-            "-sn",
-            "-dn",
-            "-reconnect_delay_max", "60",
-            "-reconnect_streamed",
-            "-reconnect_at_eof",
-            "-max_muxing_queue_size", config["max_muxing_queue_size"],
-            "-correct_ts_overflow", "1",
-            "-avoid_negative_ts", "1",
-            "-flush_packets", "1"
+            *output_options
         ]
 
         if self.headers:
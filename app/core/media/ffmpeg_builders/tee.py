@@ -0,0 +1,134 @@
+import os
+
+from .audio import M4ACommandBuilder, MP3CommandBuilder
+from .base import FFmpegCommandBuilder
+
+TEE_VIDEO_FORMATS = {
+    "ts": ("mpegts", "mpegts_flags=+resend_headers"),
+    "mp4": ("mp4", "movflags=+frag_keyframe+empty_moov+delay_moov"),
+    "flv": ("flv", None),
+    "mkv": ("matroska", None),
+    "mov": ("mov", "movflags=+frag_keyframe+empty_moov"),
+}
+
+TEE_AUDIO_BUILDERS = {
+    "mp3": MP3CommandBuilder,
+    "m4a": M4ACommandBuilder,
+}
+
+PREVIEW_DIR_NAME = ".preview"
+PREVIEW_PLAYLIST_NAME = "index.m3u8"
+
+
+class TeeCommandBuilder(FFmpegCommandBuilder):
+    """
+    Builds a single ffmpeg command that pulls the input once and writes the main recording,
+    an optional audio-only file and an optional rolling local HLS preview.
+    """
+
+    def __init__(
+        self,
+        record_url: str,
+        save_format: str = "ts",
+        audio_format: str | None = None,
+        audio_path: str | None = None,
+        preview_dir: str | None = None,
+        preview_segment_time: int = 2,
+        preview_list_size: int = 6,
+        **kwargs,
+    ):
+        """
+        :param save_format: Container of the main recording, one of TEE_VIDEO_FORMATS.
+        :param audio_format: Audio-only output format ('mp3' or 'm4a'), None to disable.
+        :param audio_path: Full path of the audio-only output file.
+        :param preview_dir: Directory for the local HLS preview, None to disable.
+        :param preview_segment_time: Duration of each preview segment in seconds.
+        :param preview_list_size: Number of segments kept in the preview playlist.
+        """
+        super().__init__(record_url, **kwargs)
+        if save_format.lower() not in TEE_VIDEO_FORMATS:
+            raise ValueError(f"Unsupported tee format: {save_format}")
+        if audio_format and audio_format.lower() not in TEE_AUDIO_BUILDERS:
+            raise ValueError(f"Unsupported tee audio format: {audio_format}")
+        self.save_format = save_format.lower()
+        self.audio_format = audio_format.lower() if audio_format and audio_path else None
+        self.audio_path = audio_path
+        self.preview_dir = preview_dir
+        self.preview_segment_time = preview_segment_time
+        self.preview_list_size = preview_list_size
+
+    @staticmethod
+    def _escape_tee_path(path: str) -> str:
+        for char in ("\\", "'", "|", "[", "]"):
+            path = path.replace(char, "\\" + char)
+        return path
+
+    def _get_main_slave(self) -> str:
+        muxer, muxer_options = TEE_VIDEO_FORMATS[self.save_format]
+        if self.segment_record:
+            options = [
+                "f=segment",
+                f"segment_time={self.segment_time}",
+                f"segment_format={muxer}",
+                "reset_timestamps=1",
+            ]
+            if muxer_options:
+                options.append(f"segment_format_options={muxer_options}")
+        else:
+            options = [f"f={muxer}"]
+            if muxer_options:
+                options.append(muxer_options)
+        return f"[{':'.join(options)}]{self._escape_tee_path(self.full_path)}"
+
+    def _get_preview_slave(self) -> str:
+        options = [
+            "f=hls",
+            f"hls_time={self.preview_segment_time}",
+            f"hls_list_size={self.preview_list_size}",
+            "hls_flags=delete_segments+omit_endlist",
+            "onfail=ignore",
+        ]
+        playlist_path = os.path.join(self.preview_dir, PREVIEW_PLAYLIST_NAME).replace("\\", "/")
+        return f"[{':'.join(options)}]{self._escape_tee_path(playlist_path)}"
+
+    def _get_audio_commands(self) -> list[str]:
+        audio_builder = TEE_AUDIO_BUILDERS[self.audio_format]
+        if self.segment_record:
+            return [
+                "-map", "0:a?",
+                *audio_builder.AUDIO_CODEC_OPTIONS,
+                "-f", "segment",
+                "-segment_time", str(self.segment_time),
+                "-segment_format", audio_builder.OUTPUT_FORMAT,
+                "-reset_timestamps", "1",
+                self.audio_path,
+            ]
+        return [
+            "-map", "0:a?",
+            *audio_builder.AUDIO_CODEC_OPTIONS,
+            "-f", audio_builder.OUTPUT_FORMAT,
+            self.audio_path,
+        ]
+
+    def build_command(self) -> list[str]:
+        # The per-output options of the basic command (-sn, -dn, -max_muxing_queue_size, ...) bind to the
+        # output that follows them, so the tee output has to come first
+        command = self._get_basic_ffmpeg_command()
+
+        slaves = [self._get_main_slave()]
+        if self.preview_dir:
+            os.makedirs(self.preview_dir, exist_ok=True)
+            slaves.append(self._get_preview_slave())
+
+        command.extend([
+            "-map", "0",
+            "-c:v", "copy",
+            "-c:a", "copy",
+            "-f", "tee",
+            "|".join(slaves),
+        ])
+
+        # The audio output needs its own encoder, so it is a separate output of the same input
+        if self.audio_format:
+            command.extend(self._get_audio_commands())
+        return command
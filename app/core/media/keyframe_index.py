@@ -0,0 +1,213 @@
+import bisect
+import os
+import struct
+
+from ...utils.logger import logger
+
+INDEX_SUFFIX = ".kfi"
+INDEX_MAGIC = b"KFI1"
+# magic, size of the leading bytes a player needs before any keyframe (FLV header and
+# sequence headers, or the first PAT/PMT of a TS file), number of entries
+INDEX_HEADER = struct.Struct("<4sQI")
+# keyframe timestamp in milliseconds from the start of the file, byte offset of the keyframe
+INDEX_ENTRY = struct.Struct("<QQ")
+
+FLV_TAG_HEADER_SIZE = 11
+FLV_PREVIOUS_TAG_SIZE = 4
+FLV_TAG_AUDIO = 8
+FLV_TAG_VIDEO = 9
+FLV_TAG_SCRIPT = 18
+
+TS_PACKET_SIZE = 188
+TS_SYNC_BYTE = 0x47
+TS_READ_PACKETS = 4096
+PTS_WRAP = 1 << 33
+
+
+class KeyframeIndex:
+    """
+    Compact binary sidecar (<video>.kfi) mapping keyframe timestamps to byte offsets of a FLV or TS recording,
+    so players, range requests and clip extraction can jump to a keyframe without scanning the file.
+    """
+
+    SUPPORTED_FORMATS = ("flv", "ts")
+
+    def __init__(self, entries: list[tuple[int, int]], header_size: int = 0):
+        """
+        :param entries: (timestamp_ms, offset) pairs sorted by timestamp.
+        :param header_size: Bytes at the start of the file that must precede any keyframe range.
+        """
+        self.entries = entries
+        self.timestamps = [timestamp for timestamp, _ in entries]
+        self.header_size = header_size
+
+    @property
+    def duration(self) -> float:
+        return self.timestamps[-1] / 1000 if self.timestamps else 0.0
+
+    @staticmethod
+    def get_index_path(video_path: str) -> str:
+        return str(video_path) + INDEX_SUFFIX
+
+    @classmethod
+    def is_supported(cls, video_path: str) -> bool:
+        return str(video_path).rsplit(".", maxsplit=1)[-1].lower() in cls.SUPPORTED_FORMATS
+
+    def lookup(self, seconds: float) -> tuple[int, int] | None:
+        """Last keyframe at or before the given time, as (timestamp_ms, offset)."""
+        if not self.entries:
+            return None
+        position = bisect.bisect_right(self.timestamps, int(seconds * 1000)) - 1
+        return self.entries[max(position, 0)]
+
+    def lookup_next(self, seconds: float) -> tuple[int, int] | None:
+        """First keyframe after the given time, None if the time is past the last keyframe."""
+        position = bisect.bisect_right(self.timestamps, int(seconds * 1000))
+        return self.entries[position] if position < len(self.entries) else None
+
+    @classmethod
+    def load(cls, video_path: str) -> "KeyframeIndex | None":
+        """Read the sidecar of a video, None if it is missing, corrupt or older than the video."""
+        index_path = cls.get_index_path(video_path)
+        try:
+            if os.path.getmtime(index_path) < os.path.getmtime(video_path):
+                return None
+            with open(index_path, "rb") as file:
+                data = file.read()
+            magic, header_size, count = INDEX_HEADER.unpack_from(data)
+            if magic != INDEX_MAGIC or len(data) != INDEX_HEADER.size + count * INDEX_ENTRY.size:
+                return None
+            entries = list(INDEX_ENTRY.iter_unpack(data[INDEX_HEADER.size:]))
+        except (OSError, struct.error):
+            return None
+        return cls(entries, header_size)
+
+    def save(self, video_path: str) -> None:
+        index_path = self.get_index_path(video_path)
+        temp_path = index_path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(INDEX_HEADER.pack(INDEX_MAGIC, self.header_size, len(self.entries)))
+            file.writelines(INDEX_ENTRY.pack(*entry) for entry in self.entries)
+        os.replace(temp_path, index_path)
+
+    @classmethod
+    def build(cls, video_path: str) -> "KeyframeIndex | None":
+        """Scan a finished FLV or TS file for keyframes, this is blocking."""
+        video_format = str(video_path).rsplit(".", maxsplit=1)[-1].lower()
+        try:
+            if video_format == "flv":
+                return cls._build_flv(video_path)
+            if video_format == "ts":
+                return cls._build_ts(video_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to build keyframe index: {video_path}, {e}")
+        return None
+
+    @classmethod
+    def load_or_build(cls, video_path: str) -> "KeyframeIndex | None":
+        index = cls.load(video_path)
+        if index is None and cls.is_supported(video_path):
+            index = cls.build(video_path)
+            if index is not None and index.entries:
+                index.save(video_path)
+                logger.info(f"Keyframe index written: {cls.get_index_path(video_path)}, {len(index.entries)} keyframes")
+        return index
+
+    @classmethod
+    def _build_flv(cls, video_path: str) -> "KeyframeIndex":
+        entries = []
+        header_size = None
+        first_timestamp = None
+        with open(video_path, "rb") as file:
+            header = file.read(9)
+            if len(header) < 9 or header[:3] != b"FLV":
+                raise ValueError("not a FLV file")
+            offset = int.from_bytes(header[5:9], "big") + FLV_PREVIOUS_TAG_SIZE
+            file.seek(offset)
+            while True:
+                tag_header = file.read(FLV_TAG_HEADER_SIZE + 2)
+                if len(tag_header) < FLV_TAG_HEADER_SIZE + 2:
+                    break
+                tag_type = tag_header[0] & 0x1F
+                data_size = int.from_bytes(tag_header[1:4], "big")
+                timestamp = int.from_bytes(tag_header[4:7], "big") | (tag_header[7] << 24)
+                first_byte, second_byte = tag_header[11], tag_header[12]
+
+                is_sequence_header = tag_type == FLV_TAG_SCRIPT
+                is_keyframe = False
+                if tag_type == FLV_TAG_VIDEO:
+                    if first_byte & 0x80:
+                        # Enhanced FLV (HEVC/AV1): the low bits carry the packet type, 0 is the sequence start
+                        is_sequence_header = first_byte & 0x0F == 0
+                        is_keyframe = (first_byte >> 4) & 0x07 == 1
+                    else:
+                        is_sequence_header = first_byte & 0x0F in (7, 12) and second_byte == 0
+                        is_keyframe = first_byte >> 4 == 1
+                elif tag_type == FLV_TAG_AUDIO:
+                    is_sequence_header = first_byte >> 4 == 10 and second_byte == 0
+
+                if not is_sequence_header:
+                    if header_size is None:
+                        header_size = offset
+                    if is_keyframe:
+                        first_timestamp = timestamp if first_timestamp is None else first_timestamp
+                        relative = max(timestamp - first_timestamp, 0)
+                        if not entries or relative > entries[-1][0]:
+                            entries.append((relative, offset))
+
+                offset += FLV_TAG_HEADER_SIZE + data_size + FLV_PREVIOUS_TAG_SIZE
+                file.seek(offset)
+        return cls(entries, header_size or 0)
+
+    @classmethod
+    def _build_ts(cls, video_path: str) -> "KeyframeIndex":
+        entries = []
+        header_size = None
+        first_pts = None
+        last_pts = None
+        wraps = 0
+        offset = 0
+        with open(video_path, "rb") as file:
+            while True:
+                data = file.read(TS_PACKET_SIZE * TS_READ_PACKETS)
+                if len(data) < TS_PACKET_SIZE:
+                    break
+                for start in range(0, len(data) - TS_PACKET_SIZE + 1, TS_PACKET_SIZE):
+                    packet = data[start:start + TS_PACKET_SIZE]
+                    if packet[0] != TS_SYNC_BYTE:
+                        raise ValueError(f"lost TS sync at offset {offset + start}")
+                    if not packet[1] & 0x40:
+                        continue
+                    adaptation_control = (packet[3] >> 4) & 0x03
+                    payload_start = 4
+                    is_random_access = False
+                    if adaptation_control & 0x02:
+                        adaptation_length = packet[4]
+                        is_random_access = adaptation_length > 0 and bool(packet[5] & 0x40)
+                        payload_start += 1 + adaptation_length
+                    pes = packet[payload_start:]
+                    # PES start code followed by a video stream id
+                    if len(pes) < 14 or pes[:3] != b"\x00\x00\x01" or not 0xE0 <= pes[3] <= 0xEF:
+                        continue
+
+                    packet_offset = offset + start
+                    if header_size is None:
+                        header_size = packet_offset
+                    if not is_random_access or not pes[7] & 0x80:
+                        continue
+                    pts = (
+                        ((pes[9] >> 1) & 0x07) << 30 | pes[10] << 22 | (pes[11] >> 1) << 15
+                        | pes[12] << 7 | pes[13] >> 1
+                    )
+                    if last_pts is not None and pts < last_pts - PTS_WRAP // 2:
+                        wraps += 1
+                    last_pts = pts
+                    pts += wraps * PTS_WRAP
+                    first_pts = pts if first_pts is None else first_pts
+                    relative = max(pts - first_pts, 0) // 90
+                    if not entries or relative > entries[-1][0]:
+                        entries.append((relative, packet_offset))
+                offset += len(data) - len(data) % TS_PACKET_SIZE
+                if len(data) % TS_PACKET_SIZE:
+                    break
+        return cls(entries, header_size or 0)
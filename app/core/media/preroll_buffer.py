@@ -0,0 +1,199 @@
+import asyncio
+import time
+from collections import deque
+
+import httpx
+
+from ...utils.logger import logger
+
+FLV_TAG_HEADER_SIZE = 11
+FLV_PREVIOUS_TAG_SIZE = 4
+FLV_TAG_AUDIO = 8
+FLV_TAG_VIDEO = 9
+FLV_TAG_SCRIPT = 18
+
+
+class FlvPrerollBuffer:
+    """
+    Hot standby connection to an FLV stream that keeps the last seconds of tags in memory.
+    When ffmpeg attaches, the buffered tags are written to its stdin ahead of the live tags,
+    so the opening of the stream and the gaps between recorder restarts are not lost.
+    """
+
+    IDLE_TIMEOUT = 120
+    MAX_BUFFER_BYTES = 64 * 1024 * 1024
+
+    def __init__(
+        self,
+        record_url: str,
+        buffer_seconds: int = 10,
+        headers: dict[str, str] | None = None,
+        proxy: str | None = None,
+        chunk_size: int = 1024 * 16,
+    ):
+        """
+        :param record_url: URL of the FLV stream.
+        :param buffer_seconds: Seconds of stream kept in memory while no recorder is attached.
+        :param headers: Additional request headers.
+        :param proxy: Proxy server URL to use for the connection.
+        :param chunk_size: Read size of the HTTP response.
+        """
+        self.record_url = record_url
+        self.buffer_ms = buffer_seconds * 1000
+        self.headers = headers or {}
+        self.proxy = proxy or None
+        self.chunk_size = chunk_size
+        self.flv_header = b""
+        self.sequence_tags = {}
+        self.tags = deque()
+        self.buffered_bytes = 0
+        self.has_video = False
+        self.writer = None
+        self.idle_since = time.monotonic()
+        self.stop_event = asyncio.Event()
+        self.task = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self._read_stream())
+
+    async def stop(self) -> None:
+        self.stop_event.set()
+        self.detach()
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    async def attach(self, writer: asyncio.StreamWriter) -> None:
+        """Flush the buffered tags into writer, live tags are forwarded to it afterwards."""
+        pre_roll = b"".join(tag for _, _, tag in self.tags)
+        self.writer = writer
+        if not self.flv_header:
+            # Nothing received yet, the header is written with the first live data
+            return
+        try:
+            writer.write(self.flv_header + b"".join(self.sequence_tags.values()) + pre_roll)
+            await writer.drain()
+            seconds = (self.tags[-1][0] - self.tags[0][0]) / 1000 if self.tags else 0
+            logger.info(f"Pre-roll flushed: {seconds:.1f}s, {len(pre_roll)} bytes, {self.record_url}")
+        except (BrokenPipeError, ConnectionResetError) as e:
+            logger.debug(f"Failed to flush pre-roll: {e}")
+            self.detach()
+
+    def detach(self) -> None:
+        """Stop forwarding live tags and go back to buffering only."""
+        self.writer = None
+        self.idle_since = time.monotonic()
+
+    async def _read_stream(self) -> None:
+        try:
+            timeout = httpx.Timeout(15.0, read=30.0)
+            async with httpx.AsyncClient(headers=self.headers, proxy=self.proxy, timeout=timeout) as client:
+                async with client.stream("GET", self.record_url) as response:
+                    if response.status_code != 200:
+                        logger.error(f"Hot standby request failed, Status Code: {response.status_code}")
+                        return
+
+                    logger.info(f"Hot standby connected: {self.record_url}")
+                    pending = bytearray()
+                    async for chunk in response.aiter_bytes(self.chunk_size):
+                        if self.stop_event.is_set():
+                            break
+                        pending.extend(chunk)
+                        await self._parse_tags(pending)
+
+                        if not self.writer and time.monotonic() - self.idle_since > self.IDLE_TIMEOUT:
+                            logger.info(f"Hot standby idle for {self.IDLE_TIMEOUT}s, disconnecting: {self.record_url}")
+                            break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Hot standby error: {e}")
+        finally:
+            # Closing stdin lets the attached ffmpeg finish the file when the stream ends
+            if self.writer:
+                self.writer.close()
+                self.detach()
+
+    async def _parse_tags(self, pending: bytearray) -> None:
+        offset = 0
+        if not self.flv_header:
+            if len(pending) < 9:
+                return
+            if pending[:3] != b"FLV":
+                raise ValueError("Hot standby only supports FLV streams")
+            header_size = int.from_bytes(pending[5:9], "big") + FLV_PREVIOUS_TAG_SIZE
+            if len(pending) < header_size:
+                return
+            self.flv_header = bytes(pending[:header_size])
+            offset = header_size
+            if self.writer:
+                await self._forward(self.flv_header)
+
+        while len(pending) - offset >= FLV_TAG_HEADER_SIZE:
+            data_size = int.from_bytes(pending[offset + 1:offset + 4], "big")
+            tag_size = FLV_TAG_HEADER_SIZE + data_size + FLV_PREVIOUS_TAG_SIZE
+            if len(pending) - offset < tag_size:
+                break
+            tag = bytes(pending[offset:offset + tag_size])
+            offset += tag_size
+            self._add_tag(tag)
+            if self.writer:
+                await self._forward(tag)
+
+        del pending[:offset]
+
+    def _add_tag(self, tag: bytes) -> None:
+        tag_type = tag[0] & 0x1F
+        timestamp = int.from_bytes(tag[4:7], "big") | (tag[7] << 24)
+        first_byte = tag[11] if len(tag) > 15 else 0
+        second_byte = tag[12] if len(tag) > 16 else 0
+
+        if tag_type == FLV_TAG_SCRIPT:
+            self.sequence_tags["script"] = tag
+            return
+
+        is_keyframe = False
+        if tag_type == FLV_TAG_VIDEO:
+            self.has_video = True
+            if first_byte & 0x80:
+                # Enhanced FLV (HEVC/AV1): the low bits carry the packet type, 0 is the sequence start
+                is_sequence_header = first_byte & 0x0F == 0
+                is_keyframe = (first_byte >> 4) & 0x07 == 1
+            else:
+                is_sequence_header = first_byte & 0x0F in (7, 12) and second_byte == 0
+                is_keyframe = first_byte >> 4 == 1
+            if is_sequence_header:
+                self.sequence_tags["video"] = tag
+                return
+        elif tag_type == FLV_TAG_AUDIO and first_byte >> 4 == 10 and second_byte == 0:
+            self.sequence_tags["audio"] = tag
+            return
+
+        self.tags.append((timestamp, is_keyframe, tag))
+        self.buffered_bytes += len(tag)
+        self._trim(timestamp)
+
+    def _trim(self, newest_timestamp: int) -> None:
+        """Drop tags older than the buffer window, the buffer always starts at a video keyframe."""
+        while self.tags and (
+                newest_timestamp - self.tags[0][0] > self.buffer_ms or self.buffered_bytes > self.MAX_BUFFER_BYTES
+        ):
+            self.buffered_bytes -= len(self.tags.popleft()[2])
+        if self.has_video:
+            while self.tags and not self.tags[0][1]:
+                self.buffered_bytes -= len(self.tags.popleft()[2])
+
+    async def _forward(self, data: bytes) -> None:
+        try:
+            self.writer.write(data)
+            await self.writer.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            logger.debug(f"Recorder detached from hot standby: {e}")
+            self.detach()
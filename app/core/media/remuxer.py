@@ -0,0 +1,64 @@
+import os
+
+from ...utils.logger import logger
+
+try:
+    import av
+except ImportError:
+    av = None
+
+
+class InProcessRemuxer:
+    """
+    Remux recorded files into MP4 inside the current process with PyAV, copying packets without transcoding
+    """
+
+    def __init__(self, output_format: str = "mp4"):
+        self.output_format = output_format
+
+    @staticmethod
+    def is_available() -> bool:
+        return av is not None
+
+    def remux(self, input_path: str, output_path: str) -> bool:
+        """
+        Stream every audio/video packet from input_path into output_path.
+        This is blocking, run it in an executor when called from the event loop.
+
+        :param input_path: Source file path (usually .ts or .flv).
+        :param output_path: Target file path.
+        :return: True if the output was written successfully.
+        """
+        if not self.is_available():
+            logger.warning("PyAV is not installed, in-process remux is unavailable")
+            return False
+
+        try:
+            with av.open(input_path) as input_container, av.open(output_path, "w", format=self.output_format) as \
+                    output_container:
+                stream_map = {}
+                for stream in input_container.streams:
+                    if stream.type not in ("video", "audio"):
+                        continue
+                    if hasattr(output_container, "add_stream_from_template"):
+                        stream_map[stream.index] = output_container.add_stream_from_template(stream)
+                    else:
+                        stream_map[stream.index] = output_container.add_stream(template=stream)
+
+                if not stream_map:
+                    logger.error(f"No audio or video stream found: {input_path}")
+                    return False
+
+                input_streams = [input_container.streams[index] for index in stream_map]
+                for packet in input_container.demux(*input_streams):
+                    # The demuxer yields a flushing packet with no timestamp at the end of each stream
+                    if packet.dts is None:
+                        continue
+                    packet.stream = stream_map[packet.stream.index]
+                    output_container.mux(packet)
+            return True
+        except Exception as e:
+            logger.error(f"In-process remux failed: {input_path}, {e}")
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            return False
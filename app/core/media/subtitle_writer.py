@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+
+from ...utils.logger import logger
+
+
+class TimeSubtitleWriter:
+    """
+    Writes a subtitle sidecar next to a recording with one wall-clock cue per interval.
+    Cues are collected as the recording advances and appended every FLUSH_SECONDS of media and on close(),
+    so the event loop touches the file a few times a minute and memory use does not grow with the recording.
+    Segmented recordings get one sidecar per segment with cue times relative to that segment.
+    """
+
+    SUBTITLE_FORMATS = ("srt", "vtt")
+    FLUSH_SECONDS = 30
+
+    def __init__(
+        self,
+        save_file_path: str,
+        interval: int = 1,
+        subtitle_format: str = "srt",
+        segment_time: int | None = None,
+    ):
+        """
+        :param save_file_path: Path of the recording, may contain '%03d' for segmented recordings.
+        :param interval: Seconds covered by each cue.
+        :param subtitle_format: 'srt' or 'vtt'.
+        :param segment_time: Segment duration in seconds, None when the recording is not segmented.
+        """
+        self.save_file_path = save_file_path
+        self.interval = max(interval, 1)
+        self.subtitle_format = subtitle_format if subtitle_format in self.SUBTITLE_FORMATS else "srt"
+        self.segment_time = segment_time if segment_time and "%" in save_file_path else None
+        self.started_at = None
+        self.written_seconds = 0
+        self.segment_index = None
+        self.subtitle_path = None
+        self.cue_index = 0
+        self.pending_cues = []
+        self.flushed_seconds = 0
+        self.is_failed = False
+
+    def get_subtitle_path(self, segment_index: int = 0) -> str:
+        path = self.save_file_path
+        if self.segment_time:
+            path = path.replace("%03d", f"{segment_index:03d}")
+        return path.rsplit(".", maxsplit=1)[0] + "." + self.subtitle_format
+
+    def _open_segment(self, segment_index: int) -> None:
+        self.segment_index = segment_index
+        self.cue_index = 0
+        self.subtitle_path = self.get_subtitle_path(segment_index)
+        with open(self.subtitle_path, "w", encoding="utf-8") as file:
+            file.write("WEBVTT\n\n" if self.subtitle_format == "vtt" else "")
+
+    def _format_timestamp(self, seconds: int) -> str:
+        hours, remainder = divmod(seconds, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        separator = "." if self.subtitle_format == "vtt" else ","
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}000"
+
+    def _format_cue(self, start: int) -> str:
+        offset = start - self.segment_index * self.segment_time if self.segment_time else start
+        self.cue_index += 1
+        text = (self.started_at + timedelta(seconds=start)).strftime("%Y-%m-%d %H:%M:%S")
+        cue = (
+            f"{self._format_timestamp(offset)} --> {self._format_timestamp(offset + self.interval)}\n"
+            f"{text}\n\n"
+        )
+        if self.subtitle_format == "srt":
+            cue = f"{self.cue_index}\n" + cue
+        return cue
+
+    def update(self, media_seconds: float) -> None:
+        """
+        Append the cues up to the current media time of the recording.
+        Segment boundaries follow segment_time, ffmpeg cuts on the next keyframe so they can be off by a GOP.
+        """
+        if self.is_failed:
+            return
+        if self.started_at is None:
+            self.started_at = datetime.now() - timedelta(seconds=media_seconds)
+        try:
+            while self.written_seconds + self.interval <= media_seconds:
+                segment_index = self.written_seconds // self.segment_time if self.segment_time else 0
+                if segment_index != self.segment_index:
+                    self._flush()
+                    self._open_segment(segment_index)
+                self.pending_cues.append(self._format_cue(self.written_seconds))
+                self.written_seconds += self.interval
+            if self.written_seconds - self.flushed_seconds >= self.FLUSH_SECONDS:
+                self._flush()
+        except OSError as e:
+            logger.error(f"Failed to write subtitle file: {self.subtitle_path}, {e}")
+            self.is_failed = True
+
+    def close(self) -> None:
+        """Append the cues not written yet, called when the recording ends."""
+        if self.is_failed:
+            return
+        try:
+            self._flush()
+        except OSError as e:
+            logger.error(f"Failed to write subtitle file: {self.subtitle_path}, {e}")
+            self.is_failed = True
+
+    def _flush(self) -> None:
+        if self.pending_cues:
+            with open(self.subtitle_path, "a", encoding="utf-8") as file:
+                file.writelines(self.pending_cues)
+            self.pending_cues.clear()
+        self.flushed_seconds = self.written_seconds
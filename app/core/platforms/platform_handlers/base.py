@@ -67,6 +67,15 @@ class PlatformHandler(abc.ABC):
         """
         return proxy, cookies, record_quality, platform
 
+    @classmethod
+    def clear_instances(cls) -> None:
+        """
+        Drop the cached handler instances, e.g. after proxy, cookies or accounts changed.
+        Handlers in use by running checks stay valid, later calls create new instances.
+        """
+        with cls._lock:
+            cls._instances.clear()
+
     @classmethod
     def _get_handler_class(cls, live_url: str) -> type["PlatformHandler"] | None:
         """
@@ -0,0 +1,208 @@
+import time
+
+from ...models.media.video_quality_model import VideoQuality
+from ...models.recording.recording_priority_model import RecordingPriority
+from ...utils.logger import logger
+
+# Rough ingest bitrate (bytes per second) of each quality, used until a recording reports its real throughput
+ESTIMATED_QUALITY_BYTES_PER_SECOND = {
+    VideoQuality.OD: 1_000_000,
+    VideoQuality.UHD: 750_000,
+    VideoQuality.HD: 500_000,
+    VideoQuality.SD: 250_000,
+    VideoQuality.LD: 125_000,
+}
+
+
+class AdmissionDecision:
+    ADMIT = "ADMIT"
+    DOWNGRADE = "DOWNGRADE"
+    QUEUE = "QUEUE"
+    NOTIFY_ONLY = "NOTIFY_ONLY"
+
+    def __init__(self, action: str, quality: str | None = None):
+        self.action = action
+        self.quality = quality
+
+
+class AdmissionController:
+    """
+    Global limit on concurrent recordings and total ingest bandwidth.
+    Rooms that do not fit are handled by the overflow policy (queue, downgrade or notify only),
+    HIGH priority rooms always wait in the queue and are admitted before any lower priority room.
+    One controller is shared by the recording managers of all web sessions, the limits are read from the
+    settings of the session asking for a slot.
+    """
+
+    OVERFLOW_POLICIES = ("queue", "downgrade", "notify_only")
+    EMA_WEIGHT = 0.3
+    ADMIT_GRACE_SECONDS = 60
+
+    def __init__(self, recording_index):
+        """
+        :param recording_index: The index of the recording list, used to look up admitted and waiting rooms.
+        """
+        self.recording_index = recording_index
+        self.admitted = {}
+        self.queue = {}
+
+    @staticmethod
+    def get_max_concurrent(user_config: dict) -> int:
+        return int(user_config.get("max_concurrent_recordings") or 0)
+
+    @staticmethod
+    def get_bandwidth_budget(user_config: dict) -> int:
+        """Total ingest budget in bytes per second, 0 means unlimited."""
+        return int(float(user_config.get("ingest_bandwidth_budget_mbps") or 0) * 1_000_000 / 8)
+
+    def get_overflow_policy(self, user_config: dict) -> str:
+        policy = user_config.get("admission_overflow_policy")
+        return policy if policy in self.OVERFLOW_POLICIES else "queue"
+
+    @staticmethod
+    def estimate_bytes_per_second(quality: str) -> int:
+        return ESTIMATED_QUALITY_BYTES_PER_SECOND.get(quality, ESTIMATED_QUALITY_BYTES_PER_SECOND[VideoQuality.OD])
+
+    def get_used_bandwidth(self) -> int:
+        return sum(entry["bytes_per_second"] for entry in self.admitted.values())
+
+    def _prune(self) -> None:
+        """Drop reservations of recordings that are no longer recording."""
+        now = time.monotonic()
+        for rec_id, entry in list(self.admitted.items()):
+            recording = self.recording_index.get(rec_id)
+            if recording and (recording.is_recording or now - entry["admitted_at"] < self.ADMIT_GRACE_SECONDS):
+                continue
+            self.admitted.pop(rec_id, None)
+        for rec_id in list(self.queue):
+            recording = self.recording_index.get(rec_id)
+            if not recording or not recording.monitor_status:
+                self.queue.pop(rec_id, None)
+
+    def _has_capacity(self, bytes_per_second: int, user_config: dict) -> bool:
+        max_concurrent = self.get_max_concurrent(user_config)
+        if max_concurrent and len(self.admitted) >= max_concurrent:
+            return False
+        budget = self.get_bandwidth_budget(user_config)
+        return not budget or self.get_used_bandwidth() + bytes_per_second <= budget
+
+    def _is_ahead_in_queue(self, rec_id: str, priority: str) -> bool:
+        """A room may only take a free slot if no waiting room has a higher priority or waited longer."""
+        rank = RecordingPriority.get_rank(priority)
+        queued_at = self.queue.get(rec_id, {}).get("queued_at", time.monotonic())
+        for other_id, entry in self.queue.items():
+            if other_id == rec_id:
+                continue
+            other_rank = RecordingPriority.get_rank(entry["priority"])
+            if other_rank < rank or (other_rank == rank and entry["queued_at"] < queued_at):
+                return False
+        return True
+
+    def _admit(self, recording, quality: str) -> None:
+        self.queue.pop(recording.rec_id, None)
+        self.admitted[recording.rec_id] = {
+            "priority": recording.priority,
+            "quality": quality,
+            "bytes_per_second": self.estimate_bytes_per_second(quality),
+            "admitted_at": time.monotonic(),
+            "last_size": 0,
+            "last_time": None,
+        }
+
+    def request(self, recording, user_config: dict, quality: str | None = None) -> AdmissionDecision:
+        """
+        Decide whether a live room can start recording now.
+        Without limits every room is admitted, the reservation is still kept to track ingest throughput.
+
+        :param user_config: The settings holding the limits and the overflow policy.
+        :param quality: Quality the recording would use, defaults to the recording's quality.
+        """
+        self._prune()
+        if recording.rec_id in self.admitted:
+            return AdmissionDecision(AdmissionDecision.ADMIT)
+
+        quality = quality or recording.quality
+        priority = recording.priority
+        if self._is_ahead_in_queue(recording.rec_id, priority):
+            if self._has_capacity(self.estimate_bytes_per_second(quality), user_config):
+                self._admit(recording, quality)
+                return AdmissionDecision(AdmissionDecision.ADMIT)
+
+            policy = self.get_overflow_policy(user_config)
+            if priority != RecordingPriority.HIGH and policy == "downgrade":
+                qualities = VideoQuality.get_qualities()
+                start = qualities.index(quality) + 1 if quality in qualities else len(qualities)
+                for lower_quality in qualities[start:]:
+                    if self._has_capacity(self.estimate_bytes_per_second(lower_quality), user_config):
+                        self._admit(recording, lower_quality)
+                        logger.warning(f"Admission: recording {recording.rec_id} at {lower_quality} "
+                                       f"instead of {quality}, ingest capacity exhausted")
+                        return AdmissionDecision(AdmissionDecision.DOWNGRADE, lower_quality)
+
+            if priority != RecordingPriority.HIGH and policy == "notify_only":
+                self.queue.pop(recording.rec_id, None)
+                logger.warning(f"Admission: {recording.rec_id} is notify only, recording capacity exhausted")
+                return AdmissionDecision(AdmissionDecision.NOTIFY_ONLY)
+
+        if recording.rec_id not in self.queue:
+            self.queue[recording.rec_id] = {"priority": priority, "queued_at": time.monotonic()}
+            logger.info(f"Admission: {recording.rec_id} queued with priority {priority}, "
+                        f"{self.format_stats(user_config)}")
+        return AdmissionDecision(AdmissionDecision.QUEUE)
+
+    def release(self, rec_id: str):
+        """Free the slot of a finished recording, returns the waiting room to check next, if any."""
+        if self.admitted.pop(rec_id, None) is not None:
+            return self._get_next()
+        return None
+
+    def discard(self, rec_id: str):
+        """
+        Remove a room from the queue, e.g. when it went offline while waiting.
+        Returns the waiting room to check next, if any.
+        """
+        if self.queue.pop(rec_id, None) is not None:
+            return self._get_next()
+        return None
+
+    def _get_next(self):
+        self._prune()
+        if not self.queue:
+            return None
+        next_id = min(
+            self.queue,
+            key=lambda key: (RecordingPriority.get_rank(self.queue[key]["priority"]), self.queue[key]["queued_at"])
+        )
+        return self.recording_index.get(next_id)
+
+    def update_throughput(self, rec_id: str, total_size: int) -> None:
+        """Replace the estimated bitrate of a recording with the throughput reported by ffmpeg."""
+        entry = self.admitted.get(rec_id)
+        if not entry:
+            return
+
+        now = time.monotonic()
+        if entry["last_time"] is not None and total_size > entry["last_size"]:
+            elapsed = now - entry["last_time"]
+            if elapsed > 0:
+                rate = (total_size - entry["last_size"]) / elapsed
+                entry["bytes_per_second"] += self.EMA_WEIGHT * (rate - entry["bytes_per_second"])
+        entry["last_size"] = total_size
+        entry["last_time"] = now
+
+    def get_stats(self, user_config: dict) -> dict:
+        return {
+            "active": len(self.admitted),
+            "waiting": len(self.queue),
+            "max_concurrent": self.get_max_concurrent(user_config),
+            "used_bandwidth": int(self.get_used_bandwidth()),
+            "bandwidth_budget": self.get_bandwidth_budget(user_config),
+        }
+
+    def format_stats(self, user_config: dict) -> str:
+        """Summary of get_stats() for the log."""
+        stats = self.get_stats(user_config)
+        used_mbps = stats["used_bandwidth"] * 8 / 1_000_000
+        budget = f"{stats['bandwidth_budget'] * 8 / 1_000_000:.1f}" if stats["bandwidth_budget"] else "unlimited"
+        return (f"active: {stats['active']}/{stats['max_concurrent'] or 'unlimited'}, "
+                f"waiting: {stats['waiting']}, ingest: {used_mbps:.1f}/{budget} Mbps")
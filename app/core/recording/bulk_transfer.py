@@ -0,0 +1,376 @@
+import asyncio
+import csv
+import json
+import os
+import uuid
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from itertools import islice
+
+from ...models.media.video_quality_model import VideoQuality
+from ...models.recording.recording_model import Recording
+from ...utils import utils
+from ...utils.logger import logger
+from ..config.config_manager import ConfigManager
+from ..config.recording_store import RecordingStorageBackend, create_recording_store
+from ..platforms.platform_handlers import get_platform_info
+from ..runtime.instance_lock import InstanceLock
+from .recording_index import RecordingIndex
+
+# Quality codes of the batch entry syntax "quality,url,streamer_name"
+QUALITY_CODES = {"0": VideoQuality.OD, "1": VideoQuality.UHD, "2": VideoQuality.HD, "3": VideoQuality.SD,
+                 "4": VideoQuality.LD}
+BOOLEAN_FIELDS = frozenset({
+    "segment_record", "monitor_status", "scheduled_recording", "enabled_message_push", "only_notify_no_record",
+    "flv_use_direct_download", "hot_standby",
+})
+EXPORT_FIELDS = tuple(name for name, _ in Recording.PERSISTED_FIELDS)
+# Fields that are not taken from an imported row, the importer assigns them
+ASSIGNED_FIELDS = frozenset({"rec_id", "platform", "platform_key"})
+
+
+class BulkFormat:
+    CSV = "csv"
+    JSONL = "jsonl"
+    TEXT = "txt"
+
+    @staticmethod
+    def get_formats() -> list[str]:
+        return [BulkFormat.CSV, BulkFormat.JSONL, BulkFormat.TEXT]
+
+    @staticmethod
+    def from_path(path: str) -> str:
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            return BulkFormat.CSV
+        if extension in (".jsonl", ".ndjson"):
+            return BulkFormat.JSONL
+        return BulkFormat.TEXT
+
+
+def parse_text_line(line: str) -> dict | None:
+    """Parse a line of the batch entry syntax: 'url', 'quality,url', 'url,streamer_name' or all three."""
+    if "http" not in line:
+        return None
+    fields = [field.strip() for field in line.strip().replace("，", ",").split(",") if field.strip()]
+    row = {}
+    if len(fields) >= 3:
+        row["quality"], row["url"] = fields[:2]
+        row["streamer_name"] = ",".join(fields[2:])
+    elif len(fields) == 2:
+        if fields[1].startswith("http"):
+            row["quality"], row["url"] = fields
+        else:
+            row["url"], row["streamer_name"] = fields
+    else:
+        row["url"] = fields[0]
+    return row
+
+
+def _parse_csv(lines: Iterable[str]) -> Iterator[dict | None]:
+    reader = csv.reader(lines)
+    header = None
+    for cells in reader:
+        if not any(cell.strip() for cell in cells):
+            continue
+        if header is None and "url" in (cell.strip().lower() for cell in cells):
+            header = [cell.strip().lower() for cell in cells]
+            continue
+        if header is None:
+            # A CSV without header row uses the column order of the batch entry syntax
+            yield parse_text_line(",".join(cells))
+            continue
+        row = {}
+        for key, value in zip(header, cells):
+            value = value.strip()
+            if not value:
+                continue
+            if key in BOOLEAN_FIELDS:
+                row[key] = value.lower() in ("1", "true", "yes", "on")
+            else:
+                row[key] = value
+        yield row if row.get("url") else None
+
+
+def _parse_jsonl(lines: Iterable[str]) -> Iterator[dict | None]:
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield None
+            continue
+        yield row if isinstance(row, dict) and isinstance(row.get("url"), str) else None
+
+
+def _parse_text(lines: Iterable[str]) -> Iterator[dict | None]:
+    for line in lines:
+        if line.strip() and not line.lstrip().startswith("#"):
+            yield parse_text_line(line)
+
+
+def iter_rows(lines: Iterable[str], file_format: str) -> Iterator[dict | None]:
+    """
+    Lazily parse import rows, so a file is read as the rows are consumed.
+
+    :param lines: A text file or any other iterable of lines.
+    :param file_format: One of BulkFormat, CSV files with a header row may carry any exported field.
+    :return: One dict per entry, None for entries that cannot be parsed.
+    """
+    if file_format == BulkFormat.CSV:
+        return _parse_csv(lines)
+    if file_format == BulkFormat.JSONL:
+        return _parse_jsonl(lines)
+    return _parse_text(lines)
+
+
+class ImportProgress:
+    # Unsupported urls kept for the report, a large file of foreign urls is only counted beyond this
+    MAX_UNSUPPORTED_URLS = 100
+
+    def __init__(self):
+        self.read = 0
+        self.added = 0
+        self.duplicates = 0
+        self.unsupported = 0
+        self.invalid = 0
+        self.recordings = []
+        self.unsupported_urls = []
+
+    def __str__(self):
+        return (
+            f"read {self.read}, added {self.added}, duplicates {self.duplicates}, "
+            f"unsupported {self.unsupported}, invalid {self.invalid}"
+        )
+
+
+class RecordingImporter:
+    """
+    Turns a stream of import rows into new recordings, one batch at a time. Parsing, url normalization,
+    duplicate checks and platform detection of a batch run in a worker thread, so neither the input nor the
+    recordings are held in memory twice and the event loop stays responsive while 100k entries are imported.
+    Urls are checked against the recording index and the rows already imported, new recordings get the
+    defaults of the user settings for every field a row leaves out.
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, index: RecordingIndex, user_config: dict, language: dict | None = None,
+                 on_progress: Callable[[ImportProgress], Awaitable[None]] | None = None):
+        """
+        :param language: The recording_manager and video_quality texts, they name the rooms imported without
+                         a streamer name.
+        """
+        self.index = index
+        self.user_config = user_config
+        self.language = language or {}
+        self.default_streamer_name = self.language.get("live_room", "")
+        self.on_progress = on_progress
+        self.progress = ImportProgress()
+        self.seen_url_keys = set()
+
+    def get_defaults(self) -> dict:
+        user_config = self.user_config
+        return {
+            "record_format": user_config.get("video_format", "TS"),
+            "segment_record": user_config.get("segmented_recording_enabled", False),
+            "segment_time": user_config.get("video_segment_time", "1800"),
+            "monitor_status": True,
+            "scheduled_recording": user_config.get("scheduled_recording", False),
+            "scheduled_start_time": user_config.get("scheduled_start_time"),
+            "monitor_hours": user_config.get("monitor_hours"),
+            "recording_dir": None,
+            "enabled_message_push": False,
+            "only_notify_no_record": user_config.get("only_notify_no_record"),
+            "flv_use_direct_download": user_config.get("flv_use_direct_download"),
+        }
+
+    def create_recording(self, row: dict, defaults: dict) -> Recording | None:
+        """Build a recording from a row, None if its url is a duplicate or its platform is not supported."""
+        url = row["url"].strip()
+        url_key = RecordingIndex.normalize_url(url)
+        if url_key in self.seen_url_keys or url_key in self.index.by_url:
+            self.progress.duplicates += 1
+            return None
+
+        platform, platform_key = get_platform_info(url)
+        if not platform:
+            logger.warning(f"This platform does not support recording: {url}")
+            self.progress.unsupported += 1
+            if len(self.progress.unsupported_urls) < ImportProgress.MAX_UNSUPPORTED_URLS:
+                self.progress.unsupported_urls.append(url)
+            return None
+
+        self.seen_url_keys.add(url_key)
+        data = dict(defaults)
+        data.update((key, value) for key, value in row.items() if key in EXPORT_FIELDS and key not in ASSIGNED_FIELDS)
+        quality = str(data.get("quality") or VideoQuality.OD).upper()
+        data["quality"] = QUALITY_CODES.get(quality, quality if quality in VideoQuality.get_qualities() else "OD")
+        data["url"] = url
+        data["rec_id"] = str(uuid.uuid4())
+        data["platform"] = platform
+        data["platform_key"] = platform_key
+        if not data.get("streamer_name"):
+            # Like rooms added without a name, the url tells them apart until the streamer name is known
+            data["streamer_name"] = self.default_streamer_name
+            quality_info = self.language.get(data["quality"], data["quality"])
+            data["display_title"] = f"{self.default_streamer_name}{url.split('?')[0]}... - {quality_info}"
+        return Recording.from_dict(data)
+
+    def prepare_batch(self, rows: Iterator[dict | None]) -> list[Recording] | None:
+        """Read and validate up to BATCH_SIZE rows, None once the rows are exhausted."""
+        chunk = list(islice(rows, self.BATCH_SIZE))
+        if not chunk:
+            return None
+        defaults = self.get_defaults()
+        recordings = []
+        for row in chunk:
+            self.progress.read += 1
+            if row is None:
+                self.progress.invalid += 1
+                continue
+            recording = self.create_recording(row, defaults)
+            if recording is not None:
+                recordings.append(recording)
+        return recordings
+
+    async def run(self, rows: Iterable[dict | None],
+                  add_batch: Callable[[list[Recording]], Awaitable[None]]) -> ImportProgress:
+        """
+        Import all rows.
+
+        :param rows: Import rows, usually from iter_rows() over an open file.
+        :param add_batch: Adds a batch of new recordings, persisting them is left to the caller.
+        """
+        rows = iter(rows)
+        while True:
+            recordings = await asyncio.to_thread(self.prepare_batch, rows)
+            if recordings is None:
+                break
+            if recordings:
+                await add_batch(recordings)
+                self.progress.added += len(recordings)
+                self.progress.recordings.extend(recordings)
+            if self.on_progress:
+                await self.on_progress(self.progress)
+        logger.info(f"Import recordings: {self.progress}")
+        return self.progress
+
+
+def export_records(records: Iterable[dict], file, file_format: str) -> int:
+    """
+    Write recordings one by one to an open text file.
+
+    :param records: Recording dicts as returned by Recording.to_dict() or the recording store.
+    :param file: A text file, CSV output expects it to be opened with newline="".
+    :return: The number of recordings written.
+    """
+    count = 0
+    if file_format == BulkFormat.CSV:
+        writer = csv.writer(file)
+        writer.writerow(EXPORT_FIELDS)
+        for record in records:
+            writer.writerow(["" if record.get(key) is None else record.get(key) for key in EXPORT_FIELDS])
+            count += 1
+    elif file_format == BulkFormat.JSONL:
+        for record in records:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    else:
+        quality_codes = {quality: code for code, quality in QUALITY_CODES.items()}
+        for record in records:
+            fields = [quality_codes.get(record.get("quality"), "0"), record["url"]]
+            if record.get("streamer_name"):
+                fields.append(record["streamer_name"])
+            file.write(",".join(fields) + "\n")
+            count += 1
+    return count
+
+
+def export_to_path(records: Iterable[dict], path: str, file_format: str | None = None) -> int:
+    """Export to a file, written next to it first so a failed export leaves an existing file intact."""
+    file_format = file_format or BulkFormat.from_path(path)
+    temp_path = utils.make_temp_path(path)
+    try:
+        with open(temp_path, "w", encoding="utf-8", newline="") as file:
+            count = export_records(records, file, file_format)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return count
+
+
+def _open_store(config_manager: ConfigManager):
+    user_config = config_manager.load_user_config()
+    backend = user_config.get("recordings_storage_backend", RecordingStorageBackend.JSON)
+    return create_recording_store(config_manager, backend), user_config
+
+
+def _close_store(store) -> None:
+    if hasattr(store, "close"):
+        store.close()
+
+
+def _get_language(run_path: str, config_manager: ConfigManager, user_config: dict) -> dict:
+    """The localized texts the recording manager uses, they name the live rooms added without a streamer name."""
+    language_option = config_manager.load_language_config()
+    language_code = language_option.get(user_config.get("language"), next(iter(language_option.values()), "en"))
+    language = config_manager.load_i18n_config(os.path.join(run_path, "locales", f"{language_code}.json"))
+    texts = {}
+    for key in ("recording_manager", "video_quality"):
+        texts.update(language.get(key, {}))
+    return texts
+
+
+async def import_file(run_path: str, path: str, file_format: str | None = None) -> ImportProgress:
+    """
+    Import a file into the recording store without starting the app, all new recordings are saved at once.
+    Refused while the app is running, it would overwrite the imported recordings with its own list.
+    """
+    config_manager = ConfigManager(run_path)
+    instance_lock = InstanceLock(config_manager.config_path)
+    if not instance_lock.acquire():
+        raise RuntimeError("The app is running, close it before importing recordings")
+    try:
+        return await _import_file(run_path, config_manager, path, file_format)
+    finally:
+        instance_lock.release()
+
+
+async def _import_file(run_path: str, config_manager: ConfigManager, path: str,
+                       file_format: str | None) -> ImportProgress:
+    store, user_config = _open_store(config_manager)
+    language = _get_language(run_path, config_manager, user_config)
+    try:
+        recordings = [Recording.from_dict(record) for record in store.load()]
+        index = RecordingIndex()
+        index.rebuild(recordings)
+
+        async def add_batch(batch: list[Recording]) -> None:
+            recordings.extend(batch)
+            for recording in batch:
+                index.add(recording)
+
+        async def log_progress(progress: ImportProgress) -> None:
+            logger.info(f"Import recordings: {progress}")
+
+        importer = RecordingImporter(index, user_config, language, log_progress)
+        with open(path, encoding="utf-8-sig", newline="") as file:
+            progress = await importer.run(iter_rows(file, file_format or BulkFormat.from_path(path)), add_batch)
+        if progress.recordings:
+            await store.save(store.snapshot(recordings, {recording.rec_id for recording in progress.recordings}))
+        return progress
+    finally:
+        _close_store(store)
+
+
+async def export_file(run_path: str, path: str, file_format: str | None = None) -> int:
+    """Export the recordings of the recording store without starting the app."""
+    store, _ = _open_store(ConfigManager(run_path))
+    try:
+        records = store.load()
+    finally:
+        _close_store(store)
+    return await asyncio.to_thread(export_to_path, records, path, file_format)
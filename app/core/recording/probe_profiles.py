@@ -0,0 +1,170 @@
+import asyncio
+import copy
+import glob
+import json
+import os
+from datetime import datetime
+
+from ...utils.logger import logger
+from ..config.write_behind import WriteBehindPersister
+
+# Probe limits used once the stream layout of a room is known, the defaults probe for up to 20-40 seconds
+TUNED_PROBE_OPTIONS = {
+    "video": {"analyzeduration": "5000000", "probesize": "5000000"},
+    "audio": {"analyzeduration": "1000000", "probesize": "500000"},
+}
+
+
+class ProbeProfileStore:
+    """
+    Remembers the codecs and stream layout each platform and streamer produced in previous recordings,
+    so that ffmpeg can be started with much tighter probe limits than the defaults.
+    There is one store per process, shared by the recording managers of all web sessions, and changes
+    are written behind so that a burst of recording starts saves the file once.
+    """
+
+    MAX_FAILURES = 3
+    EMA_WEIGHT = 0.3
+    LEARN_DELAY = 5
+    SAVE_DELAY = 5
+
+    def __init__(self, config_manager):
+        self.profiles = config_manager.load_probe_profiles_config() or {}
+        self.profiles.setdefault("platforms", {})
+        self.profiles.setdefault("streamers", {})
+        self.fallback_urls = set()
+        self.persister = WriteBehindPersister(
+            self._snapshot, config_manager.save_probe_profiles_config, delay=self.SAVE_DELAY
+        )
+
+    def _snapshot(self) -> dict:
+        return copy.deepcopy(self.profiles)
+
+    def get_profile(self, platform_key: str, live_url: str) -> dict | None:
+        """Return the streamer profile, or the platform profile when the streamer is not known yet."""
+        profile = self.profiles["streamers"].get(live_url)
+        if profile and profile.get("streams"):
+            return profile
+        return self.profiles["platforms"].get(platform_key)
+
+    def has_audio(self, live_url: str) -> bool | None:
+        """Whether the last recorded stream layout of this room had an audio track, None while it is not known."""
+        streams = self.profiles["streamers"].get(live_url, {}).get("streams")
+        if not streams:
+            return None
+        return any(stream.startswith("audio:") for stream in streams)
+
+    def get_probe_options(self, platform_key: str, live_url: str) -> dict | None:
+        """
+        Build the probe options for the next recording of a room.
+
+        :return: Overrides for 'analyzeduration' and 'probesize', or None to use the defaults.
+        """
+        if live_url in self.fallback_urls:
+            self.fallback_urls.discard(live_url)
+            return None
+        profile = self.get_profile(platform_key, live_url)
+        if not profile or not profile.get("streams"):
+            return None
+        if profile.get("failures", 0) >= self.MAX_FAILURES:
+            return None
+        codec_types = {stream.split(":", maxsplit=1)[0] for stream in profile["streams"]}
+        layout = "video" if "video" in codec_types else "audio"
+        return dict(TUNED_PROBE_OPTIONS[layout])
+
+    def _get_profiles(self, platform_key: str, live_url: str) -> list[dict]:
+        platform_profile = self.profiles["platforms"].setdefault(platform_key, {})
+        streamer_profile = self.profiles["streamers"].setdefault(live_url, {"platform_key": platform_key})
+        return [streamer_profile, platform_profile]
+
+    def record_streams(self, platform_key: str, live_url: str, streams: list[str]) -> None:
+        """Store the stream layout of a successful recording, e.g. ['video:h264', 'audio:aac']."""
+        for profile in self._get_profiles(platform_key, live_url):
+            if profile.get("streams") != streams:
+                logger.info(f"Probe profile updated: {platform_key}, {live_url}, {streams}")
+            profile["streams"] = streams
+            profile["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.persister.mark_dirty()
+
+    def record_failure(self, platform_key: str, live_url: str) -> None:
+        """
+        A recording started with tuned probe options failed before writing any output.
+        The next attempt uses the default probe options, after MAX_FAILURES in a row the profile is not used anymore.
+        """
+        for profile in self._get_profiles(platform_key, live_url):
+            profile["failures"] = profile.get("failures", 0) + 1
+        self.fallback_urls.add(live_url)
+        self.persister.mark_dirty()
+        logger.warning(f"Tuned probe options failed, retrying with default probe options: {live_url}")
+
+    def record_startup(self, platform_key: str, live_url: str, startup_seconds: float, tuned: bool) -> None:
+        """Track the time from ffmpeg start to the first output bytes, separately for tuned and default probes."""
+        key = "tuned_startup_seconds" if tuned else "default_startup_seconds"
+        for profile in self._get_profiles(platform_key, live_url):
+            if tuned:
+                profile["failures"] = 0
+            previous = profile.get(key)
+            if previous is None:
+                profile[key] = round(startup_seconds, 3)
+            else:
+                profile[key] = round(previous + self.EMA_WEIGHT * (startup_seconds - previous), 3)
+        self.persister.mark_dirty()
+
+        saved_seconds = self.get_saved_seconds(platform_key, live_url)
+        if tuned and saved_seconds is not None:
+            logger.info(f"Recording started in {startup_seconds:.2f}s, probe profile saved {saved_seconds:.2f}s: "
+                        f"{live_url}")
+        else:
+            logger.info(f"Recording started in {startup_seconds:.2f}s: {live_url}")
+
+    def get_saved_seconds(self, platform_key: str, live_url: str) -> float | None:
+        """Average probe time saved per recording start, falling back to the platform's default startup time."""
+        streamer_profile = self.profiles["streamers"].get(live_url, {})
+        platform_profile = self.profiles["platforms"].get(platform_key, {})
+        tuned = streamer_profile.get("tuned_startup_seconds")
+        default = streamer_profile.get("default_startup_seconds") or platform_profile.get("default_startup_seconds")
+        if tuned is None or default is None:
+            return None
+        return round(default - tuned, 3)
+
+    @staticmethod
+    def _get_probe_file(output_path: str) -> str | None:
+        if "%" in output_path:
+            prefix = output_path.split("%", maxsplit=1)[0]
+            paths = sorted(glob.glob(glob.escape(prefix) + "*"))
+            return paths[-1] if paths else None
+        return output_path if os.path.exists(output_path) else None
+
+    async def learn(self, platform_key: str, live_url: str, output_path: str, startup_info=None) -> None:
+        """Run ffprobe on the file being recorded and store the stream layout it reports."""
+        await asyncio.sleep(self.LEARN_DELAY)
+        probe_file = self._get_probe_file(output_path)
+        if not probe_file:
+            return
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "ffprobe",
+                "-v", "error",
+                "-show_entries", "stream=codec_type,codec_name",
+                "-of", "json",
+                probe_file,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                startupinfo=startup_info
+            )
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=30)
+            streams = [
+                f"{stream['codec_type']}:{stream.get('codec_name', 'unknown')}"
+                for stream in json.loads(stdout or b"{}").get("streams", [])
+                if stream.get("codec_type") in ("video", "audio")
+            ]
+        except Exception as e:
+            logger.debug(f"Failed to probe recording for profile: {probe_file}, {e}")
+            return
+
+        if streams:
+            self.record_streams(platform_key, live_url, streams)
+
+    async def flush(self) -> None:
+        await self.persister.flush()
@@ -0,0 +1,149 @@
+import asyncio
+import os
+import tempfile
+import time
+
+from ...models.media.video_quality_model import VideoQuality
+from ...models.recording.recording_priority_model import RecordingPriority
+from ...utils.logger import logger
+
+
+class QualityPolicy:
+    """
+    Steers new and restarted recordings to lower quality tiers while the host is under
+    ingest bandwidth or disk write pressure, and back to the configured quality once it clears.
+    There is one policy per process, shared by the recording managers of all web sessions. The pressure
+    checks use the settings and video directory passed with the latest get_quality() call.
+    """
+
+    CHECK_INTERVAL = 30
+    RELEASE_RATIO = 0.8
+    # Running recordings keep their quality, give the new tier time to take effect before the next step
+    STEP_HOLD_SECONDS = 300
+    DISK_PROBE_SIZE = 256 * 1024
+    DISK_PROBE_PREFIX = ".write_probe_"
+
+    def __init__(self, admission_controller):
+        self.admission_controller = admission_controller
+        self.user_config = {}
+        self.video_save_path = None
+        self.task = None
+        self.level = 0
+        self.level_changed_at = 0
+        self.reason = None
+        self.disk_latency_ms = None
+        self.applied_qualities = {}
+        self.is_running = False
+
+    @property
+    def ingest_threshold(self) -> int:
+        """Aggregate ingest threshold in bytes per second, 0 disables it."""
+        return int(float(self.user_config.get("pressure_ingest_mbps") or 0) * 1_000_000 / 8)
+
+    @property
+    def disk_latency_threshold(self) -> float:
+        return float(self.user_config.get("pressure_disk_latency_ms") or 0)
+
+    @property
+    def is_enabled(self) -> bool:
+        return bool(self.ingest_threshold or self.disk_latency_threshold)
+
+    def get_quality(self, recording, user_config: dict, video_save_path: str) -> str:
+        """
+        Quality the next recording of this room should use under the current pressure level.
+
+        :param recording: The recording about to start.
+        :param user_config: Settings of the calling session, used for the pressure thresholds.
+        :param video_save_path: Directory the recording is written to, used for the disk latency probe.
+        """
+        self.user_config = user_config
+        self.video_save_path = video_save_path
+        if not self.is_running and self.is_enabled:
+            self.is_running = True
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+        quality = recording.quality
+        qualities = VideoQuality.get_qualities()
+        if self.level and recording.priority != RecordingPriority.HIGH and quality in qualities:
+            quality = qualities[min(qualities.index(quality) + self.level, len(qualities) - 1)]
+
+        previous_quality = self.applied_qualities.get(recording.rec_id, recording.quality)
+        if quality != previous_quality:
+            reason = self.reason if quality != recording.quality else "pressure cleared"
+            logger.warning(f"Quality policy: {recording.streamer_name} ({recording.rec_id}) "
+                           f"{previous_quality} -> {quality}, {reason}")
+        if quality == recording.quality:
+            self.applied_qualities.pop(recording.rec_id, None)
+        else:
+            self.applied_qualities[recording.rec_id] = quality
+        return quality
+
+    def measure_disk_latency(self, video_save_path: str) -> float | None:
+        """
+        Time in milliseconds to write and fsync a small file in the video directory, blocking.
+        The probe file has a unique name, so a second app instance on the same directory does not remove it midway.
+        """
+        probe_path = None
+        data = os.urandom(self.DISK_PROBE_SIZE)
+        try:
+            start_time = time.perf_counter()
+            fd, probe_path = tempfile.mkstemp(prefix=self.DISK_PROBE_PREFIX, dir=video_save_path)
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            return (time.perf_counter() - start_time) * 1000
+        except OSError as e:
+            logger.debug(f"Disk latency probe failed: {e}")
+            return None
+        finally:
+            if probe_path and os.path.exists(probe_path):
+                os.remove(probe_path)
+
+    def evaluate(self, ingest_bytes_per_second: float, disk_latency_ms: float | None) -> None:
+        """Raise the pressure level by one tier while a threshold is exceeded, lower it once both are clear."""
+        ingest_threshold = self.ingest_threshold
+        disk_threshold = self.disk_latency_threshold
+        reasons = []
+        if ingest_threshold and ingest_bytes_per_second > ingest_threshold:
+            reasons.append(f"ingest {ingest_bytes_per_second * 8 / 1_000_000:.1f} Mbps")
+        if disk_threshold and disk_latency_ms is not None and disk_latency_ms > disk_threshold:
+            reasons.append(f"disk write latency {disk_latency_ms:.0f} ms")
+
+        is_clear = (
+            (not ingest_threshold or ingest_bytes_per_second < ingest_threshold * self.RELEASE_RATIO)
+            and (not disk_threshold or disk_latency_ms is None or disk_latency_ms < disk_threshold * self.RELEASE_RATIO)
+        )
+        max_level = len(VideoQuality.get_qualities()) - 1
+        if self.level_changed_at and time.monotonic() - self.level_changed_at < self.STEP_HOLD_SECONDS:
+            return
+        if reasons and self.level < max_level:
+            self.level += 1
+            self.level_changed_at = time.monotonic()
+            self.reason = ", ".join(reasons)
+            logger.warning(f"Quality policy: pressure level raised to {self.level} ({self.reason})")
+        elif is_clear and self.level:
+            self.level -= 1
+            self.level_changed_at = time.monotonic()
+            logger.info(f"Quality policy: pressure level lowered to {self.level}")
+
+    async def run(self) -> None:
+        admission_controller = self.admission_controller
+        loop = asyncio.get_running_loop()
+        try:
+            while self.is_enabled:
+                await asyncio.sleep(self.CHECK_INTERVAL)
+                if not admission_controller.admitted:
+                    break
+                if self.disk_latency_threshold:
+                    self.disk_latency_ms = await loop.run_in_executor(
+                        None, self.measure_disk_latency, self.video_save_path
+                    )
+                self.evaluate(admission_controller.get_used_bandwidth(), self.disk_latency_ms)
+        finally:
+            # Without active recordings there is no pressure left
+            self.is_running = False
+            self.task = None
+            self.level = 0
+            self.level_changed_at = 0
+            self.reason = None
@@ -8,13 +8,33 @@ from ...models.recording.recording_model import Recording
 from ...models.recording.recording_status_model import RecordingStatus
 from ...utils import utils
 from ...utils.logger import logger
-from ..platforms.platform_handlers import get_platform_info
+from ..config.recording_store import RecordingStorageBackend, create_recording_store
+from ..platforms.platform_handlers import PlatformHandler, get_platform_info
+from ..runtime.script_runner import ScriptRunner
+from ..runtime.state_journal import RuntimeStateJournal
+from .admission_controller import AdmissionController, AdmissionDecision
+from .bulk_transfer import ImportProgress, RecordingImporter, export_to_path
+from .probe_profiles import ProbeProfileStore
+from .quality_policy import QualityPolicy
+from .recording_index import RecordingIndex
+from .recording_persistence import RecordingPersistence
+from .session_history import SessionHistory
+from .stall_watchdog import StallWatchdog
 from .stream_manager import LiveStreamRecorder
 
 
 class GlobalRecordingState:
     recordings = []
+    index = RecordingIndex()
     lock = threading.Lock()
+    # Process-wide services shared by the recording managers of all web sessions
+    persistence = None
+    state_journal = None
+    session_history = None
+    admission_controller = None
+    script_runner = None
+    probe_profiles = None
+    quality_policy = None
 
 
 class RecordingManager:
@@ -24,12 +44,36 @@ class RecordingManager:
         self.periodic_task_started = False
         self.loop_time_seconds = None
         self.app.language_manager.add_observer(self)
+        if GlobalRecordingState.persistence is None:
+            recording_store = create_recording_store(
+                app.config_manager,
+                self.settings.user_config.get("recordings_storage_backend", RecordingStorageBackend.JSON)
+            )
+            GlobalRecordingState.persistence = RecordingPersistence(
+                recording_store, lambda: GlobalRecordingState.recordings
+            )
+        Recording.add_update_listener(
+            GlobalRecordingState.index.on_recording_update, RecordingIndex.INDEXED_ATTRIBUTES
+        )
         self.load_recordings()
         self._ = {}
         self.load()
         self.initialize_dynamic_state()
-        max_concurrent = int(self.settings.user_config.get("platform_max_concurrent_requests", 3))
-        self.platform_semaphores = defaultdict(lambda: asyncio.Semaphore(max_concurrent))
+        self.platform_semaphores = self.create_platform_semaphores()
+        self.stall_watchdog = StallWatchdog(app)
+        self.preroll_buffers = {}
+        if GlobalRecordingState.state_journal is None:
+            GlobalRecordingState.state_journal = RuntimeStateJournal(app.config_manager.config_path)
+        if GlobalRecordingState.admission_controller is None:
+            GlobalRecordingState.admission_controller = AdmissionController(GlobalRecordingState.index)
+        if GlobalRecordingState.quality_policy is None:
+            GlobalRecordingState.quality_policy = QualityPolicy(GlobalRecordingState.admission_controller)
+        if GlobalRecordingState.script_runner is None:
+            GlobalRecordingState.script_runner = ScriptRunner()
+        if GlobalRecordingState.probe_profiles is None:
+            GlobalRecordingState.probe_profiles = ProbeProfileStore(app.config_manager)
+        if GlobalRecordingState.session_history is None:
+            GlobalRecordingState.session_history = SessionHistory(app.config_manager.session_history_db_path)
 
     @property
     def recordings(self):
@@ -39,16 +83,90 @@ class RecordingManager:
     def recordings(self, value):
         raise AttributeError("Please use add_recording/update_recording methods to modify data")
 
+    @property
+    def recording_index(self) -> RecordingIndex:
+        return GlobalRecordingState.index
+
+    @property
+    def recording_store(self):
+        return GlobalRecordingState.persistence.recording_store
+
+    @property
+    def state_journal(self) -> RuntimeStateJournal:
+        return GlobalRecordingState.state_journal
+
+    @property
+    def session_history(self) -> SessionHistory:
+        return GlobalRecordingState.session_history
+
+    @property
+    def admission_controller(self) -> AdmissionController:
+        return GlobalRecordingState.admission_controller
+
+    @property
+    def script_runner(self) -> ScriptRunner:
+        return GlobalRecordingState.script_runner
+
+    @property
+    def probe_profiles(self) -> ProbeProfileStore:
+        return GlobalRecordingState.probe_profiles
+
+    @property
+    def quality_policy(self) -> QualityPolicy:
+        return GlobalRecordingState.quality_policy
+
     def load(self):
         language = self.app.language_manager.language
         for key in ("recording_manager", "video_quality"):
             self._.update(language.get(key, {}))
 
+    def create_platform_semaphores(self):
+        max_concurrent = int(self.settings.user_config.get("platform_max_concurrent_requests", 3))
+        return defaultdict(lambda: asyncio.Semaphore(max_concurrent))
+
+    def apply_settings_changes(self, changed_keys: set[str]):
+        """
+        Apply settings changed while the app is running. Running recordings and their ffmpeg processes
+        keep the settings they were started with, the next checks and recordings use the new ones.
+
+        :param changed_keys: Changed user settings keys, 'cookies' or 'accounts' when those files changed.
+        """
+        if "loop_time_seconds" in changed_keys:
+            previous = self.loop_time_seconds
+            self.loop_time_seconds = int(self.settings.user_config.get("loop_time_seconds") or 300)
+            for recording in self.recordings:
+                # Recordings waiting with the notification interval keep it
+                if recording.loop_time_seconds == previous:
+                    recording.loop_time_seconds = self.loop_time_seconds
+        if "platform_max_concurrent_requests" in changed_keys:
+            # Checks waiting on the old semaphores finish with them, new checks use the new limit
+            self.platform_semaphores = self.create_platform_semaphores()
+        handler_keys = {"enable_proxy", "proxy_address", "default_platform_with_proxy", "cookies", "accounts"}
+        if changed_keys & handler_keys:
+            PlatformHandler.clear_instances()
+
+    def release_admission(self, rec_id: str):
+        """Free the admission slot of a finished recording and check the room waiting first."""
+        admission_controller = self.admission_controller
+        had_slot = rec_id in admission_controller.admitted
+        self._check_waiting_room(admission_controller.release(rec_id))
+        if had_slot:
+            logger.info(f"Admission: {rec_id} released, {admission_controller.format_stats(self.settings.user_config)}")
+
+    def discard_admission(self, rec_id: str):
+        """Remove a room that went offline from the admission queue and check the room waiting first."""
+        self._check_waiting_room(self.admission_controller.discard(rec_id))
+
+    def _check_waiting_room(self, recording: Recording | None):
+        if recording:
+            self.app.page.run_task(self.check_if_live, recording)
+
     def load_recordings(self):
-        """Load recordings from a JSON file into objects."""
-        recordings_data = self.app.config_manager.load_recordings_config()
+        """Load recordings from the recording store into objects, once per process."""
         if not GlobalRecordingState.recordings:
+            recordings_data = self.recording_store.load()
             GlobalRecordingState.recordings = [Recording.from_dict(rec) for rec in recordings_data]
+            GlobalRecordingState.index.rebuild(GlobalRecordingState.recordings)
         logger.info(f"Live Recordings: Loaded {len(self.recordings)} items")
 
     def initialize_dynamic_state(self):
@@ -62,28 +180,89 @@ class RecordingManager:
     async def add_recording(self, recording):
         with GlobalRecordingState.lock:
             GlobalRecordingState.recordings.append(recording)
-            await self.persist_recordings()
+            GlobalRecordingState.index.add(recording)
+            await self.persist_recordings(recording)
+
+    async def add_recordings(self, recordings: list[Recording], persist: bool = True):
+        """
+        Add many recordings at once.
+
+        :param persist: Schedule a save, the bulk import saves once after its last batch instead.
+        """
+        for recording in recordings:
+            recording.loop_time_seconds = self.loop_time_seconds
+            recording.update_title(self._[recording.quality])
+        with GlobalRecordingState.lock:
+            GlobalRecordingState.recordings.extend(recordings)
+            for recording in recordings:
+                GlobalRecordingState.index.add(recording)
+        if persist:
+            await self.persist_recordings(*recordings)
+
+    async def import_recordings(self, rows, on_progress=None) -> ImportProgress:
+        """
+        Stream import rows into the recording list in batches and write the new recordings with a single save.
+        Rows without a streamer name are named like live rooms added without one.
+
+        :param rows: Import rows, see bulk_transfer.iter_rows().
+        :param on_progress: Awaited with the ImportProgress after every batch.
+        """
+        importer = RecordingImporter(
+            self.recording_index, self.settings.user_config, self._, on_progress
+        )
+        progress = await importer.run(rows, lambda batch: self.add_recordings(batch, persist=False))
+        if progress.recordings:
+            await self.persist_recordings(*progress.recordings)
+            await self.flush_recordings()
+        return progress
+
+    async def export_recordings(self, path: str, file_format: str | None = None) -> int:
+        """Write the recording list to a CSV, JSONL or text file, recordings are serialized as they are written."""
+        recordings = list(self.recordings)
+        return await asyncio.to_thread(
+            export_to_path, (recording.to_dict() for recording in recordings), path, file_format
+        )
 
     async def remove_recording(self, recording: Recording):
         with GlobalRecordingState.lock:
             GlobalRecordingState.recordings.remove(recording)
-            await self.persist_recordings()
+            GlobalRecordingState.index.remove(recording)
+            await self.persist_recordings(recording)
 
     async def clear_all_recordings(self):
         with GlobalRecordingState.lock:
             GlobalRecordingState.recordings.clear()
+            GlobalRecordingState.index.clear()
             await self.persist_recordings()
 
-    async def persist_recordings(self):
-        """Persist recordings to a JSON file."""
-        data_to_save = [rec.to_dict() for rec in self.recordings]
-        await self.app.config_manager.save_recordings_config(data_to_save)
+    async def persist_recordings(self, *recordings: Recording):
+        """
+        Schedule a save of the recordings, changes within a second are written once.
+
+        :param recordings: The recordings that were added, changed or removed, none means all of them.
+        """
+        GlobalRecordingState.persistence.mark_dirty(*recordings)
+
+    async def flush_recordings(self):
+        """Write pending recording changes, session history and probe profiles now, used on shutdown."""
+        await GlobalRecordingState.persistence.flush()
+        await self.session_history.flush()
+        await self.state_journal.flush()
+        await self.probe_profiles.flush()
+
+    def flush_recordings_threadsafe(self, timeout: float = 5) -> None:
+        """Write pending changes from a thread outside the event loop, e.g. the tray icon or an exit thread."""
+        try:
+            future = asyncio.run_coroutine_threadsafe(self.flush_recordings(), self.app.page.loop)
+            future.result(timeout=timeout)
+        except Exception as e:
+            logger.error(f"Failed to save recordings before exit: {e}")
 
     async def update_recording_card(self, recording: Recording, updated_info: dict):
         """Update an existing recording object and persist changes to a JSON file."""
         if recording:
             recording.update(updated_info)
-            self.app.page.run_task(self.persist_recordings)
+            self.app.page.run_task(self.persist_recordings, recording)
 
     @staticmethod
     async def _update_recording(
@@ -114,7 +293,7 @@ class RecordingManager:
             self.app.page.run_task(self.app.record_card_manager.update_card, recording)
             self.app.page.pubsub.send_others_on_topic("update", recording)
             if auto_save:
-                self.app.page.run_task(self.persist_recordings)
+                self.app.page.run_task(self.persist_recordings, recording)
 
     async def stop_monitor_recording(self, recording: Recording, auto_save: bool = True):
         """
@@ -132,7 +311,7 @@ class RecordingManager:
             self.app.page.run_task(self.app.record_card_manager.update_card, recording)
             self.app.page.pubsub.send_others_on_topic("update", recording)
             if auto_save:
-                self.app.page.run_task(self.persist_recordings)
+                self.app.page.run_task(self.persist_recordings, recording)
 
     async def start_monitor_recordings(self):
         """
@@ -140,11 +319,12 @@ class RecordingManager:
         """
         selected_recordings = await self.get_selected_recordings()
         pre_start_monitor_recordings = selected_recordings if selected_recordings else self.recordings
-        cards_obj = self.app.record_card_manager.cards_obj
+        # Only the recordings passing the filters of the recordings page
+        filtered_ids = set(self.app.recordings.get_filtered_rec_ids())
         for recording in pre_start_monitor_recordings:
-            if cards_obj[recording.rec_id]["card"].visible:
+            if recording.rec_id in filtered_ids:
                 self.app.page.run_task(self.start_monitor_recording, recording, auto_save=False)
-        self.app.page.run_task(self.persist_recordings)
+        self.app.page.run_task(self.persist_recordings, *pre_start_monitor_recordings)
         logger.info(f"Batch Start Monitor Recordings: {[i.rec_id for i in pre_start_monitor_recordings]}")
 
     async def stop_monitor_recordings(self, selected_recordings: list[Recording | None] | None = None):
@@ -154,37 +334,46 @@ class RecordingManager:
         if not selected_recordings:
             selected_recordings = await self.get_selected_recordings()
         pre_stop_monitor_recordings = selected_recordings or self.recordings
-        cards_obj = self.app.record_card_manager.cards_obj
+        # Only the recordings passing the filters of the recordings page
+        filtered_ids = set(self.app.recordings.get_filtered_rec_ids())
         for recording in pre_stop_monitor_recordings:
-            if cards_obj[recording.rec_id]["card"].visible:
+            if recording.rec_id in filtered_ids:
                 self.app.page.run_task(self.stop_monitor_recording, recording, auto_save=False)
-        self.app.page.run_task(self.persist_recordings)
+        self.app.page.run_task(self.persist_recordings, *pre_stop_monitor_recordings)
         logger.info(f"Batch Stop Monitor Recordings: {[i.rec_id for i in pre_stop_monitor_recordings]}")
 
     async def get_selected_recordings(self):
-        return [recording for recording in self.recordings if recording.selected]
+        return self.recording_index.get_selected()
 
     async def remove_recordings(self, recordings: list[Recording]):
         """Remove a recording from the list and update the JSON file."""
         for recording in recordings:
-            if recording in self.recordings:
+            if self.recording_index.get(recording.rec_id) is recording:
                 await self.remove_recording(recording)
                 logger.info(f"Delete Items: {recording.rec_id}-{recording.streamer_name}")
 
     def find_recording_by_id(self, rec_id: str):
         """Find a recording by its ID (hash of dict representation)."""
-        for rec in self.recordings:
-            if rec.rec_id == rec_id:
-                return rec
-        return None
+        return self.recording_index.get(rec_id)
+
+    def find_recordings_by_url(self, url: str) -> list[Recording]:
+        """Find the recordings of a live room, urls differing only in host case or a trailing slash match."""
+        return self.recording_index.find_by_url(url)
+
+    async def recover_interrupted_recordings(self):
+        """Stop ffmpeg processes orphaned by a crash and re-check their rooms without waiting for the next loop."""
+        rec_ids = await self.state_journal.recover()
+        for rec_id in rec_ids:
+            recording = self.find_recording_by_id(rec_id)
+            if recording and recording.monitor_status:
+                self.app.page.run_task(self.check_if_live, recording)
 
     async def check_all_live_status(self):
         """Check the live status of all recordings and update their display titles."""
-        for recording in self.recordings:
-            if recording.monitor_status and not recording.is_recording:
-                is_exceeded = utils.is_time_interval_exceeded(recording.detection_time, recording.loop_time_seconds)
-                if not recording.detection_time or is_exceeded:
-                    self.app.page.run_task(self.check_if_live, recording)
+        for recording in self.recording_index.get_by_status("monitoring"):
+            is_exceeded = utils.is_time_interval_exceeded(recording.detection_time, recording.loop_time_seconds)
+            if not recording.detection_time or is_exceeded:
+                self.app.page.run_task(self.check_if_live, recording)
 
     async def setup_periodic_live_check(self, interval: int = 180):
         """Set up a periodic task to check live status."""
@@ -192,6 +381,7 @@ class RecordingManager:
         async def periodic_check():
             while True:
                 await asyncio.sleep(interval)
+                self.log_runtime_stats()
                 await self.check_free_space()
                 if self.app.recording_enabled:
                     await self.check_all_live_status()
@@ -200,6 +390,21 @@ class RecordingManager:
             self.periodic_task_started = True
             await periodic_check()
 
+    def log_runtime_stats(self):
+        """Log the process count, CPU time and memory of the child processes per role and the stalls per platform."""
+        role_totals = self.app.process_manager.get_role_totals()
+        if role_totals:
+            summary = ", ".join(
+                f"{role}: {total['count']} processes, {total['cpu_seconds']:.1f}s CPU, "
+                f"{total['rss_bytes'] / 1024 / 1024:.1f} MiB"
+                for role, total in role_totals.items()
+            )
+            logger.info(f"Child processes: {summary}")
+        stall_counts = self.stall_watchdog.get_stall_counts()
+        if stall_counts:
+            summary = ", ".join(f"{platform_key}: {count}" for platform_key, count in sorted(stall_counts.items()))
+            logger.info(f"Stalled recordings restarted since start: {summary}")
+
     async def check_if_live(self, recording: Recording):
         """Check if the live stream is available, fetch stream data and update is_live status."""
 
@@ -232,7 +437,7 @@ class RecordingManager:
             if platform and platform_key and (recording.platform is None or recording.platform_key is None):
                 recording.platform = platform
                 recording.platform_key = platform_key
-                self.app.page.run_task(self.persist_recordings)
+                self.app.page.run_task(self.persist_recordings, recording)
 
             # Use platform_key for display
             platform = platform_key
@@ -251,7 +456,7 @@ class RecordingManager:
                 "segment_record": recording.segment_record,
                 "segment_time": recording.segment_time,
                 "save_format": recording.record_format,
-                "quality": recording.quality,
+                "quality": self.quality_policy.get_quality(recording, self.settings.user_config, output_dir),
             }
 
             semaphore = self.platform_semaphores[platform_key]
@@ -307,7 +512,27 @@ class RecordingManager:
                     self.app.page.run_task(msg_manager.push_messages, msg_title, push_content)
                     recording.notified_live_start = True
 
+                decision = None
                 if not recording.only_notify_no_record:
+                    recorder.open_preroll_buffer(stream_info)
+                    decision = self.admission_controller.request(recording, user_config, recorder.quality)
+                    if decision.action == AdmissionDecision.DOWNGRADE:
+                        # The stream URL depends on the quality, so fetch it again for the admitted quality
+                        await recorder.close_preroll_buffer()
+                        recorder.quality = decision.quality
+                        async with semaphore:
+                            downgraded_stream_info = await recorder.fetch_stream()
+                        if downgraded_stream_info and downgraded_stream_info.is_live:
+                            stream_info = downgraded_stream_info
+                        else:
+                            recorder.quality = recording_info["quality"]
+
+                if decision and decision.action in (AdmissionDecision.QUEUE, AdmissionDecision.NOTIFY_ONLY):
+                    # The standby connection would take the bandwidth the admission controller held back
+                    self.app.page.run_task(recorder.close_preroll_buffer)
+                if decision and decision.action == AdmissionDecision.QUEUE:
+                    recording.status_info = RecordingStatus.WAITING_FOR_CAPACITY
+                elif decision and decision.action != AdmissionDecision.NOTIFY_ONLY:
                     recording.status_info = RecordingStatus.PREPARING_RECORDING
                     recording.loop_time_seconds = self.loop_time_seconds
                     self.start_update(recording)
@@ -324,6 +549,7 @@ class RecordingManager:
                     recording.status_info = RecordingStatus.LIVE_BROADCASTING
 
             else:
+                self.discard_admission(recording.rec_id)
                 if recording.is_live:
                     recording.is_live = False
                     self.app.page.run_task(recorder.end_message_push)
@@ -339,7 +565,7 @@ class RecordingManager:
                             "display_title": title,
                         }
                     )
-                    self.app.page.run_task(self.persist_recordings)
+                    self.app.page.run_task(self.persist_recordings, recording)
 
             self.app.page.run_task(self.app.record_card_manager.update_card, recording)
             self.app.page.pubsub.send_others_on_topic("update", recording)
@@ -0,0 +1,158 @@
+from collections import defaultdict
+from urllib.parse import urlsplit, urlunsplit
+
+from ...models.recording.recording_status_model import RecordingStatus
+
+ERROR_STATUSES = (RecordingStatus.RECORDING_ERROR, RecordingStatus.LIVE_STATUS_CHECK_ERROR)
+
+
+class RecordingIndex:
+    """
+    Dict and set indexes over the recording list, by rec_id, normalized url, platform, status filter and
+    selection, so lookups cost O(1) or O(matches) instead of a scan of every recording.
+    RecordingManager keeps them in sync when recordings are added or removed, and the Recording change hook
+    moves a recording between buckets when one of the INDEXED_ATTRIBUTES changes.
+    """
+
+    INDEXED_ATTRIBUTES = frozenset(
+        {"url", "platform_key", "is_recording", "is_live", "monitor_status", "status_info", "selected"}
+    )
+    # The status filters of the recordings view, plus 'monitoring' for monitored rooms that are not recording
+    STATUSES = ("recording", "living", "error", "offline", "stopped", "monitoring")
+
+    def __init__(self):
+        self.by_id = {}
+        self.by_url = defaultdict(set)
+        self.by_platform = defaultdict(set)
+        self.by_status = {status: set() for status in self.STATUSES}
+        self.selected = set()
+        # rec_id -> (url key, platform key, statuses, selected) the recording is currently indexed under
+        self.keys = {}
+
+    @staticmethod
+    def normalize_url(url: str | None) -> str:
+        """Key for duplicate detection: scheme and host are case-insensitive and a trailing slash is ignored."""
+        url = (url or "").strip()
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return url
+        return urlunsplit(
+            (parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, "")
+        )
+
+    @staticmethod
+    def get_statuses(recording) -> frozenset[str]:
+        statuses = set()
+        is_error = recording.status_info in ERROR_STATUSES
+        is_scheduled_out = recording.status_info == RecordingStatus.NOT_IN_SCHEDULED_CHECK
+        if recording.is_recording:
+            statuses.add("recording")
+        elif recording.monitor_status:
+            statuses.add("monitoring")
+        if is_error:
+            statuses.add("error")
+        if recording.monitor_status and not is_error and not is_scheduled_out:
+            if not recording.is_live:
+                statuses.add("offline")
+            elif not recording.is_recording:
+                statuses.add("living")
+        if not recording.monitor_status or is_scheduled_out:
+            statuses.add("stopped")
+        return frozenset(statuses)
+
+    def _get_keys(self, recording) -> tuple:
+        return (
+            self.normalize_url(recording.url),
+            recording.platform_key,
+            self.get_statuses(recording),
+            bool(recording.selected),
+        )
+
+    def _index(self, rec_id: str, keys: tuple) -> None:
+        url_key, platform_key, statuses, selected = keys
+        self.by_url[url_key].add(rec_id)
+        if platform_key:
+            self.by_platform[platform_key].add(rec_id)
+        for status in statuses:
+            self.by_status[status].add(rec_id)
+        if selected:
+            self.selected.add(rec_id)
+        self.keys[rec_id] = keys
+
+    def _unindex(self, rec_id: str) -> None:
+        keys = self.keys.pop(rec_id, None)
+        if keys is None:
+            return
+        url_key, platform_key, statuses, _ = keys
+        for bucket, key in ((self.by_url, url_key), (self.by_platform, platform_key)):
+            rec_ids = bucket.get(key)
+            if rec_ids is not None:
+                rec_ids.discard(rec_id)
+                if not rec_ids:
+                    del bucket[key]
+        for status in statuses:
+            self.by_status[status].discard(rec_id)
+        self.selected.discard(rec_id)
+
+    def add(self, recording) -> None:
+        self._unindex(recording.rec_id)
+        self.by_id[recording.rec_id] = recording
+        self._index(recording.rec_id, self._get_keys(recording))
+
+    def remove(self, recording) -> None:
+        if self.by_id.get(recording.rec_id) is recording:
+            del self.by_id[recording.rec_id]
+            self._unindex(recording.rec_id)
+
+    def clear(self) -> None:
+        self.by_id.clear()
+        self.by_url.clear()
+        self.by_platform.clear()
+        for rec_ids in self.by_status.values():
+            rec_ids.clear()
+        self.selected.clear()
+        self.keys.clear()
+
+    def rebuild(self, recordings: list) -> None:
+        self.clear()
+        for recording in recordings:
+            self.add(recording)
+
+    def on_recording_update(self, recording, changes: dict) -> None:
+        """Recording change hook, re-indexes the recording when an indexed attribute changed."""
+        if self.by_id.get(recording.rec_id) is not recording or self.INDEXED_ATTRIBUTES.isdisjoint(changes):
+            return
+        keys = self._get_keys(recording)
+        if keys != self.keys.get(recording.rec_id):
+            self._unindex(recording.rec_id)
+            self._index(recording.rec_id, keys)
+
+    def get(self, rec_id: str):
+        return self.by_id.get(rec_id)
+
+    def _get_recordings(self, rec_ids) -> list:
+        return [self.by_id[rec_id] for rec_id in rec_ids]
+
+    def find_by_url(self, url: str) -> list:
+        return self._get_recordings(self.by_url.get(self.normalize_url(url), ()))
+
+    def get_by_platform(self, platform_key: str) -> list:
+        return self._get_recordings(self.by_platform.get(platform_key, ()))
+
+    def get_by_status(self, status: str) -> list:
+        return self._get_recordings(self.by_status.get(status, ()))
+
+    def get_selected(self) -> list:
+        return self._get_recordings(self.selected)
+
+    def get_platforms(self) -> dict[str, str]:
+        """Platform names of the indexed recordings by platform_key."""
+        return {key: self.by_id[next(iter(rec_ids))].platform for key, rec_ids in self.by_platform.items()}
+
+    def get_rec_ids(self, status: str = "all", platform_key: str = "all") -> set[str]:
+        """rec_ids matching a status filter and a platform filter, 'all' disables a filter."""
+        rec_ids = set(self.by_id) if status == "all" else set(self.by_status.get(status, ()))
+        if platform_key != "all":
+            rec_ids &= self.by_platform.get(platform_key, set())
+        return rec_ids
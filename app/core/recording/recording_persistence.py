@@ -0,0 +1,58 @@
+from collections.abc import Callable
+
+from ...models.recording.recording_model import Recording
+from ..config.write_behind import WriteBehindPersister
+
+
+class RecordingPersistence:
+    """
+    Saves the recording list through the recording store. Like the recordings it is shared by the recording
+    managers of all web sessions, so a change is tracked and written once whichever session made it and
+    nothing is registered per session on the Recording class.
+    """
+
+    PERSIST_DELAY = 1.0
+
+    def __init__(self, recording_store, get_recordings: Callable[[], list[Recording]]):
+        """
+        :param recording_store: The store the recording list is loaded from and saved to.
+        :param get_recordings: Returns the current recording list when a save is written.
+        """
+        self.recording_store = recording_store
+        self.get_recordings = get_recordings
+        # rec_ids changed since the last save, None when the whole list has to be written
+        self.dirty_rec_ids = set()
+        self.persister = WriteBehindPersister(self._snapshot, self._save, delay=self.PERSIST_DELAY)
+        Recording.add_update_listener(self.on_recording_update)
+
+    def mark_dirty(self, *recordings: Recording) -> None:
+        """
+        Schedule a save of the recordings, changes within PERSIST_DELAY seconds are written once.
+
+        :param recordings: The recordings that were added, changed or removed, none means all of them.
+        """
+        if not recordings:
+            self.dirty_rec_ids = None
+        elif self.dirty_rec_ids is not None:
+            self.dirty_rec_ids.update(recording.rec_id for recording in recordings)
+        self.persister.mark_dirty()
+
+    def on_recording_update(self, recording: Recording, changes: dict) -> None:
+        """Track recordings changed through Recording.update, the store only writes the fields that differ."""
+        if self.dirty_rec_ids is not None:
+            self.dirty_rec_ids.add(recording.rec_id)
+
+    def _snapshot(self):
+        dirty_rec_ids, self.dirty_rec_ids = self.dirty_rec_ids, set()
+        return self.recording_store.snapshot(self.get_recordings(), dirty_rec_ids)
+
+    async def _save(self, payload) -> None:
+        try:
+            await self.recording_store.save(payload)
+        except Exception:
+            # The changed rows are unknown after a failed save, so the retry writes everything
+            self.dirty_rec_ids = None
+            raise
+
+    async def flush(self) -> None:
+        await self.persister.flush()
@@ -0,0 +1,244 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from ...utils.logger import logger
+from ..config.write_behind import WriteBehindPersister
+
+
+class SessionStatus:
+    RECORDING = "recording"
+    ENDED = "ended"
+    # The app exited or crashed while the session was recording
+    INTERRUPTED = "interrupted"
+
+
+class SessionHistory:
+    """
+    History of recording sessions in config/session_history.db, one row per live session of a recording
+    with its start and end, recorded time, bytes, segments, errors, platform, quality and restart count.
+    An output process that starts again within RESTART_WINDOW seconds after the previous one of the same
+    recording ended, e.g. after a stall or a dropped stream, continues that session as a restart.
+    The recorder reports to it in memory, rows are written in batches at most every FLUSH_DELAY seconds,
+    and the aggregate queries for the home view read the indexed table instead of the recording files.
+    There is one history per process, shared by the recording managers of all web sessions, so sessions
+    left recording by a crash are marked interrupted only once, when the process starts.
+    """
+
+    FLUSH_DELAY = 5.0
+    RESTART_WINDOW = 120
+    COLUMNS = (
+        "session_id", "rec_id", "streamer_name", "platform", "platform_key", "quality", "record_format",
+        "start_time", "end_time", "duration", "bytes", "segments", "errors", "restarts", "status",
+    )
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            rec_id TEXT NOT NULL,
+            streamer_name TEXT,
+            platform TEXT,
+            platform_key TEXT,
+            quality TEXT,
+            record_format TEXT,
+            start_time REAL NOT NULL,
+            end_time REAL,
+            duration REAL NOT NULL DEFAULT 0,
+            bytes INTEGER NOT NULL DEFAULT 0,
+            segments INTEGER NOT NULL DEFAULT 0,
+            errors INTEGER NOT NULL DEFAULT 0,
+            restarts INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS sessions_start_time ON sessions (start_time);
+        CREATE INDEX IF NOT EXISTS sessions_rec_id ON sessions (rec_id, start_time);
+        CREATE INDEX IF NOT EXISTS sessions_platform_key ON sessions (platform_key, start_time);
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.connection = None
+        # rec_id -> the session of its current or last output process
+        self.sessions = {}
+        # session_id -> session changed since the last write
+        self.pending = {}
+        self.persister = WriteBehindPersister(self._snapshot, self._save, delay=self.FLUSH_DELAY)
+        try:
+            self.connection = sqlite3.connect(db_path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(self.SCHEMA)
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE sessions SET status = ? WHERE status = ?",
+                    (SessionStatus.INTERRUPTED, SessionStatus.RECORDING),
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to open session history, sessions are not recorded: {e}")
+            self.connection = None
+
+    def begin(self, recording, quality: str | None, record_format: str | None) -> None:
+        """Report that an output process of the recording started."""
+        now = time.time()
+        session = self.sessions.get(recording.rec_id)
+        if (session is not None and session["status"] == SessionStatus.ENDED
+                and now - session["end_time"] <= self.RESTART_WINDOW):
+            session["restarts"] += 1
+        else:
+            session = {
+                "session_id": str(uuid.uuid4()),
+                "rec_id": recording.rec_id,
+                "start_time": now,
+                "end_time": None,
+                "duration": 0.0,
+                "bytes": 0,
+                "segments": 0,
+                "errors": 0,
+                "restarts": 0,
+            }
+            self.sessions[recording.rec_id] = session
+        session.update({
+            "streamer_name": recording.streamer_name,
+            "platform": recording.platform,
+            "platform_key": recording.platform_key,
+            "quality": quality,
+            "record_format": record_format,
+            "status": SessionStatus.RECORDING,
+            "process_start_time": now,
+        })
+        self._mark_dirty(session)
+
+    def end(self, rec_id: str, bytes_written: int, segments: int, failed: bool, final: bool) -> None:
+        """
+        Report that the output process of a recording ended.
+
+        :param bytes_written: Size of the files the process wrote.
+        :param failed: The process ended with an error.
+        :param final: The recording was stopped, so the next process starts a new session.
+        """
+        session = self.sessions.get(rec_id)
+        if session is None or session["status"] != SessionStatus.RECORDING:
+            return
+        now = time.time()
+        session["end_time"] = now
+        session["duration"] += now - session["process_start_time"]
+        session["bytes"] += bytes_written
+        session["segments"] += segments
+        session["errors"] += int(failed)
+        session["status"] = SessionStatus.ENDED
+        self._mark_dirty(session)
+        if final:
+            del self.sessions[rec_id]
+
+    def _mark_dirty(self, session: dict) -> None:
+        self.pending[session["session_id"]] = session
+        if self.connection is not None:
+            self.persister.mark_dirty()
+
+    def _snapshot(self) -> list[tuple]:
+        pending, self.pending = self.pending, {}
+        return [tuple(session.get(column) for column in self.COLUMNS) for session in pending.values()]
+
+    def write(self, rows: list[tuple]) -> None:
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        with self.lock, self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO sessions ({', '.join(self.COLUMNS)}) VALUES ({placeholders})", rows
+            )
+
+    async def _save(self, rows: list[tuple]) -> None:
+        await asyncio.to_thread(self.write, rows)
+        logger.debug(f"Session history saved: {len(rows)} sessions")
+
+    async def flush(self) -> None:
+        await self.persister.flush()
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        if self.connection is None:
+            return []
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def get_totals(self, since: float = 0) -> dict:
+        """Number of sessions, recorded hours, bytes and failed sessions since a timestamp."""
+        (sessions, duration, bytes_written, failed), = self._query(
+            "SELECT COUNT(*), COALESCE(SUM(duration), 0), COALESCE(SUM(bytes), 0), COALESCE(SUM(errors > 0), 0) "
+            "FROM sessions WHERE start_time >= ?",
+            (since,),
+        ) or [(0, 0, 0, 0)]
+        return {"sessions": sessions, "hours": duration / 3600, "bytes": bytes_written, "failed": failed}
+
+    def get_streamer_hours(self, since: float = 0, limit: int = 5) -> list[dict]:
+        """Recorded hours per recording, the streamer name is the one of its latest session."""
+        rows = self._query(
+            "SELECT rec_id, streamer_name, MAX(start_time), SUM(duration) / 3600.0 AS hours "
+            "FROM sessions WHERE start_time >= ? GROUP BY rec_id ORDER BY hours DESC LIMIT ?",
+            (since, limit),
+        )
+        return [{"rec_id": rec_id, "streamer_name": name, "hours": hours} for rec_id, name, _, hours in rows]
+
+    def get_platform_failure_rates(self, since: float = 0) -> list[dict]:
+        """Share of sessions with at least one failed output process, per platform."""
+        rows = self._query(
+            "SELECT platform_key, MAX(platform), COUNT(*) AS sessions, SUM(errors > 0), SUM(restarts) "
+            "FROM sessions WHERE start_time >= ? GROUP BY platform_key ORDER BY sessions DESC",
+            (since,),
+        )
+        return [
+            {
+                "platform_key": platform_key,
+                "platform": platform,
+                "sessions": sessions,
+                "failed": failed,
+                "restarts": restarts,
+                "failure_rate": failed / sessions,
+            }
+            for platform_key, platform, sessions, failed, restarts in rows
+        ]
+
+    def get_summary(self, since: float = 0, limit: int = 5) -> dict:
+        return {
+            "totals": self.get_totals(since),
+            "streamer_hours": self.get_streamer_hours(since, limit),
+            "platform_failure_rates": self.get_platform_failure_rates(since),
+        }
+
+    async def get_summary_async(self, since: float = 0, limit: int = 5) -> dict:
+        """Aggregates for the home view, queried in a worker thread after pending sessions are written."""
+        await self.flush()
+        return await asyncio.to_thread(self.get_summary, since, limit)
+
+    @staticmethod
+    def get_output_stats(save_file_path: str, segmented: bool) -> tuple[int, int]:
+        """
+        Size and number of the files an output process wrote.
+
+        :param save_file_path: The output path, with the %03d segment number pattern for segmented recordings.
+        """
+        if not segmented:
+            try:
+                return os.path.getsize(save_file_path), 1
+            except OSError:
+                return 0, 0
+        directory, filename = os.path.split(save_file_path)
+        prefix = filename.rsplit("_", maxsplit=1)[0] + "_"
+        suffix = os.path.splitext(filename)[1]
+        total_size = count = 0
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith(prefix) and entry.name.endswith(suffix) and entry.is_file():
+                        total_size += entry.stat().st_size
+                        count += 1
+        except OSError:
+            pass
+        return total_size, count
+
+    def close(self) -> None:
+        if self.connection is not None:
+            with self.lock:
+                self.connection.close()
+            self.connection = None
@@ -0,0 +1,114 @@
+import asyncio
+import glob
+import os
+import time
+from collections import defaultdict
+
+from ...utils.logger import logger
+
+
+class StallWatchdog:
+    """
+    Tracks output bytes and ffmpeg progress of every active recording and kills the ffmpeg
+    processes that stop making progress, so that the recorder can restart them.
+    """
+
+    DEFAULT_STALL_SECONDS = 60
+    CHECK_INTERVAL = 5
+
+    def __init__(self, app):
+        self.app = app
+        self.entries = {}
+        self.stall_counts = defaultdict(int)
+        self.is_running = False
+
+    @property
+    def stall_seconds(self) -> int:
+        stall_seconds = self.app.settings.user_config.get("stall_timeout_seconds")
+        return int(stall_seconds or self.DEFAULT_STALL_SECONDS)
+
+    def register(self, rec_id: str, process, output_path: str, platform_key: str | None = None) -> None:
+        if self.stall_seconds <= 0:
+            return
+
+        self.entries[rec_id] = {
+            "process": process,
+            "output_path": output_path,
+            "platform_key": platform_key or "unknown",
+            "output_bytes": 0,
+            "out_time_us": 0,
+            "last_progress_time": time.monotonic(),
+            "stalled": False,
+        }
+        if not self.is_running:
+            self.is_running = True
+            self.app.page.run_task(self.run)
+
+    def unregister(self, rec_id: str) -> bool:
+        """Stop tracking a recording, return True if it was killed by the watchdog."""
+        entry = self.entries.pop(rec_id, None)
+        return bool(entry and entry["stalled"])
+
+    def update_progress(self, rec_id: str, total_size: int | None = None, out_time_us: int | None = None) -> None:
+        """Record a progress report parsed from ffmpeg's -progress output."""
+        entry = self.entries.get(rec_id)
+        if not entry:
+            return
+
+        if total_size and total_size > entry["output_bytes"]:
+            entry["output_bytes"] = total_size
+            entry["last_progress_time"] = time.monotonic()
+        if out_time_us and out_time_us > entry["out_time_us"]:
+            entry["out_time_us"] = out_time_us
+            entry["last_progress_time"] = time.monotonic()
+
+    def get_stall_counts(self) -> dict[str, int]:
+        return dict(self.stall_counts)
+
+    @staticmethod
+    def get_output_bytes(output_path: str) -> int:
+        """Size of the output file, or of all segments when the path is a segment pattern."""
+        try:
+            if "%" in output_path:
+                prefix = output_path.split("%", maxsplit=1)[0]
+                return sum(os.path.getsize(path) for path in glob.glob(glob.escape(prefix) + "*"))
+            return os.path.getsize(output_path)
+        except OSError:
+            return 0
+
+    def check(self) -> None:
+        now = time.monotonic()
+        stall_seconds = self.stall_seconds
+        for rec_id, entry in list(self.entries.items()):
+            process = entry["process"]
+            if process.returncode is not None or entry["stalled"]:
+                continue
+
+            output_bytes = self.get_output_bytes(entry["output_path"])
+            if output_bytes > entry["output_bytes"]:
+                entry["output_bytes"] = output_bytes
+                entry["last_progress_time"] = now
+                continue
+
+            if now - entry["last_progress_time"] < stall_seconds:
+                continue
+
+            platform_key = entry["platform_key"]
+            entry["stalled"] = True
+            self.stall_counts[platform_key] += 1
+            logger.warning(
+                f"Recording stalled for {stall_seconds}s, restarting: {rec_id} "
+                f"(platform: {platform_key}, stalls: {self.stall_counts[platform_key]})"
+            )
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+
+    async def run(self) -> None:
+        try:
+            while self.entries:
+                await asyncio.sleep(self.CHECK_INTERVAL)
+                self.check()
+        finally:
+            self.is_running = False
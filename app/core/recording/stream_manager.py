@@ -1,4 +1,5 @@
 import asyncio
+import glob
 import os
 import shutil
 import subprocess
@@ -13,9 +14,14 @@ from ...utils import utils
 from ...utils.logger import logger
 from ..media import ffmpeg_builders
 from ..media.direct_downloader import DirectStreamDownloader
+from ..media.keyframe_index import KeyframeIndex
+from ..media.preroll_buffer import FlvPrerollBuffer
+from ..media.remuxer import InProcessRemuxer
+from ..media.subtitle_writer import TimeSubtitleWriter
 from ..platforms import platform_handlers
 from ..platforms.platform_handlers import StreamData
-from ..runtime.process_manager import BackgroundService
+from ..runtime.process_manager import BackgroundService, ProcessRole, get_resource_command_prefix
+from ..runtime.script_runner import ScriptRunner
 
 T = TypeVar("T")
 
@@ -24,6 +30,7 @@ class LiveStreamRecorder:
     DEFAULT_SEGMENT_TIME = "1800"
     DEFAULT_SAVE_FORMAT = "mp4"
     DEFAULT_QUALITY = VideoQuality.OD
+    DIRECT_DOWNLOAD_PLATFORMS = ["shopee"]
 
     def __init__(self, app, recording, recording_info):
         self.app = app
@@ -46,6 +53,9 @@ class LiveStreamRecorder:
         self.save_format = self._get_info("save_format", default=self.DEFAULT_SAVE_FORMAT).lower()
         self.proxy = self.is_use_proxy()
         self.direct_downloader = None
+        self.preview_dir = None
+        self.probe_options = None
+        self.preroll_buffer = None
         os.makedirs(self.output_dir, exist_ok=True)
         self.app.language_manager.add_observer(self)
         self._ = {}
@@ -127,7 +137,7 @@ class LiveStreamRecorder:
                 output_dir = os.path.join(output_dir, f"{now[:10]}_{live_title}")
         os.makedirs(output_dir, exist_ok=True)
         self.recording.recording_dir = output_dir
-        self.app.page.run_task(self.app.record_manager.persist_recordings)
+        self.app.page.run_task(self.app.record_manager.persist_recordings, self.recording)
         return output_dir
 
     def _get_save_path(self, filename: str, use_direct_download: bool = False) -> str:
@@ -173,12 +183,99 @@ class LiveStreamRecorder:
         return url
 
     def set_preview_url(self, stream_info: StreamData):
+        if self.preview_dir:
+            # Viewers read the rolling HLS window written by the recorder instead of pulling the stream again
+            rec_id = self.recording.rec_id
+            if not self.app.page.web:
+                self.recording.preview_url = f"{self.preview_dir}/{ffmpeg_builders.PREVIEW_PLAYLIST_NAME}"
+                return
+            video_api_url = os.getenv("VIDEO_API_EXTERNAL_URL")
+            if video_api_url:
+                playlist_name = ffmpeg_builders.PREVIEW_PLAYLIST_NAME
+                self.recording.preview_url = f"{video_api_url}/api/live/{rec_id}/{playlist_name}"
+                return
         self.recording.preview_url = stream_info.m3u8_url or stream_info.flv_url
 
+    def _get_audio_extract_format(self) -> str | None:
+        audio_format = (self.user_config.get("audio_extract_format") or "").lower()
+        if (
+            audio_format not in ffmpeg_builders.TEE_AUDIO_BUILDERS
+            or self.save_format not in ffmpeg_builders.TEE_VIDEO_FORMATS
+        ):
+            return None
+        if self.app.record_manager.probe_profiles.has_audio(self.live_url) is False:
+            # An output without any stream makes ffmpeg fail the whole recording
+            logger.info(f"Skip audio extraction, the stream has no audio track: {self.live_url}")
+            return None
+        return audio_format
+
+    def _get_preview_dir(self) -> str | None:
+        if not self.user_config.get("local_hls_preview") or self.save_format not in ffmpeg_builders.TEE_VIDEO_FORMATS:
+            return None
+        preview_dir = os.path.join(
+            self.settings.get_video_save_path(), ffmpeg_builders.PREVIEW_DIR_NAME, self.recording.rec_id
+        )
+        return preview_dir.replace("\\", "/")
+
+    def _get_request_headers(self, record_url: str) -> dict[str, str]:
+        headers = {}
+        header_params = self.get_headers_params(record_url, self.platform_key)
+        if header_params:
+            key, value = header_params.split(":", 1)
+            headers[key] = value
+        return headers
+
+    def _get_preroll_buffer(self, record_url: str) -> FlvPrerollBuffer | None:
+        """
+        Return the hot standby buffer of this recording, connecting it if needed.
+        An existing connection is kept across recorder restarts so that no data is lost in between.
+        """
+        if not self.recording.hot_standby or ".flv" not in record_url.split("?", maxsplit=1)[0]:
+            return None
+
+        preroll_buffers = self.app.record_manager.preroll_buffers
+        preroll_buffer = preroll_buffers.get(self.recording.rec_id)
+        if preroll_buffer and preroll_buffer.is_active:
+            return preroll_buffer
+
+        buffer_seconds = int(self.user_config.get("preroll_buffer_seconds") or 10)
+        preroll_buffer = FlvPrerollBuffer(
+            record_url=record_url,
+            buffer_seconds=buffer_seconds,
+            headers=self._get_request_headers(record_url),
+            proxy=self.proxy
+        )
+        preroll_buffer.start()
+        preroll_buffers[self.recording.rec_id] = preroll_buffer
+        logger.info(f"Use Hot Standby with {buffer_seconds}s Pre-roll: {record_url}")
+        return preroll_buffer
+
+    def open_preroll_buffer(self, stream_info: StreamData) -> None:
+        """
+        Connect the hot standby buffer as soon as the room is detected live, before admission and probing,
+        so that the first recording of a live session also starts with a pre-roll.
+        FLV streams saved by the direct downloader do not go through ffmpeg and get no buffer.
+        """
+        if self._use_direct_download(stream_info):
+            return
+        self._get_preroll_buffer(self._get_record_url(stream_info))
+
+    async def close_preroll_buffer(self) -> None:
+        """Disconnect the hot standby buffer of a room that is not going to be recorded now."""
+        preroll_buffers = self.app.record_manager.preroll_buffers
+        preroll_buffer = preroll_buffers.get(self.recording.rec_id)
+        if preroll_buffer and not preroll_buffer.writer:
+            preroll_buffers.pop(self.recording.rec_id, None)
+            await preroll_buffer.stop()
+
+    def _use_direct_download(self, stream_info: StreamData) -> bool:
+        return bool(stream_info.flv_url) and (
+            self.platform_key in self.DIRECT_DOWNLOAD_PLATFORMS or self.recording.flv_use_direct_download
+        )
+
     def _get_record_format(self, stream_info: StreamData):
-        use_flv_record = ["shopee"]
         if stream_info.flv_url:
-            if self.platform_key in use_flv_record or self.recording.flv_use_direct_download:
+            if self._use_direct_download(stream_info):
                 self.save_format = "flv"
                 self.recording.record_format = self.save_format
                 self.recording.segment_record = False
@@ -224,20 +321,15 @@ class LiveStreamRecorder:
         self.recording.recording_dir = os.path.dirname(save_path)
         os.makedirs(self.recording.recording_dir, exist_ok=True)
         record_url = self._get_record_url(stream_info)
+        self.preview_dir = None if use_direct_download else self._get_preview_dir()
         self.set_preview_url(stream_info)
 
         if use_direct_download:
             logger.info(f"Use Direct Downloader to Download FLV Stream: {record_url}")
-            headers = {}
-            header_params = self.get_headers_params(record_url, self.platform_key)
-            if header_params:
-                key, value = header_params.split(":", 1)
-                headers[key] = value
-
             self.direct_downloader = DirectStreamDownloader(
                 record_url=record_url,
                 save_path=save_path,
-                headers=headers,
+                headers=self._get_request_headers(record_url),
                 proxy=self.proxy
             )
 
@@ -251,15 +343,34 @@ class LiveStreamRecorder:
                 self.user_config.get("custom_script_command")
             )
         else:
-            ffmpeg_builder = ffmpeg_builders.create_builder(
-                self.save_format,
-                record_url=record_url,
-                proxy=self.proxy,
-                segment_record=self.segment_record,
-                segment_time=self.segment_time,
-                full_path=save_path,
-                headers=self.get_headers_params(record_url, self.platform_key)
+            builder_kwargs = {
+                "record_url": record_url,
+                "proxy": self.proxy,
+                "segment_record": self.segment_record,
+                "segment_time": self.segment_time,
+                "full_path": save_path,
+                "headers": self.get_headers_params(record_url, self.platform_key),
+            }
+            self.probe_options = self.app.record_manager.probe_profiles.get_probe_options(
+                self.platform_key, self.live_url
             )
+            if self.probe_options:
+                logger.info(f"Use Learned Probe Options: {self.probe_options}")
+                builder_kwargs["probe_options"] = self.probe_options
+            self.preroll_buffer = self._get_preroll_buffer(record_url)
+            if self.preroll_buffer:
+                builder_kwargs["record_url"] = ffmpeg_builders.PIPE_INPUT_URL
+            audio_format = self._get_audio_extract_format()
+            if audio_format or self.preview_dir:
+                ffmpeg_builder = ffmpeg_builders.TeeCommandBuilder(
+                    save_format=self.save_format,
+                    audio_format=audio_format,
+                    audio_path=save_path.rsplit(".", maxsplit=1)[0] + "." + audio_format if audio_format else None,
+                    preview_dir=self.preview_dir,
+                    **builder_kwargs
+                )
+            else:
+                ffmpeg_builder = ffmpeg_builders.create_builder(self.save_format, **builder_kwargs)
             ffmpeg_command = ffmpeg_builder.build_command()
             self.app.page.run_task(
                 self.start_ffmpeg,
@@ -268,7 +379,8 @@ class LiveStreamRecorder:
                 record_url,
                 ffmpeg_command,
                 self.save_format,
-                self.user_config.get("custom_script_command")
+                self.user_config.get("custom_script_command"),
+                save_path
             )
 
     async def start_ffmpeg(
@@ -278,16 +390,24 @@ class LiveStreamRecorder:
             record_url: str,
             ffmpeg_command: list,
             save_type: str,
-            script_command: str | None = None
+            script_command: str | None = None,
+            save_file_path: str | None = None
     ) -> bool:
         """
         The child process executes ffmpeg for recording
         """
 
+        keep_standby = False
+        session_history = self.app.record_manager.session_history
+        session_started = False
+        output_stats = (0, 0)
+        failed = True
         try:
-            save_file_path = ffmpeg_command[-1]
+            save_file_path = save_file_path or ffmpeg_command[-1]
+            started_at = time.monotonic()
 
             process = await asyncio.create_subprocess_exec(
+                *get_resource_command_prefix(ProcessRole.RECORD),
                 *ffmpeg_command,
                 stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
@@ -295,7 +415,17 @@ class LiveStreamRecorder:
                 startupinfo=self.subprocess_start_info
             )
 
-            self.app.add_ffmpeg_process(process)
+            self.app.add_ffmpeg_process(process, ProcessRole.RECORD, self.recording.rec_id)
+            self.app.record_manager.state_journal.record_start(
+                self.recording.rec_id, process.pid, save_file_path, self.live_url
+            )
+            session_history.begin(self.recording, self.quality, self.save_format)
+            session_started = True
+            if self.preroll_buffer:
+                await self.preroll_buffer.attach(process.stdin)
+            stall_watchdog = self.app.record_manager.stall_watchdog
+            stall_watchdog.register(self.recording.rec_id, process, save_file_path, self.platform_key)
+            progress_task = asyncio.create_task(self._read_ffmpeg_progress(process, started_at, save_file_path))
             self.recording.status_info = RecordingStatus.RECORDING
             self.recording.record_url = record_url
             logger.info(f"Recording in Progress: {live_url}")
@@ -305,7 +435,10 @@ class LiveStreamRecorder:
                 if not self.recording.is_recording or not self.app.recording_enabled:
                     logger.info(f"Preparing to End Recording: {live_url}")
 
-                    if os.name == "nt":
+                    if self.preroll_buffer:
+                        # ffmpeg reads the stream from stdin, closing it below ends the recording gracefully
+                        self.preroll_buffer.detach()
+                    elif os.name == "nt":
                         if process.stdin:
                             process.stdin.write(b"q")
                             await process.stdin.drain()
@@ -332,9 +465,23 @@ class LiveStreamRecorder:
 
                 await asyncio.sleep(1)
 
-            return_code = process.returncode
+            has_output = await progress_task
+            is_stalled = stall_watchdog.unregister(self.recording.rec_id)
+            # A stalled recording may be caused by the standby connection itself, so reconnect it
+            keep_standby = self.recording.is_recording and self.app.recording_enabled and not is_stalled
+            # A recording killed by the watchdog is finished like a normal one and then restarted
+            return_code = 0 if is_stalled else process.returncode
             safe_return_code = [0, 255]
             stdout, stderr = await process.communicate()
+            output_stats = await asyncio.to_thread(
+                session_history.get_output_stats, save_file_path, self.segment_record
+            )
+            failed = return_code not in safe_return_code
+            is_probe_failed = bool(self.probe_options) and not has_output and return_code not in safe_return_code
+            if is_probe_failed:
+                # Retry right away, the next attempt falls back to the default probe options
+                self.app.record_manager.probe_profiles.record_failure(self.platform_key, self.live_url)
+
             if return_code not in safe_return_code and stderr:
                 logger.error(f"FFmpeg Stderr Output: {str(stderr.decode()).splitlines()[0]}")
                 self.recording.status_info = RecordingStatus.RECORDING_ERROR
@@ -349,6 +496,9 @@ class LiveStreamRecorder:
                 except Exception as e:
                     logger.debug(f"Failed to update UI: {e}")
 
+                if is_probe_failed and self.app.recording_enabled:
+                    self.app.page.run_task(self.app.record_manager.check_if_live, self.recording)
+
             if return_code in safe_return_code:
                 if self.recording.monitor_status:
                     self.recording.status_info = RecordingStatus.MONITORING
@@ -360,6 +510,9 @@ class LiveStreamRecorder:
                 self.recording.live_title = None
                 if not self.recording.is_recording:
                     logger.success(f"Live recording has stopped: {record_name}")
+                elif is_stalled:
+                    logger.warning(f"Live recording stalled, restarting: {record_name}")
+                    self.recording.is_recording = False
                 else:
 
                     logger.success(f"Live recording completed: {record_name}")
@@ -376,6 +529,8 @@ class LiveStreamRecorder:
                 except Exception as e:
                     logger.debug(f"Failed to update UI: {e}")
 
+                self.app.page.run_task(self.build_keyframe_indexes, save_file_path)
+
                 if self.user_config.get("convert_to_mp4") and self.save_format == "ts":
                     if self.segment_record:
                         file_paths = utils.get_file_paths(os.path.dirname(save_file_path))
@@ -422,7 +577,7 @@ class LiveStreamRecorder:
                             self.user_config.get("convert_to_mp4")
                         )
 
-                if self.app.recording_enabled and not self.is_flv_preferred_platform:
+                if self.app.recording_enabled and (is_stalled or not self.is_flv_preferred_platform):
                     self.app.page.run_task(self.app.record_manager.check_if_live, self.recording)
         except Exception as e:
             logger.error(f"An error occurred during the subprocess execution: {e}")
@@ -440,9 +595,117 @@ class LiveStreamRecorder:
             return False
         finally:
             self.recording.record_url = None
+            self.app.record_manager.stall_watchdog.unregister(self.recording.rec_id)
+            self.app.record_manager.state_journal.record_stop(self.recording.rec_id)
+            self.app.record_manager.release_admission(self.recording.rec_id)
+            if session_started:
+                session_history.end(
+                    self.recording.rec_id, *output_stats, failed,
+                    final=not (self.recording.monitor_status and self.app.recording_enabled)
+                )
+            if self.preroll_buffer:
+                self.preroll_buffer.detach()
+                if not keep_standby:
+                    self.app.record_manager.preroll_buffers.pop(self.recording.rec_id, None)
+                    self.app.page.run_task(self.preroll_buffer.stop)
+            if self.preview_dir:
+                shutil.rmtree(self.preview_dir, ignore_errors=True)
 
         return True
 
+    async def _read_ffmpeg_progress(self, process, started_at: float, save_file_path: str) -> bool:
+        """
+        Drain ffmpeg's -progress output and report it to the stall watchdog.
+        The first output also records the startup time and learns the stream layout for the probe profile.
+
+        :return: True if ffmpeg wrote any output.
+        """
+        stall_watchdog = self.app.record_manager.stall_watchdog
+        probe_profiles = self.app.record_manager.probe_profiles
+        admission_controller = self.app.record_manager.admission_controller
+        subtitle_writer = self._get_subtitle_writer(save_file_path)
+        has_output = False
+        progress = {}
+        output_checked_at = None
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                key, _, value = line.decode(errors="ignore").strip().partition("=")
+                progress[key] = value
+                if key == "progress":
+                    total_size = int(progress["total_size"]) if progress.get("total_size", "").isdigit() else None
+                    now = time.monotonic()
+                    if total_size is None and (
+                        output_checked_at is None or now - output_checked_at >= stall_watchdog.CHECK_INTERVAL
+                    ):
+                        # Muxers like tee report N/A, the size of the written files is used instead.
+                        # ffmpeg reports twice a second, the files are only measured once per watchdog check.
+                        total_size = stall_watchdog.get_output_bytes(save_file_path)
+                        output_checked_at = now
+                    out_time_us = int(progress["out_time_us"]) if progress.get("out_time_us", "").isdigit() else None
+                    stall_watchdog.update_progress(
+                        self.recording.rec_id, total_size=total_size, out_time_us=out_time_us
+                    )
+                    if subtitle_writer and out_time_us is not None:
+                        subtitle_writer.update(out_time_us / 1_000_000)
+                    if total_size:
+                        admission_controller.update_throughput(self.recording.rec_id, total_size)
+                    if (total_size or out_time_us) and not has_output:
+                        has_output = True
+                        probe_profiles.record_startup(
+                            self.platform_key, self.live_url, time.monotonic() - started_at, bool(self.probe_options)
+                        )
+                        self.app.page.run_task(
+                            probe_profiles.learn,
+                            self.platform_key,
+                            self.live_url,
+                            save_file_path,
+                            self.subprocess_start_info
+                        )
+                    progress = {}
+        except Exception as e:
+            logger.debug(f"Failed to read ffmpeg progress: {e}")
+        finally:
+            if subtitle_writer:
+                subtitle_writer.close()
+        return has_output
+
+    def _get_subtitle_writer(self, save_file_path: str) -> TimeSubtitleWriter | None:
+        if not self.user_config.get("generate_time_subtitle_file"):
+            return None
+        return TimeSubtitleWriter(
+            save_file_path,
+            interval=int(self.user_config.get("time_subtitle_interval") or 1),
+            subtitle_format=self.user_config.get("time_subtitle_format") or "srt",
+            segment_time=int(self.segment_time) if self.segment_record else None
+        )
+
+    async def build_keyframe_indexes(self, save_file_path: str) -> None:
+        """Write the keyframe index sidecars of a finished FLV/TS recording, one per segment."""
+        if not self.user_config.get("generate_keyframe_index", True) or not KeyframeIndex.is_supported(save_file_path):
+            return
+        if self.save_format == "ts" and self.user_config.get("convert_to_mp4"):
+            # The TS files are moved or deleted by the conversion, which indexes them where they end up
+            return
+
+        if "%" in save_file_path:
+            prefix = save_file_path.split("%", maxsplit=1)[0]
+            file_paths = sorted(glob.glob(glob.escape(prefix) + "*." + self.save_format))
+        else:
+            file_paths = [save_file_path] if os.path.exists(save_file_path) else []
+
+        for file_path in file_paths:
+            await self.build_keyframe_index(file_path)
+
+    async def build_keyframe_index(self, file_path: str) -> None:
+        """Write the keyframe index sidecar of a single finished FLV/TS file."""
+        if not self.user_config.get("generate_keyframe_index", True) or not KeyframeIndex.is_supported(file_path):
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, KeyframeIndex.load_or_build, file_path)
+
     async def converts_mp4(self, converts_file_path: str, is_original_delete: bool = True) -> None:
         """Asynchronous transcoding method, can be added to the background service to continue execution"""
         if not self.app.recording_enabled:
@@ -472,6 +735,17 @@ class LiveStreamRecorder:
             converts_file_path = converts_file_path.replace("\\", "/")
             if os.path.exists(converts_file_path) and os.path.getsize(converts_file_path) > 0:
                 save_path = converts_file_path.rsplit(".", maxsplit=1)[0] + ".mp4"
+                if self.user_config.get("remux_engine") == "pyav" and InProcessRemuxer.is_available():
+                    loop = asyncio.get_running_loop()
+                    converts_success = await loop.run_in_executor(
+                        None, InProcessRemuxer().remux, converts_file_path, save_path
+                    )
+                    if converts_success:
+                        logger.info(f"Video transcoding completed (in-process): {save_path}")
+                    else:
+                        logger.warning(f"In-process remux failed, falling back to ffmpeg: {converts_file_path}")
+
+            if save_path and not converts_success:
                 ffmpeg_command = [
                     "ffmpeg",
                     "-i", converts_file_path,
@@ -481,6 +755,7 @@ class LiveStreamRecorder:
                     save_path
                 ]
                 process = await asyncio.create_subprocess_exec(
+                    *get_resource_command_prefix(ProcessRole.REMUX),
                     *ffmpeg_command,
                     stdin=asyncio.subprocess.PIPE,
                     stdout=asyncio.subprocess.PIPE,
@@ -488,7 +763,7 @@ class LiveStreamRecorder:
                     startupinfo=self.subprocess_start_info
                 )
 
-                self.app.add_ffmpeg_process(process)
+                self.app.add_ffmpeg_process(process, ProcessRole.REMUX, self.recording.rec_id)
                 task = asyncio.create_task(process.communicate())
                 _, stderr = await task
                 if process.returncode == 0:
@@ -502,17 +777,28 @@ class LiveStreamRecorder:
             logger.error(f"Video transcoding failed! Error message: {e.output.decode()}")
 
         try:
+            index_path = KeyframeIndex.get_index_path(converts_file_path)
             if converts_success:
                 if is_original_delete:
                     await asyncio.sleep(1)
                     if os.path.exists(converts_file_path):
                         os.remove(converts_file_path)
+                    if os.path.exists(index_path):
+                        os.remove(index_path)
                     logger.info(f"Delete Original File: {converts_file_path}")
                 else:
                     converts_dir = f"{os.path.dirname(save_path)}/original"
                     os.makedirs(converts_dir, exist_ok=True)
                     shutil.move(converts_file_path, converts_dir)
+                    if os.path.exists(index_path):
+                        os.replace(index_path, os.path.join(converts_dir, os.path.basename(index_path)))
                     logger.info(f"Move Transcoding Files: {converts_file_path}")
+                    await self.build_keyframe_index(
+                        os.path.join(converts_dir, os.path.basename(converts_file_path))
+                    )
+            elif os.path.exists(converts_file_path):
+                # The TS file stays where it was recorded, so it is indexed there
+                await self.build_keyframe_index(converts_file_path)
 
         except subprocess.CalledProcessError as e:
             logger.error(f"Error occurred during conversion: {e}")
@@ -528,71 +814,62 @@ class LiveStreamRecorder:
             split_video_by_time: bool,
             converts_to_mp4: bool
     ):
-        from ..runtime.process_manager import BackgroundService
-
         if "python" in script_command:
-            params = [
-                f'--record_name "{record_name}"',
-                f'--save_file_path "{save_file_path}"',
-                f"--save_type {save_type}--split_video_by_time {split_video_by_time}",
-                f"--converts_to_mp4 {converts_to_mp4}"
+            args = [
+                "--record_name", record_name,
+                "--save_file_path", save_file_path,
+                "--save_type", save_type,
+                "--split_video_by_time", split_video_by_time,
+                "--converts_to_mp4", converts_to_mp4
             ]
         else:
-            params = [
-                f'"{record_name.split(" ", maxsplit=1)[-1]}"',
-                f'"{save_file_path}"',
+            args = [
+                record_name.split(" ", maxsplit=1)[-1],
+                save_file_path,
                 save_type,
                 f"split_video_by_time: {split_video_by_time}",
                 f"converts_to_mp4: {converts_to_mp4}"
             ]
-        script_command = script_command.strip() + " " + " ".join(params)
+        command = ScriptRunner.build_command(script_command, args)
+        payload = {
+            "event": "recording_finished",
+            "rec_id": self.recording.rec_id,
+            "record_name": record_name,
+            "streamer_name": self.recording.streamer_name,
+            "live_url": self.live_url,
+            "platform": self.platform,
+            "save_file_path": save_file_path,
+            "save_type": save_type,
+            "split_video_by_time": bool(split_video_by_time),
+            "converts_to_mp4": bool(converts_to_mp4),
+        }
 
         if not self.app.recording_enabled:
             logger.info("Application is closing, adding script execution task to background service")
-            BackgroundService.get_instance().add_task(self.run_script_sync, script_command)
+            BackgroundService.get_instance().add_task(self.run_script_sync, command, payload)
         else:
-            self.app.page.run_task(self.run_script_async, script_command)
+            self.app.page.run_task(self.run_script_async, command, payload)
 
         logger.success("Script command execution initiated!")
 
-    def run_script_sync(self, command: str) -> None:
+    def run_script_sync(self, command: list[str], payload: dict) -> None:
         """Synchronous version of the script execution method, used for background service"""
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         try:
-            loop.run_until_complete(self.run_script_async(command))
+            # The background service runs its tasks one by one, so the worker pool is not needed here
+            loop.run_until_complete(self.app.record_manager.script_runner.execute(
+                command, payload, self.user_config, self.recording.rec_id, self.subprocess_start_info
+            ))
         finally:
             loop.close()
 
-    async def run_script_async(self, command: str) -> None:
-        try:
-            process = await asyncio.create_subprocess_exec(
-                *command.split(),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                startupinfo=self.subprocess_start_info,
-                text=False
-            )
-
-            stdout, stderr = await process.communicate()
-
-            if stdout:
-                logger.info(stdout.splitlines()[0].decode())
-            if stderr:
-                logger.error(stderr.splitlines()[0].decode())
-
-            if process.returncode != 0:
-                logger.info(f"Custom Script process exited with return code {process.returncode}")
-
-        except PermissionError:
-            logger.error(
-                "Script has no execution permission!, If it is a Linux environment, "
-                "please first execute: chmod+x your_script.sh to grant script executable permission"
-            )
-        except OSError:
-            logger.error("Please add `#!/bin/bash` at the beginning of your bash script file.")
-        except Exception as e:
-            logger.error(f"An error occurred: {e}")
+    async def run_script_async(self, command: list[str], payload: dict) -> None:
+        rec_id = self.recording.rec_id
+        await self.app.record_manager.script_runner.submit(
+            command, payload, self.user_config, rec_id, self.subprocess_start_info,
+            on_start=lambda process: self.app.add_ffmpeg_process(process, ProcessRole.SCRIPT, rec_id)
+        )
 
     @staticmethod
     def get_headers_params(live_url, platform_key):
@@ -622,8 +899,11 @@ class LiveStreamRecorder:
         """
         Use the direct downloader to download the live stream
         """
+        session_history = self.app.record_manager.session_history
+        failed = True
         try:
             await self.direct_downloader.start_download()
+            session_history.begin(self.recording, self.quality, self.save_format)
 
             self.recording.status_info = RecordingStatus.RECORDING
             self.recording.record_url = record_url
@@ -669,6 +949,8 @@ class LiveStreamRecorder:
             except Exception as e:
                 logger.debug(f"Failed to update UI: {e}")
 
+            self.app.page.run_task(self.build_keyframe_indexes, save_file_path)
+
             if self.user_config.get("execute_custom_script") and script_command:
                 logger.info("Prepare to execute custom script in the background")
                 try:
@@ -693,6 +975,7 @@ class LiveStreamRecorder:
                         False
                     )
 
+            failed = False
             return True
 
         except Exception as e:
@@ -711,6 +994,12 @@ class LiveStreamRecorder:
             return False
         finally:
             self.recording.record_url = None
+            self.app.record_manager.release_admission(self.recording.rec_id)
+            total_bytes = self.direct_downloader.total_bytes
+            session_history.end(
+                self.recording.rec_id, total_bytes, int(total_bytes > 0), failed,
+                final=not (self.recording.monitor_status and self.app.recording_enabled)
+            )
 
     async def stop_recording_notify(self):
         if desktop_notify.should_push_notification(self.app):
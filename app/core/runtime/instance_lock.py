@@ -0,0 +1,42 @@
+import os
+import sys
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+class InstanceLock:
+    """
+    Exclusive lock on config/app.lock, held by the app while it runs. It is an OS file lock, so it is
+    released when the process exits or crashes and a leftover lock file never blocks the next start.
+    The offline import takes the same lock, it would otherwise write the recording store behind a running app.
+    """
+
+    def __init__(self, config_path: str):
+        self.lock_path = os.path.join(config_path, "app.lock")
+        self.fd = None
+
+    def acquire(self) -> bool:
+        """Take the lock, False if another process holds it."""
+        if self.fd is not None:
+            return True
+        os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT)
+        try:
+            if sys.platform == "win32":
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self.fd = fd
+        return True
+
+    def release(self) -> None:
+        """Closing the file releases the lock."""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
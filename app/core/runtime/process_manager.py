@@ -1,6 +1,8 @@
 import asyncio
 import os
+import shutil
 import threading
+import time
 
 from ...utils.logger import logger
 
@@ -50,18 +52,128 @@ class BackgroundService:
         self.is_running = False
 
 
+class ProcessRole:
+    RECORD = "record"
+    REMUX = "remux"
+    SCRIPT = "script"
+
+
+# CPU niceness and I/O scheduling class per role, live capture always wins over post-processing.
+# I/O classes follow ionice: 2 is best-effort (level 0 highest, 7 lowest), 3 is idle.
+PROCESS_RESOURCE_CLASSES = {
+    ProcessRole.RECORD: {"nice": 0, "io_class": 2, "io_level": 0},
+    ProcessRole.REMUX: {"nice": 10, "io_class": 2, "io_level": 7},
+    ProcessRole.SCRIPT: {"nice": 15, "io_class": 3, "io_level": None},
+}
+NICE_PATH = shutil.which("nice") if os.name != "nt" else None
+IONICE_PATH = shutil.which("ionice") if os.name != "nt" else None
+
+
+def get_resource_command_prefix(role: str) -> list[str]:
+    """
+    Command prefix that starts a process with the CPU and I/O priority of its role, Linux and macOS only.
+    nice and ionice set the priority in the child and exec the command, so every thread the command
+    starts inherits it and the pid stays the same. The I/O class needs the ionice tool and an I/O
+    scheduler that honours it (BFQ, CFQ), either tool is skipped when it is missing.
+    """
+    resource_class = PROCESS_RESOURCE_CLASSES.get(role)
+    if not resource_class:
+        return []
+
+    prefix = []
+    if NICE_PATH and resource_class["nice"]:
+        prefix += [NICE_PATH, "-n", str(resource_class["nice"])]
+    if IONICE_PATH:
+        prefix += [IONICE_PATH, "-c", str(resource_class["io_class"])]
+        if resource_class["io_level"] is not None:
+            prefix += ["-n", str(resource_class["io_level"])]
+        # ionice -t runs the command even when the scheduler rejects the class
+        prefix.append("-t")
+    return prefix
+
+
 class AsyncProcessManager:
+    """
+    Registry of the child processes spawned by the app, keyed by pid.
+    Processes are removed as soon as they exit, CPU time and RSS are sampled from /proc on Linux.
+    """
+
     def __init__(self):
-        self.ffmpeg_processes = []
+        self.processes = {}
+        self.reapers = set()
+        self.page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self.clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+    def add_process(self, process, role: str = ProcessRole.RECORD, rec_id: str | None = None):
+        self.processes[process.pid] = {
+            "process": process,
+            "role": role,
+            "rec_id": rec_id,
+            "start_time": time.time(),
+        }
+        reaper = asyncio.get_running_loop().create_task(self._reap(process))
+        self.reapers.add(reaper)
+        reaper.add_done_callback(self.reapers.discard)
+
+    async def _reap(self, process) -> None:
+        try:
+            await process.wait()
+        finally:
+            entry = self.processes.get(process.pid)
+            if entry and entry["process"] is process:
+                del self.processes[process.pid]
+
+    def get_running_count(self, role: str | None = None) -> int:
+        return len([
+            entry for entry in list(self.processes.values())
+            if entry["process"].returncode is None and (role is None or entry["role"] == role)
+        ])
 
-    def add_process(self, process):
-        self.ffmpeg_processes.append(process)
+    def _read_proc_usage(self, pid: int) -> tuple[float | None, int | None]:
+        """CPU seconds (user + system) and resident memory in bytes of a process, None where /proc is missing."""
+        try:
+            with open(f"/proc/{pid}/stat", encoding="utf-8") as file:
+                # The command name may contain spaces, the numeric fields start after its closing parenthesis
+                fields = file.read().rsplit(")", maxsplit=1)[1].split()
+            with open(f"/proc/{pid}/statm", encoding="utf-8") as file:
+                resident_pages = int(file.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            return None, None
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / self.clock_ticks
+        return cpu_seconds, resident_pages * self.page_size
+
+    def get_process_stats(self) -> list[dict]:
+        """Per-process numbers for dashboards: pid, role, rec_id, uptime, cpu_seconds and rss_bytes."""
+        now = time.time()
+        stats = []
+        for pid, entry in list(self.processes.items()):
+            cpu_seconds, rss_bytes = self._read_proc_usage(pid)
+            stats.append({
+                "pid": pid,
+                "role": entry["role"],
+                "rec_id": entry["rec_id"],
+                "uptime": round(now - entry["start_time"], 1),
+                "cpu_seconds": cpu_seconds,
+                "rss_bytes": rss_bytes,
+            })
+        return stats
+
+    def get_role_totals(self) -> dict[str, dict]:
+        """Process count, CPU seconds and RSS summed per role."""
+        totals = {}
+        for stat in self.get_process_stats():
+            total = totals.setdefault(stat["role"], {"count": 0, "cpu_seconds": 0.0, "rss_bytes": 0})
+            total["count"] += 1
+            total["cpu_seconds"] += stat["cpu_seconds"] or 0
+            total["rss_bytes"] += stat["rss_bytes"] or 0
+        return totals
 
     async def cleanup(self):
-        for process in self.ffmpeg_processes[:]:
+        for pid, entry in list(self.processes.items()):
+            process = entry["process"]
             try:
                 if process.returncode is None:
-                    logger.debug(f"Terminating process {process.pid}")
+                    logger.debug(f"Terminating process {pid}")
                     if os.name == "nt":
                         if process.stdin:
                             process.stdin.write(b"q")
@@ -72,14 +184,12 @@ class AsyncProcessManager:
                     try:
                         await asyncio.wait_for(process.wait(), timeout=5.0)
                     except asyncio.TimeoutError:
-                        logger.warning(f"Process {process.pid} did not terminate, killing it")
+                        logger.warning(f"Process {pid} did not terminate, killing it")
                         process.kill()
                         await process.wait()
-
-                self.ffmpeg_processes.remove(process)
             except Exception as e:
                 logger.error(f"Error cleaning up process: {e}")
-                if process in self.ffmpeg_processes:
-                    self.ffmpeg_processes.remove(process)
+            finally:
+                self.processes.pop(pid, None)
 
         logger.debug("All processes cleaned up")
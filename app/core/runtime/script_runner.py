@@ -0,0 +1,235 @@
+import asyncio
+import json
+import os
+import shlex
+import signal
+import subprocess
+import time
+from collections import deque
+from collections.abc import Callable
+
+from ...utils.logger import logger
+from .process_manager import ProcessRole, get_resource_command_prefix
+
+
+class ScriptRunner:
+    """
+    Runs the custom post-recording scripts in a bounded pool.
+    Each script gets a timeout after which it is terminated, its output is captured and kept
+    in a short history, and the event data is written to its stdin as a JSON document.
+    Scripts run in their own process group, so a timeout also stops the programs a script started.
+    One runner is shared by the recording managers of all web sessions, so the pool bounds the scripts
+    of the whole process, the limits are read from the settings of the session submitting a script.
+    """
+
+    KILL_TIMEOUT = 5
+    MAX_OUTPUT_CHARS = 4000
+    HISTORY_SIZE = 50
+
+    def __init__(self):
+        self.semaphore = None
+        self.semaphore_size = 0
+        self.pending = 0
+        self.results = deque(maxlen=self.HISTORY_SIZE)
+
+    @staticmethod
+    def get_max_workers(user_config: dict) -> int:
+        return max(int(user_config.get("script_max_concurrency") or 2), 1)
+
+    @staticmethod
+    def get_timeout(user_config: dict) -> float | None:
+        """Seconds a script may run, None when the timeout is disabled."""
+        return float(user_config.get("script_timeout_seconds") or 0) or None
+
+    @staticmethod
+    def build_command(script_command: str, args: list[str]) -> list[str]:
+        """Split the configured command like a shell would and append the arguments unquoted."""
+        script_command = script_command.strip()
+        if os.name == "nt":
+            program_args = ScriptRunner.split_windows_command(script_command)
+        else:
+            program_args = shlex.split(script_command)
+        return program_args + [str(arg) for arg in args]
+
+    @staticmethod
+    def split_windows_command(command: str) -> list[str]:
+        """
+        Split a command line the way Windows programs parse it (CommandLineToArgvW), the quotes are removed.
+        The arguments are quoted again with list2cmdline when the process is created, so a quoted path
+        with spaces reaches the script as a single argument.
+        """
+        args = []
+        current = []
+        in_arg = in_quotes = False
+        backslashes = 0
+        for char in command:
+            if char == "\\":
+                backslashes += 1
+                in_arg = True
+                continue
+            if char == '"':
+                # 2n backslashes before a quote are n backslashes, 2n+1 escape the quote
+                current.append("\\" * (backslashes // 2))
+                if backslashes % 2:
+                    current.append('"')
+                else:
+                    in_quotes = not in_quotes
+                backslashes = 0
+                in_arg = True
+                continue
+            current.append("\\" * backslashes)
+            backslashes = 0
+            if char in " \t" and not in_quotes:
+                if in_arg:
+                    args.append("".join(current))
+                    current = []
+                    in_arg = False
+                continue
+            current.append(char)
+            in_arg = True
+        current.append("\\" * backslashes)
+        if in_arg:
+            args.append("".join(current))
+        return args
+
+    @staticmethod
+    def get_spawn_options() -> dict:
+        if os.name == "nt":
+            return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        return {"start_new_session": True}
+
+    @staticmethod
+    async def stop_process_group(process, force: bool = False, startup_info=None) -> None:
+        """Terminate, or kill when forced, a script and every process it started."""
+        if os.name == "nt":
+            command = ["taskkill", "/T", "/PID", str(process.pid)] + (["/F"] if force else [])
+            try:
+                taskkill = await asyncio.create_subprocess_exec(
+                    *command,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
+                    startupinfo=startup_info
+                )
+                await taskkill.wait()
+            except OSError as e:
+                logger.debug(f"Failed to run taskkill for script process {process.pid}: {e}")
+            return
+        try:
+            # The script is the leader of its session, its pid is the process group id
+            os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _get_semaphore(self, max_workers: int) -> asyncio.Semaphore:
+        # Running scripts keep their slot when the limit changes, only new scripts use the new limit
+        if self.semaphore is None or self.semaphore_size != max_workers:
+            self.semaphore_size = max_workers
+            self.semaphore = asyncio.Semaphore(self.semaphore_size)
+        return self.semaphore
+
+    async def submit(
+            self,
+            command: list[str],
+            payload: dict,
+            user_config: dict,
+            rec_id: str | None = None,
+            startup_info=None,
+            on_start: Callable | None = None
+    ) -> dict:
+        """Wait for a free worker, then run the script, see execute()."""
+        semaphore = self._get_semaphore(self.get_max_workers(user_config))
+        if semaphore.locked():
+            logger.info(f"Script queued, {self.pending + 1} waiting for {self.semaphore_size} workers: {command[0]}")
+        self.pending += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.pending -= 1
+        try:
+            return await self.execute(command, payload, user_config, rec_id, startup_info, on_start)
+        finally:
+            semaphore.release()
+
+    async def execute(
+            self,
+            command: list[str],
+            payload: dict,
+            user_config: dict,
+            rec_id: str | None = None,
+            startup_info=None,
+            on_start: Callable | None = None
+    ) -> dict:
+        """
+        Run one script to completion or until the timeout, this does not take a worker slot.
+
+        :param command: Program and arguments.
+        :param payload: Event data written to the script's stdin as JSON.
+        :param user_config: The settings holding the script timeout.
+        :param on_start: Called with the started process, e.g. to register it with the process manager.
+        :return: Result with returncode, timed_out, duration and the captured stdout and stderr.
+        """
+        result = {
+            "command": command,
+            "rec_id": rec_id,
+            "returncode": None,
+            "timed_out": False,
+            "duration": 0.0,
+            "stdout": "",
+            "stderr": "",
+            "finished_at": None,
+        }
+        timeout = self.get_timeout(user_config)
+        start_time = time.monotonic()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *get_resource_command_prefix(ProcessRole.SCRIPT),
+                *command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                startupinfo=startup_info,
+                **self.get_spawn_options()
+            )
+            if on_start:
+                on_start(process)
+
+            input_data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            communicate = asyncio.create_task(process.communicate(input_data))
+            try:
+                stdout, stderr = await asyncio.wait_for(asyncio.shield(communicate), timeout=timeout)
+            except asyncio.TimeoutError:
+                result["timed_out"] = True
+                logger.error(f"Custom script timed out after {timeout:.0f}s, terminating: {command[0]}")
+                await self.stop_process_group(process, startup_info=startup_info)
+                try:
+                    # Shielded, a timeout must not cancel the task collecting the output
+                    stdout, stderr = await asyncio.wait_for(asyncio.shield(communicate), timeout=self.KILL_TIMEOUT)
+                except asyncio.TimeoutError:
+                    await self.stop_process_group(process, force=True, startup_info=startup_info)
+                    stdout, stderr = await communicate
+
+            result["returncode"] = process.returncode
+            result["stdout"] = stdout.decode(errors="replace")[-self.MAX_OUTPUT_CHARS:]
+            result["stderr"] = stderr.decode(errors="replace")[-self.MAX_OUTPUT_CHARS:]
+
+            for line in result["stdout"].splitlines():
+                logger.info(f"[script] {line}")
+            for line in result["stderr"].splitlines():
+                logger.error(f"[script] {line}")
+            if process.returncode != 0:
+                logger.info(f"Custom Script process exited with return code {process.returncode}")
+
+        except PermissionError:
+            logger.error(
+                "Script has no execution permission!, If it is a Linux environment, "
+                "please first execute: chmod+x your_script.sh to grant script executable permission"
+            )
+        except OSError:
+            logger.error("Please add `#!/bin/bash` at the beginning of your bash script file.")
+        except Exception as e:
+            logger.error(f"An error occurred: {e}")
+        finally:
+            result["duration"] = round(time.monotonic() - start_time, 3)
+            result["finished_at"] = time.time()
+            self.results.append(result)
+        return result
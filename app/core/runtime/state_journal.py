@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import signal
+import time
+
+from ...utils import utils
+from ...utils.logger import logger
+from ..config.write_behind import WriteBehindPersister
+
+
+class RuntimeStateJournal:
+    """
+    Crash-safe record of the ffmpeg processes that are currently recording.
+    Every change is written atomically, so after a crash or power loss the next start knows
+    which processes were orphaned, which files they were writing and which rooms to re-check.
+    There is one journal per process, shared by the recording managers of all web sessions, and it is
+    written in a worker thread from a snapshot of the entries.
+    """
+
+    STOP_TIMEOUT = 10
+    WRITE_DELAY = 0
+
+    def __init__(self, config_path: str):
+        self.journal_path = os.path.join(config_path, "runtime_state.json")
+        self.entries = {}
+        # Entries of the previous run, loaded once when the process starts
+        self.orphans = self._load()
+        self.persister = WriteBehindPersister(self._snapshot, self._save, delay=self.WRITE_DELAY)
+
+    def _load(self) -> dict:
+        try:
+            with open(self.journal_path, encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"Failed to load runtime state journal: {e}")
+            return {}
+
+    def _snapshot(self) -> dict:
+        return {rec_id: dict(entry) for rec_id, entry in self.entries.items()}
+
+    def _write(self, entries: dict) -> None:
+        temp_path = utils.make_temp_path(self.journal_path)
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(entries, file, ensure_ascii=False, indent=4)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.journal_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    async def _save(self, entries: dict) -> None:
+        await asyncio.to_thread(self._write, entries)
+
+    async def flush(self) -> None:
+        await self.persister.flush()
+
+    def record_start(self, rec_id: str, pid: int, output_path: str, live_url: str) -> None:
+        self.entries[rec_id] = {
+            "pid": pid,
+            "output_path": output_path,
+            "live_url": live_url,
+            "start_time": time.time(),
+        }
+        self.persister.mark_dirty()
+
+    def record_stop(self, rec_id: str) -> None:
+        if self.entries.pop(rec_id, None) is not None:
+            self.persister.mark_dirty()
+
+    @staticmethod
+    def _is_orphan_alive(pid: int, output_path: str) -> bool:
+        """Check that the pid still belongs to the ffmpeg that wrote output_path, not to a reused pid."""
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as file:
+                cmdline = file.read().split(b"\0")
+        except OSError:
+            return False
+        # Tee and segment outputs embed the path in a longer argument, so match on the file name stem
+        file_stem = os.path.splitext(os.path.basename(output_path))[0].split("%", maxsplit=1)[0]
+        return (
+            bool(cmdline) and b"ffmpeg" in os.path.basename(cmdline[0])
+            and bool(file_stem) and file_stem.encode() in b"\0".join(cmdline)
+        )
+
+    def _stop_orphan(self, pid: int) -> None:
+        """Interrupt the orphan so it finalizes its file, kill it if it does not exit in time."""
+        try:
+            os.kill(pid, signal.SIGINT)
+            deadline = time.monotonic() + self.STOP_TIMEOUT
+            while time.monotonic() < deadline:
+                if not os.path.exists(f"/proc/{pid}"):
+                    return
+                time.sleep(0.2)
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        except OSError as e:
+            logger.error(f"Failed to stop orphaned ffmpeg process {pid}: {e}")
+
+    def _stop_orphans(self, orphans: dict) -> None:
+        for rec_id, entry in orphans.items():
+            pid = entry.get("pid")
+            output_path = entry.get("output_path") or ""
+            try:
+                if os.name != "nt" and pid and self._is_orphan_alive(pid, output_path):
+                    logger.warning(f"Stopping orphaned ffmpeg process {pid}: {output_path}")
+                    self._stop_orphan(pid)
+            except Exception as e:
+                logger.error(f"Failed to recover orphaned ffmpeg process {pid}: {e}")
+            logger.info(f"Recovered interrupted recording: {rec_id}, partial file: {output_path}")
+
+    async def recover(self) -> list[str]:
+        """
+        Stop the ffmpeg processes left behind by a previous run, in a worker thread.
+        An orphan cannot be adopted because its progress pipe died with the old process,
+        so it is interrupted to finalize the partial file and the room is recorded again.
+        Only the first call after the process started finds orphans, later web sessions get an empty list
+        and never touch the processes of the sessions already recording.
+
+        :return: rec_ids of the recordings that were active when the previous run ended.
+        """
+        orphans, self.orphans = self.orphans, {}
+        if not orphans:
+            return []
+
+        await asyncio.to_thread(self._stop_orphans, orphans)
+        self.persister.mark_dirty()
+        return list(orphans)
@@ -38,10 +38,10 @@ async def handle_app_close(page: ft.Page, app, save_progress_overlay) -> None:
 
     async def close_dialog_dismissed(e):
         app.recording_enabled = False
+        await app.record_manager.flush_recordings()
 
         # check if there are active recordings
-        active_recordings = [p for p in app.process_manager.ffmpeg_processes if p.returncode is None]
-        active_recordings_count = len(active_recordings)
+        active_recordings_count = app.process_manager.get_running_count()
 
         if active_recordings_count > 0:
             save_progress_overlay.show(_["saving_recordings"].format(active_recordings_count=active_recordings_count), 
@@ -58,7 +58,7 @@ async def handle_app_close(page: ft.Page, app, save_progress_overlay) -> None:
                     time.sleep(base_wait_time)
 
                     # check again if there are active processes
-                    remaining = len([p for p in app.process_manager.ffmpeg_processes if p.returncode is None])
+                    remaining = app.process_manager.get_running_count()
                     if remaining > 0:
                         logger.info(f"still {remaining} recordings are not finished, waiting for extra time")
                         time.sleep(min(remaining, 5))
@@ -68,6 +68,8 @@ async def handle_app_close(page: ft.Page, app, save_progress_overlay) -> None:
                 except Exception as ex:
                     logger.error(f"close window error: {ex}")
                 finally:
+                    # Recordings that just stopped changed their state after the first flush
+                    app.record_manager.flush_recordings_threadsafe()
                     if not getattr(app, "is_web_mode", False) and hasattr(app, "tray_manager"):
                         app.tray_manager.stop()
                     page.window.destroy()
@@ -69,6 +69,7 @@ class TrayManager:
         except ImportError as e:
             logger.error(e)
             self.is_running = False
+            self.app.record_manager.flush_recordings_threadsafe()
             page.window.destroy()
             raise e
 
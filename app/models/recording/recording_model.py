@@ -1,7 +1,87 @@
 from datetime import timedelta
 
+from .recording_priority_model import RecordingPriority
+
+ZERO_DURATION = timedelta()
+
+
+class WatchedField:
+    """
+    Takes the place of the slot of a watched Recording attribute and reports assignments that change
+    the value to the update listeners, the value itself stays in the original slot.
+    """
+
+    __slots__ = ("name", "slot")
+
+    def __init__(self, name, slot):
+        self.name = name
+        self.slot = slot
+
+    def __get__(self, instance, owner=None):
+        return self if instance is None else self.slot.__get__(instance, owner)
+
+    def __set__(self, instance, value):
+        previous = self.slot.__get__(instance)
+        self.slot.__set__(instance, value)
+        if previous != value:
+            for callback in instance.update_listeners:
+                callback(instance, {self.name: value})
+
 
 class Recording:
+    # Fields saved by to_dict() in this order, with the value from_dict() uses when a key is missing
+    PERSISTED_FIELDS = (
+        ("rec_id", None),
+        ("url", None),
+        ("streamer_name", None),
+        ("record_format", None),
+        ("quality", None),
+        ("segment_record", None),
+        ("segment_time", None),
+        ("monitor_status", None),
+        ("scheduled_recording", None),
+        ("scheduled_start_time", None),
+        ("monitor_hours", None),
+        ("recording_dir", None),
+        ("enabled_message_push", None),
+        ("platform", None),
+        ("platform_key", None),
+        ("only_notify_no_record", None),
+        ("flv_use_direct_download", None),
+        ("hot_standby", False),
+        ("priority", RecordingPriority.NORMAL),
+    )
+    # Runtime state with its initial value, never saved and reset on every start
+    RUNTIME_FIELDS = (
+        ("scheduled_time_range", None),
+        ("title", None),
+        ("display_title", None),
+        ("speed", "X KB/s"),
+        ("is_live", False),
+        ("is_recording", False),
+        ("start_time", None),
+        ("manually_stopped", False),
+        ("notified_live_start", False),
+        ("notified_live_end", False),
+        ("cumulative_duration", ZERO_DURATION),  # Accumulated recording time
+        ("last_duration", ZERO_DURATION),  # Save the total time of the last recording
+        ("selected", False),
+        ("is_checking", False),
+        ("status_info", None),
+        ("live_title", None),
+        ("detection_time", None),
+        ("loop_time_seconds", None),
+        ("use_proxy", None),
+        ("record_url", None),
+        ("preview_url", None),
+    )
+    __slots__ = tuple(name for name, _ in PERSISTED_FIELDS + RUNTIME_FIELDS)
+
+    # Callbacks invoked as callback(recording, changes) after update() changed any attribute
+    update_listeners = []
+    # Attributes whose direct assignment is reported to the update listeners too
+    watched_attributes = set()
+
     def __init__(
         self,
         rec_id,
@@ -18,7 +98,9 @@ class Recording:
         recording_dir,
         enabled_message_push,
         only_notify_no_record,
-        flv_use_direct_download
+        flv_use_direct_download,
+        hot_standby=False,
+        priority=RecordingPriority.NORMAL
     ):
         """
         Initialize a recording object.
@@ -38,97 +120,62 @@ class Recording:
         :param enabled_message_push: Whether to enable message push.
         :param only_notify_no_record: Whether to only notify when no record is made.
         :param flv_use_direct_download: Whether to use direct downloader to cache FLV stream.
+        :param hot_standby: Whether to keep a pre-roll buffer of the FLV stream for a faster and gapless start.
+        :param priority: Admission priority when the recording capacity is full, e.g., 'HIGH', 'NORMAL', 'LOW'.
         """
+        self._set_fields({
+            "rec_id": rec_id,
+            "url": url,
+            "streamer_name": streamer_name,
+            "record_format": record_format,
+            "quality": quality,
+            "segment_record": segment_record,
+            "segment_time": segment_time,
+            "monitor_status": monitor_status,
+            "scheduled_recording": scheduled_recording,
+            "scheduled_start_time": scheduled_start_time,
+            "monitor_hours": monitor_hours,
+            "recording_dir": recording_dir,
+            "enabled_message_push": enabled_message_push,
+            "only_notify_no_record": only_notify_no_record,
+            "flv_use_direct_download": flv_use_direct_download,
+            "hot_standby": hot_standby,
+            "priority": priority,
+        })
 
-        self.rec_id = rec_id
-        self.url = url
-        self.quality = quality
-        self.record_format = record_format
-        self.monitor_status = monitor_status
-        self.segment_record = segment_record
-        self.segment_time = segment_time
-        self.streamer_name = streamer_name
-        self.scheduled_recording = scheduled_recording
-        self.scheduled_start_time = scheduled_start_time
-        self.monitor_hours = monitor_hours
-        self.recording_dir = recording_dir
-        self.enabled_message_push = enabled_message_push
-        self.only_notify_no_record = only_notify_no_record
-        self.flv_use_direct_download = flv_use_direct_download
-        self.scheduled_time_range = None
-        self.title = f"{streamer_name} - {self.quality}"
-        self.speed = "X KB/s"
-        self.is_live = False
-        self.is_recording = False
-        self.start_time = None
-        self.manually_stopped = False
-        self.platform = None
-        self.platform_key = None
-        self.notified_live_start = False
-        self.notified_live_end = False
-
-        self.cumulative_duration = timedelta()  # Accumulated recording time
-        self.last_duration = timedelta()  # Save the total time of the last recording
-        self.display_title = self.title
-        self.selected = False
-        self.is_checking = False
-        self.status_info = None
-        self.live_title = None
-        self.detection_time = None
-        self.loop_time_seconds = None
-        self.use_proxy = None
-        self.record_url = None
-        self.preview_url = None
+    def _set_fields(self, data: dict):
+        """
+        Set the persisted fields from data and reset the runtime fields. Values are written through the raw
+        slots, so loading a recording does not report watched attributes to the update listeners.
+        """
+        slots = self.slots
+        for name, default in self.PERSISTED_FIELDS:
+            slots[name].__set__(self, data.get(name, default))
+        for name, default in self.RUNTIME_FIELDS:
+            slots[name].__set__(self, default)
+        title = f"{self.streamer_name} - {self.quality}"
+        slots["title"].__set__(self, title)
+        slots["display_title"].__set__(self, title)
 
     def to_dict(self):
-        """Convert the Recording instance to a dictionary for saving."""
-        return {
-            "rec_id": self.rec_id,
-            "url": self.url,
-            "streamer_name": self.streamer_name,
-            "record_format": self.record_format,
-            "quality": self.quality,
-            "segment_record": self.segment_record,
-            "segment_time": self.segment_time,
-            "monitor_status": self.monitor_status,
-            "scheduled_recording": self.scheduled_recording,
-            "scheduled_start_time": self.scheduled_start_time,
-            "monitor_hours": self.monitor_hours,
-            "recording_dir": self.recording_dir,
-            "enabled_message_push": self.enabled_message_push,
-            "platform": self.platform,
-            "platform_key": self.platform_key,
-            "only_notify_no_record": self.only_notify_no_record,
-            "flv_use_direct_download": self.flv_use_direct_download
-        }
+        """Convert the persisted fields of the Recording instance to a dictionary for saving."""
+        slots = self.slots
+        return {name: slots[name].__get__(self) for name, _ in self.PERSISTED_FIELDS}
 
     @classmethod
     def from_dict(cls, data):
         """Create a Recording instance from a dictionary."""
-        recording = cls(
-            data.get("rec_id"),
-            data.get("url"),
-            data.get("streamer_name"),
-            data.get("record_format"),
-            data.get("quality"),
-            data.get("segment_record"),
-            data.get("segment_time"),
-            data.get("monitor_status"),
-            data.get("scheduled_recording"),
-            data.get("scheduled_start_time"),
-            data.get("monitor_hours"),
-            data.get("recording_dir"),
-            data.get("enabled_message_push"),
-            data.get("only_notify_no_record"),
-            data.get("flv_use_direct_download")
-        )
-        recording.title = data.get("title", recording.title)
-        recording.display_title = data.get("display_title", recording.title)
-        recording.last_duration_str = data.get("last_duration")
-        recording.platform = data.get("platform")
-        recording.platform_key = data.get("platform_key")
-        if recording.last_duration_str is not None:
-            recording.last_duration = timedelta(seconds=float(recording.last_duration_str))
+        recording = cls.__new__(cls)
+        recording._set_fields(data)
+        if recording.priority is None:
+            recording.priority = RecordingPriority.NORMAL
+        # Older recordings.json files also carry some runtime fields
+        if "title" in data:
+            recording.title = data["title"]
+        if "title" in data or "display_title" in data:
+            recording.display_title = data.get("display_title", recording.title)
+        if data.get("last_duration") is not None:
+            recording.last_duration = timedelta(seconds=float(data["last_duration"]))
         return recording
 
     def update_title(self, quality_info, prefix=None):
@@ -136,8 +183,32 @@ class Recording:
         self.title = f"{self.streamer_name} - {quality_info}"
         self.display_title = f"{prefix or ''}{self.title}"
 
+    @classmethod
+    def add_update_listener(cls, callback, watched_attributes=()):
+        """
+        :param callback: Called as callback(recording, changes) with the changed attributes and their new values.
+        :param watched_attributes: Attributes the callback also needs to hear about when they are assigned directly.
+        """
+        if callback not in cls.update_listeners:
+            cls.update_listeners.append(callback)
+        new_attributes = set(watched_attributes) - cls.watched_attributes
+        if new_attributes:
+            for name in new_attributes:
+                setattr(cls, name, WatchedField(name, cls.slots[name]))
+            cls.watched_attributes.update(new_attributes)
+
     def update(self, updated_info: dict):
-        """Update the recording object with new information."""
+        """Update the recording object with new information and notify the listeners of the changed attributes."""
+        changes = {}
         for attr, value in updated_info.items():
-            if hasattr(self, attr):
-                setattr(self, attr, value)
+            slot = self.slots.get(attr)
+            if slot is not None and slot.__get__(self) != value:
+                changes[attr] = value
+                slot.__set__(self, value)
+        if changes:
+            for callback in self.update_listeners:
+                callback(self, changes)
+
+
+# The member descriptors of the slots, kept when watched attributes are wrapped in a WatchedField
+Recording.slots = {name: Recording.__dict__[name] for name in Recording.__slots__}
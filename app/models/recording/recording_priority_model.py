@@ -0,0 +1,17 @@
+class RecordingPriority:
+    HIGH = "HIGH"
+    NORMAL = "NORMAL"
+    LOW = "LOW"
+
+    @classmethod
+    def get_priorities(cls):
+        """Get all properties of the RecordingPriority class, from highest to lowest"""
+        attributes = cls.__dict__
+        priorities = [value for name, value in attributes.items() if name.isupper()]
+        return priorities
+
+    @classmethod
+    def get_rank(cls, priority: str | None) -> int:
+        """Lower rank means higher priority, unknown values are treated as NORMAL"""
+        priorities = cls.get_priorities()
+        return priorities.index(priority) if priority in priorities else priorities.index(cls.NORMAL)
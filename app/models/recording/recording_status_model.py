@@ -22,6 +22,7 @@ class RecordingStatus:
     NOT_RECORDING_SPACE = "NOT_RECORDING_SPACE"
     LIVE_STATUS_CHECK_ERROR = "LIVE_STATUS_CHECK_ERROR"
     LIVE_BROADCASTING = "LIVE_BROADCASTING"
+    WAITING_FOR_CAPACITY = "WAITING_FOR_CAPACITY"
 
     @classmethod
     def get_status(cls):
@@ -15,10 +15,19 @@ from .video_player import VideoPlayer
 
 
 class RecordingCardManager:
+    """
+    Cards of the recordings page. Only the cards of the page that is shown exist: a pool of card slots is
+    bound to the recordings to show and rebound when the filter or the page changes, so thousands of
+    recordings do not create thousands of control trees. cards_obj maps the rec_ids of the bound
+    recordings to their slot, updates of recordings that are not shown are ignored.
+    """
+
     def __init__(self, app):
         self.app = app
         self.cards_obj = {}
-        self.update_duration_tasks = {}
+        self.card_slots = []
+        self.initialized_ids = set()
+        self.update_duration_task = None
         self.selected_cards = {}
         self.app.language_manager.add_observer(self)
         self._ = {}
@@ -34,82 +43,102 @@ class RecordingCardManager:
         self.app.page.pubsub.subscribe_topic("update", self.subscribe_update_card)
         self.app.page.pubsub.subscribe_topic("delete", self.subscribe_remove_cards)
 
-    async def create_card(self, recording: Recording):
-        """Create a card for a given recording."""
-        rec_id = recording.rec_id
-        if not self.cards_obj.get(rec_id):
+    async def initialize_recordings(self, recordings: list[Recording]):
+        """Start the first live check and set the scheduled time range of recordings not seen before."""
+        for recording in recordings:
+            if recording.rec_id in self.initialized_ids:
+                continue
+            self.initialized_ids.add(recording.rec_id)
             if self.app.recording_enabled:
                 self.app.page.run_task(self.app.record_manager.check_if_live, recording)
             else:
                 recording.status_info = RecordingStatus.NOT_RECORDING_SPACE
-        card_data = self._create_card_components(recording)
-        self.cards_obj[rec_id] = card_data
-        self.start_update_task(recording)
-        return card_data["card"]
-
-    def _create_card_components(self, recording: Recording):
-        """create card components."""
-        speed = recording.speed
-        duration_text_label = ft.Text(self.app.record_manager.get_duration(recording), size=12)
-
-        record_button = ft.IconButton(
-            icon=self.get_icon_for_recording_state(recording),
-            tooltip=self.get_tip_for_recording_state(recording),
-            on_click=lambda e, rec=recording: self.app.page.run_task(self.recording_button_on_click, e, rec),
-        )
+            recording.scheduled_time_range = await self.app.record_manager.get_scheduled_time_range(
+                recording.scheduled_start_time, recording.monitor_hours
+            )
+
+    def bind_cards(self, recordings: list[Recording]) -> list[ft.Card]:
+        """
+        Show recordings in the card slots, slots are created only when there are more recordings than slots.
+
+        :return: The cards of the bound slots, in the order of the recordings.
+        """
+        while len(self.card_slots) < len(recordings):
+            self.card_slots.append(self._create_card_components())
+
+        self.cards_obj = {}
+        for card_data, recording in zip(self.card_slots, recordings):
+            card_data["recording"] = recording
+            card_data["card"].key = str(recording.rec_id)
+            self.cards_obj[recording.rec_id] = card_data
+            self._apply_recording(card_data, recording)
+        for card_data in self.card_slots[len(recordings):]:
+            card_data["recording"] = None
+
+        self.start_update_task()
+        return [card_data["card"] for card_data in self.card_slots[:len(recordings)]]
+
+    def _on_slot_click(self, card_data: dict, handler):
+        """Event handler running a card handler for the recording the slot is bound to when it is clicked."""
+
+        def on_click(e):
+            recording = card_data["recording"]
+            if recording is not None:
+                self.app.page.run_task(handler, e, recording)
+
+        return on_click
+
+    def _create_card_components(self):
+        """create the components of a card slot."""
+        card_data = {"recording": None}
+        duration_text_label = ft.Text("", size=12)
+
+        record_button = ft.IconButton(on_click=self._on_slot_click(card_data, self.recording_button_on_click))
 
         edit_button = ft.IconButton(
             icon=ft.Icons.EDIT,
             tooltip=self._["edit_record_config"],
-            on_click=lambda e, rec=recording: self.app.page.run_task(self.edit_recording_button_click, e, rec),
+            on_click=self._on_slot_click(card_data, self.edit_recording_button_click),
         )
 
         preview_button = ft.IconButton(
             icon=ft.Icons.VIDEO_LIBRARY,
             tooltip=self._["preview_video"],
-            on_click=lambda e, rec=recording: self.app.page.run_task(self.preview_video_button_on_click, e, rec),
+            on_click=self._on_slot_click(card_data, self.preview_video_button_on_click),
         )
 
-        monitor_button = ft.IconButton(
-            icon=self.get_icon_for_monitor_state(recording),
-            tooltip=self.get_tip_for_monitor_state(recording),
-            on_click=lambda e, rec=recording: self.app.page.run_task(self.monitor_button_on_click, e, rec),
-        )
+        monitor_button = ft.IconButton(on_click=self._on_slot_click(card_data, self.monitor_button_on_click))
 
         delete_button = ft.IconButton(
             icon=ft.Icons.DELETE,
             tooltip=self._["delete_monitor"],
-            on_click=lambda e, rec=recording: self.app.page.run_task(self.recording_delete_button_click, e, rec),
+            on_click=self._on_slot_click(card_data, self.recording_delete_button_click),
         )
 
-        display_title = RecordingCardState.get_display_title(recording, self._)
         display_title_label = ft.Text(
-            display_title,
+            "",
             size=14,
             selectable=True,
             max_lines=1,
             no_wrap=True,
             overflow=ft.TextOverflow.ELLIPSIS,
             expand=True,
-            weight=RecordingCardState.get_title_weight(recording),
         )
 
         open_folder_button = ft.IconButton(
             icon=ft.Icons.FOLDER,
             tooltip=self._["open_folder"],
-            on_click=lambda e, rec=recording: self.app.page.run_task(self.recording_dir_button_on_click, e, rec),
+            on_click=self._on_slot_click(card_data, self.recording_dir_button_on_click),
         )
         recording_info_button = ft.IconButton(
             icon=ft.Icons.INFO,
             tooltip=self._["recording_info"],
-            on_click=lambda e, rec=recording: self.app.page.run_task(self.recording_info_button_on_click, e, rec),
+            on_click=self._on_slot_click(card_data, self.recording_info_button_on_click),
         )
-        speed_text_label = ft.Text(speed, size=12)
-
-        status_label = self.create_status_label(recording)
+        speed_text_label = ft.Text("", size=12)
 
         title_row = ft.Row(
-            [display_title_label, status_label] if status_label else [display_title_label],
+            [display_title_label],
             alignment=ft.MainAxisAlignment.START,
             spacing=5,
             tight=True,
@@ -140,15 +169,14 @@ class RecordingCardManager:
                 tight=True
             ),
             padding=8,
-            on_click=lambda e, rec=recording: self.app.page.run_task(self.recording_card_on_click, e, rec),
-            bgcolor=self.get_card_background_color(recording),
+            on_click=self._on_slot_click(card_data, self.recording_card_on_click),
             border_radius=5,
-            border=ft.border.all(2, self.get_card_border_color(recording)),
         )
-        card = ft.Card(key=str(recording.rec_id), content=card_container)
+        card = ft.Card(content=card_container)
 
-        return {
+        card_data.update({
             "card": card,
+            "title_row": title_row,
             "display_title_label": display_title_label,
             "duration_label": duration_text_label,
             "speed_label": speed_text_label,
@@ -157,8 +185,8 @@ class RecordingCardManager:
             "recording_info_button": recording_info_button,
             "edit_button": edit_button,
             "monitor_button": monitor_button,
-            "status_label": status_label,
-        }
+        })
+        return card_data
 
     def get_card_background_color(self, recording: Recording):
         is_dark_mode = self.app.page.theme_mode == ft.ThemeMode.DARK
@@ -191,63 +219,43 @@ class RecordingCardManager:
             alignment=ft.alignment.center,
         )
 
-    async def update_card(self, recording):
-        """Update only the recordings cards in the scrollable content area."""
-        if recording.rec_id in self.cards_obj:
-            try:
-                recording_card = self.cards_obj[recording.rec_id]
-
-                display_title = RecordingCardState.get_display_title(recording, self._)
-                if recording_card.get("display_title_label"):
-                    recording_card["display_title_label"].value = display_title
-                    recording_card["display_title_label"].weight = RecordingCardState.get_title_weight(recording)
-
-                new_status_label = self.create_status_label(recording)
-
-                if recording_card["card"] and recording_card["card"].content and recording_card["card"].content.content:
-                    title_row = recording_card["card"].content.content.controls[0]
-                    title_row.alignment = ft.MainAxisAlignment.START
-                    title_row.spacing = 5
-                    title_row.tight = True
-
-                    # Update the status label if it exists
-                    if new_status_label:
-                        if len(title_row.controls) > 1:
-                            title_row.controls[1] = new_status_label
-                        else:
-                            title_row.controls.append(new_status_label)
-                    else:
-                        if len(title_row.controls) > 1:
-                            title_row.controls.pop()
-
-                if recording_card.get("duration_label"):
-                    recording_card["duration_label"].value = self.app.record_manager.get_duration(recording)
-
-                if recording_card.get("speed_label"):
-                    recording_card["speed_label"].value = recording.speed
+    def _apply_recording(self, card_data: dict, recording: Recording):
+        """Set the controls of a card slot to the state of a recording, without sending the update."""
+        card_data["display_title_label"].value = RecordingCardState.get_display_title(recording, self._)
+        card_data["display_title_label"].weight = RecordingCardState.get_title_weight(recording)
 
-                if recording_card.get("record_button"):
-                    recording_card["record_button"].icon = self.get_icon_for_recording_state(recording)
-                    recording_card["record_button"].tooltip = self.get_tip_for_recording_state(recording)
+        title_row = card_data["title_row"]
+        new_status_label = self.create_status_label(recording)
+        if new_status_label:
+            if len(title_row.controls) > 1:
+                title_row.controls[1] = new_status_label
+            else:
+                title_row.controls.append(new_status_label)
+        elif len(title_row.controls) > 1:
+            title_row.controls.pop()
 
-                if recording_card.get("monitor_button"):
-                    recording_card["monitor_button"].icon = self.get_icon_for_monitor_state(recording)
-                    recording_card["monitor_button"].tooltip = self.get_tip_for_monitor_state(recording)
+        card_data["duration_label"].value = self.app.record_manager.get_duration(recording)
+        card_data["speed_label"].value = recording.speed
+        card_data["record_button"].icon = self.get_icon_for_recording_state(recording)
+        card_data["record_button"].tooltip = self.get_tip_for_recording_state(recording)
+        card_data["monitor_button"].icon = self.get_icon_for_monitor_state(recording)
+        card_data["monitor_button"].tooltip = self.get_tip_for_monitor_state(recording)
 
-                if recording_card["card"] and recording_card["card"].content:
-                    recording_card["card"].content.bgcolor = self.get_card_background_color(recording)
-                    recording_card["card"].content.border = ft.border.all(2, self.get_card_border_color(recording))
-                    try:
-                        self.app.page.update()
-                    except (ft.core.page.PageDisconnectedException, AssertionError) as e:
-                        logger.debug(f"Update card failed: {e}")
-                        return
+        card_data["card"].content.bgcolor = self.get_card_background_color(recording)
+        card_data["card"].content.border = ft.border.all(2, self.get_card_border_color(recording))
 
-            except (ft.core.page.PageDisconnectedException, AssertionError) as e:
-                logger.debug(f"Update card failed: {e}")
-                return
-            except Exception as e:
-                logger.debug(f"Update card failed: {e}")
+    async def update_card(self, recording):
+        """Update the card of a recording if it is shown."""
+        card_data = self.cards_obj.get(recording.rec_id)
+        if card_data is None or card_data["recording"] is not recording:
+            return
+        try:
+            self._apply_recording(card_data, recording)
+            self.app.page.update()
+        except (ft.core.page.PageDisconnectedException, AssertionError) as e:
+            logger.debug(f"Update card failed: {e}")
+        except Exception as e:
+            logger.debug(f"Update card failed: {e}")
 
     async def update_monitor_state(self, recording: Recording):
         """Update the monitor button state based on the current monitoring status."""
@@ -275,7 +283,7 @@ class RecordingCardManager:
 
         await self.update_card(recording)
         self.app.page.pubsub.send_others_on_topic("update", recording)
-        self.app.page.run_task(self.app.record_manager.persist_recordings)
+        self.app.page.run_task(self.app.record_manager.persist_recordings, recording)
 
     async def show_recording_info_dialog(self, recording: Recording):
         """Display a dialog with detailed information about the recording."""
@@ -340,33 +348,17 @@ class RecordingCardManager:
 
     async def remove_recording_card(self, recordings: list[Recording]):
         try:
-            recordings_page = self.app.current_page
-
-            existing_ids = {rec.rec_id for rec in self.app.record_manager.recordings}
             remove_ids = {rec.rec_id for rec in recordings}
-            keep_ids = existing_ids - remove_ids
-
-            cards_to_remove = [
-                card_data["card"]
-                for rec_id, card_data in self.cards_obj.items()
-                if rec_id not in keep_ids
-            ]
-
-            recordings_page.recording_card_area.content.controls = [
-                control
-                for control in recordings_page.recording_card_area.content.controls
-                if control not in cards_to_remove
+            for rec_id in remove_ids:
+                self.selected_cards.pop(rec_id, None)
+                self.initialized_ids.discard(rec_id)
+
+            # The recordings may still be in the index, so they are dropped from the shown ids directly
+            recordings_page = self.app.recordings
+            recordings_page.filtered_ids = [
+                rec_id for rec_id in recordings_page.filtered_ids if rec_id not in remove_ids
             ]
-
-            self.cards_obj = {
-                k: v for k, v in self.cards_obj.items()
-                if k in keep_ids
-            }
-
-            try:
-                recordings_page.recording_card_area.update()
-            except (ft.core.page.PageDisconnectedException, AssertionError) as e:
-                logger.debug(f"Update recording card area failed: {e}")
+            recordings_page.render_cards()
 
         except (ft.core.page.PageDisconnectedException, AssertionError) as e:
             logger.debug(f"Remove recording card failed: {e}")
@@ -393,37 +385,57 @@ class RecordingCardManager:
     def get_tip_for_monitor_state(self, recording: Recording):
         return self._["stop_monitor"] if recording.monitor_status else self._["start_monitor"]
 
-    async def update_duration(self, recording: Recording):
-        """Update the duration text periodically."""
-        while True:
-            update_interval = 1
-            await asyncio.sleep(update_interval)
-            if not recording or recording.rec_id not in self.cards_obj:  # Stop task if card is removed
-                break
-
-            if recording.is_recording:
-                try:
-                    duration_label = self.cards_obj[recording.rec_id]["duration_label"]
-                    duration_label.value = self.app.record_manager.get_duration(recording)
-                    duration_label.update()
-                except (ft.core.page.PageDisconnectedException, AssertionError) as e:
-                    logger.debug(f"Update duration failed: {e}")
-                    break
-                except Exception as e:
-                    logger.debug(f"Update duration failed: {e}")
-
-    def start_update_task(self, recording: Recording):
-        """Start a background task to update the duration text."""
-        self.update_duration_tasks[recording.rec_id] = self.app.page.run_task(self.update_duration, recording)
+    async def update_duration(self):
+        """Update the duration text of the shown recordings that are recording, once a second."""
+        try:
+            while True:
+                update_interval = 1
+                await asyncio.sleep(update_interval)
+                if self.app.current_page is not self.app.recordings:
+                    continue
+
+                for card_data in list(self.cards_obj.values()):
+                    recording = card_data["recording"]
+                    if recording is None or not recording.is_recording:
+                        continue
+                    try:
+                        duration_label = card_data["duration_label"]
+                        duration_label.value = self.app.record_manager.get_duration(recording)
+                        duration_label.update()
+                    except ft.core.page.PageDisconnectedException as e:
+                        logger.debug(f"Update duration failed: {e}")
+                        return
+                    except AssertionError as e:
+                        # The card area is being rebuilt, the next round updates the new cards
+                        logger.debug(f"Update duration failed: {e}")
+                        break
+                    except Exception as e:
+                        logger.debug(f"Update duration failed: {e}")
+        finally:
+            self.update_duration_task = None
+
+    def start_update_task(self):
+        """Start the background task updating the duration text of the shown cards."""
+        if self.update_duration_task is None:
+            self.update_duration_task = self.app.page.run_task(self.update_duration)
+
+    def stop_update_task(self):
+        """Stop the duration updates, e.g. when the web session disconnects."""
+        if self.update_duration_task is not None:
+            self.update_duration_task.cancel()
+            self.update_duration_task = None
 
     async def on_card_click(self, recording: Recording):
         """Handle card click events."""
         try:
             recording.selected = not recording.selected
             self.selected_cards[recording.rec_id] = recording
-            self.cards_obj[recording.rec_id]["card"].content.bgcolor = await self.update_record_hover(recording)
+            card_data = self.cards_obj.get(recording.rec_id)
+            if card_data is None:
+                return
+            card_data["card"].content.bgcolor = await self.update_record_hover(recording)
             try:
-                self.cards_obj[recording.rec_id]["card"].update()
+                card_data["card"].update()
             except (ft.core.page.PageDisconnectedException, AssertionError) as e:
                 logger.debug(f"Update card click state failed: {e}")
         except (ft.core.page.PageDisconnectedException, AssertionError) as e:
@@ -487,7 +499,8 @@ class RecordingCardManager:
             logger.debug(f"Show delete dialog failed: {e}")
 
     async def preview_video_button_on_click(self, _, recording: Recording):
-        if self.app.page.web and recording.record_url:
+        is_local_preview = bool(recording.preview_url) and os.path.isfile(recording.preview_url)
+        if recording.record_url and (self.app.page.web or is_local_preview):
             video_player = VideoPlayer(self.app)
             await video_player.preview_video(recording.preview_url, is_file_path=False, room_url=recording.url)
         elif recording.recording_dir and os.path.exists(recording.recording_dir):
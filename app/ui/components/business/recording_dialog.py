@@ -1,18 +1,21 @@
 import flet as ft
 
 from ....core.platforms.platform_handlers import get_platform_info
+from ....core.recording.bulk_transfer import BulkFormat, iter_rows
 from ....models.media.audio_format_model import AudioFormat
 from ....models.media.video_format_model import VideoFormat
 from ....models.media.video_quality_model import VideoQuality
+from ....models.recording.recording_priority_model import RecordingPriority
 from ....utils import utils
 from ....utils.logger import logger
 
 
 class RecordingDialog:
-    def __init__(self, app, on_confirm_callback=None, recording=None):
+    def __init__(self, app, on_confirm_callback=None, recording=None, on_import_callback=None):
         self.app = app
         self.page = self.app.page
         self.on_confirm_callback = on_confirm_callback
+        self.on_import_callback = on_import_callback
         self.recording = recording
         self.app.language_manager.add_observer(self)
         self._ = {}
@@ -35,6 +38,8 @@ class RecordingDialog:
         segment_time = config.get_value("segment_time", "video_segment_time", 1800)
         only_notify_no_record = config.get_value("only_notify_no_record", default=False)
         flv_use_direct_download = config.get_value("flv_use_direct_download", default=False)
+        hot_standby = config.get_value("hot_standby", default=False)
+        priority = config.get_value("priority", default=RecordingPriority.NORMAL)
 
         async def on_url_change(_):
             """Enable or disable the submit button based on whether the URL field is filled."""
@@ -252,6 +257,29 @@ class RecordingDialog:
             width=500,
         )
 
+        hot_standby_dropdown = ft.Dropdown(
+            label=self._["hot_standby"],
+            options=[
+                ft.dropdown.Option("true", self._["yes"]),
+                ft.dropdown.Option("false", self._["no"]),
+            ],
+            border_radius=5,
+            filled=False,
+            value="true" if hot_standby else "false",
+            width=500,
+            tooltip=self._["hot_standby_tip"]
+        )
+
+        priority_dropdown = ft.Dropdown(
+            label=self._["priority"],
+            options=[ft.dropdown.Option(i, text=self._[f"priority_{i}"]) for i in RecordingPriority.get_priorities()],
+            border_radius=5,
+            filled=False,
+            value=priority,
+            width=500,
+            tooltip=self._["priority_tip"]
+        )
+
         hint_text_dict = {
             "en": "Example:\n0，https://v.douyin.com/AbcdE，nickname1\n0，https://v.douyin.com/EfghI，nickname2\n\nPS: "
             "0=original image or Blu ray, 1=ultra clear, 2=high-definition, 3=standard definition, 4=smooth\n",
@@ -299,7 +327,9 @@ class RecordingDialog:
                                 schedule_and_monitor_row,
                                 monitor_hours_input,
                                 message_push_dropdown,
-                                no_record_dropdown
+                                no_record_dropdown,
+                                hot_standby_dropdown,
+                                priority_dropdown
                             ],
                             tight=True,
                             spacing=10,
@@ -313,18 +343,13 @@ class RecordingDialog:
             ],
         )
 
-        async def not_supported(url):
-            logger.warning(f"This platform does not support recording: {url}")
+        async def not_supported(url, log=True):
+            if log:
+                logger.warning(f"This platform does not support recording: {url}")
             await self.app.snack_bar.show_snack_bar(self._["platform_not_supported_tip"], duration=3000)
 
-        def get_existing_recordings():
-            existing_recordings = [rec.url for rec in self.app.record_manager.recordings]
-            return existing_recordings
-
         async def on_confirm(e):
 
-            existing_recordings = get_existing_recordings()
-
             if tabs.selected_index == 0:
                 quality_info = self._[quality_dropdown.value]
 
@@ -365,10 +390,12 @@ class RecordingDialog:
                         "enabled_message_push": message_push_dropdown.value == "true",
                         "only_notify_no_record": no_record_dropdown.value == "true",
                         "flv_use_direct_download": flv_use_direct_download_dropdown.value == "true",
+                        "hot_standby": hot_standby_dropdown.value == "true",
+                        "priority": priority_dropdown.value,
                     }
                 ]
 
-                if live_url in existing_recordings and not rec_id:
+                if self.app.record_manager.find_recordings_by_url(live_url) and not rec_id:
                     async def confirm_duplicate():
                         async def close_duplicate_dialog(_):
                             self.url_duplicate_confirm_dialog.open = False
@@ -401,55 +428,11 @@ class RecordingDialog:
                     await self.on_confirm_callback(recordings_info)
 
             elif tabs.selected_index == 1:  # Batch entry
-                lines = batch_input.value.splitlines()
-                recordings_info = []
-                batch_url_list = []
-                streamer_name = ""
-                quality = "OD"
-                quality_dict = {"0": "OD", "1": "UHD", "2": "HD", "3": "SD", "4": "LD"}
-                for line in lines:
-                    if "http" not in line:
-                        continue
-                    res = [i for i in line.strip().replace("，", ",").split(",") if i]
-                    if len(res) == 3:
-                        quality, url, streamer_name = res
-                    elif len(res) == 2:
-                        if res[1].startswith("http"):
-                            quality, url = res
-                        else:
-                            url, streamer_name = res
-                    else:
-                        url = res[0]
-
-                    platform, platform_key = get_platform_info(url)
-                    if not platform:
-                        await not_supported(url)
-                        continue
-
-                    existing_urls = set(batch_url_list) | set(existing_recordings)
-                    if url.strip() in existing_urls:
-                        logger.info(f"Skip {url.strip()}, the live room URL already exists.")
-                        continue
-
-                    quality = quality_dict.get(quality, "OD")
-                    title = f"{streamer_name} - {self._[quality]}"
-                    display_title = title
-                    if not streamer_name:
-                        streamer_name = self._["live_room"]
-                        display_title = streamer_name + url.split("?")[0] + "... - " + self._[quality]
-
-                    recording_info = {
-                        "url": url.strip(),
-                        "streamer_name": streamer_name,
-                        "quality": quality,
-                        "quality_info": self._[VideoQuality.OD],
-                        "title": title,
-                        "display_title": display_title,
-                    }
-                    batch_url_list.append(url.strip())
-                    recordings_info.append(recording_info)
-
-                await self.on_confirm_callback(recordings_info)
+                await close_dialog(e)
+                rows = iter_rows(batch_input.value.splitlines(), BulkFormat.TEXT)
+                # The importer already logged the unsupported urls
+                await self.on_import_callback(rows, lambda url: not_supported(url, log=False))
+                return
 
             await close_dialog(e)
 
@@ -147,6 +147,7 @@ class SaveProgressOverlay:
         self.warning_text.visible = False
         self.overlay.update()
 
+        self.app.record_manager.flush_recordings_threadsafe()
         self.app.page.window.destroy()
 
     def show(self, message=None, cancellable=False):
@@ -44,6 +44,7 @@ class CardDialog(ft.AlertDialog):
         if not should_push_message and recording.enabled_message_push:
             message_push = self._["disabled"] + f' ({self._["not_config_tip"]})'
         only_notify_no_record = self._["enabled"] if recording.only_notify_no_record else self._["disabled"]
+        priority = self._.get(f"priority_{recording.priority}", recording.priority)
 
         dialog_content = ft.Column(
             [
@@ -61,6 +62,7 @@ class CardDialog(ft.AlertDialog):
                 ft.Text(f"{self._['scheduled_time_range']}: {scheduled_time_range}", size=14),
                 ft.Text(f"{self._['message_push']}: {message_push}", size=14),
                 ft.Text(f"{self._['only_notify_no_record']}: {only_notify_no_record}", size=14),
+                ft.Text(f"{self._['priority']}: {priority}", size=14),
                 ft.Text(f"{self._['save_path']}: {save_path}", size=14, selectable=True),
                 ft.Text(f"{self._['recording_status']}: {recording_status_info}", size=14),
             ],
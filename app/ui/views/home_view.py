@@ -1,4 +1,5 @@
 import os
+import time
 from datetime import datetime
 
 import flet as ft
@@ -7,9 +8,12 @@ from ..base_page import PageBase
 
 
 class HomePage(PageBase):
+    HISTORY_DAYS = 30
+
     def __init__(self, app):
         super().__init__(app)
         self.page_name = "home"
+        self.history_content = None
         self.app.language_manager.add_observer(self)
         self.load_language()
         self.init()
@@ -31,6 +35,7 @@ class HomePage(PageBase):
                 self.create_quick_action_area(),
                 self.create_announcements_area(),
                 self.create_stats_area(),
+                self.create_history_area(),
                 self.create_features_area(),
             ],
             spacing=20,
@@ -40,6 +45,7 @@ class HomePage(PageBase):
 
         self.content_area.controls.append(home_content)
         self.content_area.update()
+        self.page.run_task(self.load_history_stats)
 
     def create_home_header(self):
         logo_path = os.path.join("icons", "loading-animation.png")
@@ -351,7 +357,7 @@ class HomePage(PageBase):
 
     def create_stats_area(self):
         total_recordings = len(self.app.record_manager.recordings)
-        active_recordings = len([r for r in self.app.record_manager.recordings if r.is_recording])
+        active_recordings = len(self.app.record_manager.recording_index.by_status["recording"])
 
         stopped_recordings = total_recordings - active_recordings
 
@@ -537,6 +543,120 @@ class HomePage(PageBase):
             padding=ft.padding.only(left=20, right=20),
         )
 
+    def create_history_area(self):
+        self.history_content = ft.Container(
+            content=ft.ProgressRing(width=24, height=24, stroke_width=2),
+            padding=ft.padding.only(top=10),
+        )
+        return ft.Container(
+            content=ft.Column(
+                controls=[
+                    ft.Text(
+                        self._["recording_history"],
+                        size=20,
+                        weight=ft.FontWeight.BOLD,
+                    ),
+                    self.history_content,
+                ],
+                spacing=5,
+            ),
+            padding=ft.padding.only(left=20, right=20),
+        )
+
+    async def load_history_stats(self):
+        """Fill the history area from the session history aggregates of the last HISTORY_DAYS days."""
+        since = time.time() - self.HISTORY_DAYS * 86400
+        summary = await self.app.record_manager.session_history.get_summary_async(since)
+        if self.app.current_page is not self or self.history_content is None:
+            return
+
+        totals = summary["totals"]
+        secondary_color = ft.Colors.BLACK54 if self.app.page.theme_mode == ft.ThemeMode.LIGHT else ft.Colors.WHITE60
+        if not totals["sessions"]:
+            self.history_content.content = ft.Text(
+                self._["no_recording_history"], size=14, italic=True, color=secondary_color
+            )
+            self.history_content.update()
+            return
+
+        def create_stat_item(title, value, icon, color):
+            return ft.Container(
+                content=ft.Column(
+                    controls=[
+                        ft.Icon(icon, size=36, color=color),
+                        ft.Text(value, size=24, weight=ft.FontWeight.BOLD),
+                        ft.Text(title, size=14),
+                    ],
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                    spacing=5,
+                ),
+                padding=ft.padding.all(15),
+                border_radius=10,
+                bgcolor=ft.Colors.SURFACE_CONTAINER_HIGHEST,
+                width=150,
+                height=130,
+            )
+
+        def create_list_card(title, rows):
+            return ft.Container(
+                content=ft.Column(
+                    controls=[
+                        ft.Text(title, size=16, weight=ft.FontWeight.BOLD),
+                        *[
+                            ft.Row(
+                                controls=[
+                                    ft.Text(name, size=14, expand=True, overflow=ft.TextOverflow.ELLIPSIS),
+                                    ft.Text(value, size=14, color=secondary_color),
+                                ],
+                            )
+                            for name, value in rows
+                        ],
+                    ],
+                    spacing=8,
+                ),
+                padding=ft.padding.all(15),
+                border_radius=10,
+                bgcolor=ft.Colors.SURFACE_CONTAINER_HIGHEST,
+                expand=True,
+            )
+
+        failure_rate = totals["failed"] / totals["sessions"]
+        stat_items = [
+            create_stat_item(
+                self._["recorded_hours"], f"{totals['hours']:.1f}", ft.Icons.TIMER_ROUNDED, ft.Colors.BLUE
+            ),
+            create_stat_item(
+                self._["recording_sessions"], str(totals["sessions"]), ft.Icons.HISTORY_ROUNDED, ft.Colors.GREEN
+            ),
+            create_stat_item(
+                self._["recorded_data"], f"{totals['bytes'] / 1024 ** 3:.1f} GB", ft.Icons.SAVE_ROUNDED,
+                ft.Colors.AMBER
+            ),
+            create_stat_item(
+                self._["failure_rate"], f"{failure_rate:.0%}", ft.Icons.ERROR_OUTLINE_ROUNDED, ft.Colors.RED
+            ),
+        ]
+        streamers_card = create_list_card(
+            self._["top_streamers"],
+            [(row["streamer_name"] or row["rec_id"], f"{row['hours']:.1f} h") for row in summary["streamer_hours"]],
+        )
+        platforms_card = create_list_card(
+            self._["platform_failure_rates"],
+            [
+                (row["platform"] or row["platform_key"], f"{row['failure_rate']:.0%} ({row['sessions']})")
+                for row in summary["platform_failure_rates"][:5]
+            ],
+        )
+
+        self.history_content.content = ft.Column(
+            controls=[
+                ft.Row(controls=stat_items, alignment=ft.MainAxisAlignment.CENTER, spacing=15, wrap=True),
+                ft.Row(controls=[streamers_card, platforms_card], spacing=15, wrap=self.app.is_mobile),
+            ],
+            spacing=15,
+        )
+        self.history_content.update()
+
     def create_features_area(self):
         is_mobile = self.app.is_mobile or self.page.width < 600
 
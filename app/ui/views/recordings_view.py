@@ -1,19 +1,23 @@
-import asyncio
+import time
 import uuid
 
 import flet as ft
 
 from ...core.platforms.platform_handlers import get_platform_info
+from ...core.recording.bulk_transfer import BulkFormat, iter_rows
 from ...models.recording.recording_model import Recording
+from ...models.recording.recording_priority_model import RecordingPriority
 from ...utils.logger import logger
 from ..base_page import PageBase
 from ..components.business.recording_dialog import RecordingDialog
 from ..components.dialogs.help_dialog import HelpDialog
 from ..components.dialogs.search_dialog import SearchDialog
-from ..filters import RecordingFilters
 
 
 class RecordingsPage(PageBase):
+    # Cards shown at once, the filtered recordings are paged through instead of all getting a card
+    PAGE_SIZE = 60
+
     def __init__(self, app):
         super().__init__(app)
         self.page_name = "recordings"
@@ -26,6 +30,16 @@ class RecordingsPage(PageBase):
         self.current_filter = "all"
         self.current_platform_filter = "all"
         self.platform_buttons = {}
+        self.search_query = ""
+        # rec_ids passing the filters and the search, in the order of the recording list
+        self.filtered_ids = []
+        self.page_index = 0
+        self.pager_area = None
+        self.page_range_text = None
+        self.previous_page_button = None
+        self.next_page_button = None
+        self.import_file_picker = None
+        self.export_file_picker = None
         self.init()
 
     def load_language(self):
@@ -61,7 +75,21 @@ class RecordingsPage(PageBase):
             content=initial_content,
             expand=True
         )
-        self.add_recording_dialog = RecordingDialog(self.app, self.add_recording)
+        self.page_range_text = ft.Text("", size=14)
+        self.previous_page_button = ft.IconButton(
+            icon=ft.Icons.CHEVRON_LEFT, tooltip=self._["previous_page"], on_click=self.previous_page_on_click
+        )
+        self.next_page_button = ft.IconButton(
+            icon=ft.Icons.CHEVRON_RIGHT, tooltip=self._["next_page"], on_click=self.next_page_on_click
+        )
+        self.pager_area = ft.Row(
+            [self.previous_page_button, self.page_range_text, self.next_page_button],
+            alignment=ft.MainAxisAlignment.CENTER,
+            visible=False,
+        )
+        self.add_recording_dialog = RecordingDialog(
+            self.app, self.add_recording, on_import_callback=self.import_recordings
+        )
         self.pubsub_subscribe()
 
     async def load(self):
@@ -74,13 +102,7 @@ class RecordingsPage(PageBase):
             ]
         )
         self.content_area.update()
-        
-        if not self.recording_card_area.content.controls:
-            self.recording_card_area.content.controls.clear()
-            await self.add_record_cards()
-        else:
-            # if cards exist, apply filter
-            await self.apply_filter()
+        await self.add_record_cards()
         
         if self.is_grid_view:
             await self.recalculate_grid_columns()
@@ -91,6 +113,7 @@ class RecordingsPage(PageBase):
     def pubsub_subscribe(self):
         self.app.page.pubsub.subscribe_topic('add', self.subscribe_add_cards)
         self.app.page.pubsub.subscribe_topic('delete_all', self.subscribe_del_all_cards)
+        self.app.page.pubsub.subscribe_topic('import', self.subscribe_import_cards)
 
     async def toggle_view_mode(self, _):
         self.is_grid_view = not self.is_grid_view
@@ -149,6 +172,18 @@ class RecordingsPage(PageBase):
             ft.IconButton(icon=ft.Icons.SEARCH, tooltip=self._["search"], on_click=self.search_on_click),
             ft.IconButton(icon=ft.Icons.ADD, tooltip=self._["add_record"], on_click=self.add_recording_on_click),
             ft.IconButton(icon=ft.Icons.REFRESH, tooltip=self._["refresh"], on_click=self.refresh_cards_on_click),
+            ft.IconButton(
+                icon=ft.Icons.UPLOAD_FILE,
+                tooltip=self._["import_recordings"],
+                on_click=self.import_recordings_on_click,
+                visible=not self.app.is_web_mode,
+            ),
+            ft.IconButton(
+                icon=ft.Icons.SAVE_ALT,
+                tooltip=self._["export_recordings"],
+                on_click=self.export_recordings_on_click,
+                visible=not self.app.is_web_mode,
+            ),
             ft.IconButton(
                 icon=ft.Icons.PLAY_ARROW,
                 tooltip=self._["batch_start"],
@@ -252,10 +287,9 @@ class RecordingsPage(PageBase):
             ),
         ]
         
-        platforms = {}
-        for recording in self.app.record_manager.recordings:
-            if recording.platform and recording.platform_key:
-                platforms[recording.platform_key] = recording.platform
+        platforms = {
+            key: name for key, name in self.app.record_manager.recording_index.get_platforms().items() if name
+        }
         
         platform_options = [
             ft.dropdown.Option(key="all", text=self._["filter_all"])
@@ -353,68 +387,78 @@ class RecordingsPage(PageBase):
         self.current_filter = "stopped"
         await self.apply_filter()
     
-    async def apply_filter(self):
+    async def apply_filter(self, reset_page: bool = True):
+        """
+        Show the recordings passing the status, platform and search filters.
+
+        :param reset_page: Go back to the first page, otherwise the current page is kept if it still exists.
+        """
+        self.filtered_ids = self.get_filtered_rec_ids()
+        if reset_page:
+            self.page_index = 0
+        if self.app.current_page is not self:
+            return
+
         if len(self.content_area.controls) > 1:
             self.content_area.controls[1] = self.create_filter_area()
         else:
             self.content_area.controls.append(self.create_filter_area())
-        
-        cards_obj = self.app.record_card_manager.cards_obj
-        recordings = self.app.record_manager.recordings
-        
-        for recording in recordings:
-            card_info = cards_obj.get(recording.rec_id)
-            if not card_info:
-                continue
-            
-            status_visible = RecordingFilters.get_status_filter_result(recording, self.current_filter)
-            platform_visible = RecordingFilters.get_platform_filter_result(recording, self.current_platform_filter)
-            
-            visible = status_visible and platform_visible
-            card_info["card"].visible = visible
-        
+        self.render_cards(update=False)
         self.content_area.update()
-        self.recording_card_area.update()
-
-    async def reset_cards_visibility(self):
-        cards_obj = self.app.record_card_manager.cards_obj
-        for card_info in cards_obj.values():
-            if not card_info["card"].visible:
-                card_info["card"].visible = True
-                card_info["card"].update()
-
-    async def filter_recordings(self, query):
-        recordings = self.app.record_manager.recordings
-        cards_obj = self.app.record_card_manager.cards_obj
-
-        if not query.strip():
-            await self.apply_filter()
-            return {}
-        else:
-            lower_query = query.strip().lower()
-            search_ids = {
-                rec.rec_id
-                for rec in recordings
-                if lower_query in str(rec.to_dict()).lower() or lower_query in rec.display_title
-            }
-            
-            filtered_ids = set()
-            
-            for rec_id in search_ids:
-                recording = self.app.record_manager.find_recording_by_id(rec_id)
-                if not recording:
-                    continue
 
-                if RecordingFilters.should_show_recording(self.current_filter, self.current_platform_filter, recording):
-                    filtered_ids.add(rec_id)
+    def get_filtered_rec_ids(self) -> list[str]:
+        """The rec_ids passing the current filters and search, computed from the recordings, not the cards."""
+        rec_ids = self.app.record_manager.recording_index.get_rec_ids(
+            self.current_filter, self.current_platform_filter
+        )
+        lower_query = self.search_query.lower()
+        return [
+            rec.rec_id
+            for rec in self.app.record_manager.recordings
+            if rec.rec_id in rec_ids and (
+                not lower_query or lower_query in str(rec.to_dict()).lower() or lower_query in rec.display_title
+            )
+        ]
 
-            for card_info in cards_obj.values():
-                card_info["card"].visible = card_info["card"].key in filtered_ids
-                card_info["card"].update()
+    def render_cards(self, update: bool = True):
+        """Bind the card slots to the recordings of the current page."""
+        total = len(self.filtered_ids)
+        page_count = max(1, (total + self.PAGE_SIZE - 1) // self.PAGE_SIZE)
+        self.page_index = min(self.page_index, page_count - 1)
+        start = self.page_index * self.PAGE_SIZE
+        by_id = self.app.record_manager.recording_index.by_id
+        recordings = [by_id[rec_id] for rec_id in self.filtered_ids[start:start + self.PAGE_SIZE] if rec_id in by_id]
+
+        self.recording_card_area.content.controls = self.app.record_card_manager.bind_cards(recordings)
+        self.page_range_text.value = self._["page_range"].format(
+            start=start + 1 if total else 0, end=start + len(recordings), total=total
+        )
+        self.previous_page_button.disabled = self.page_index == 0
+        self.next_page_button.disabled = self.page_index >= page_count - 1
+        self.pager_area.visible = page_count > 1
+
+        if update and self.app.current_page is self:
+            try:
+                self.recording_card_area.update()
+                self.pager_area.update()
+            except (ft.core.page.PageDisconnectedException, AssertionError) as e:
+                logger.debug(f"Update recording card area failed: {e}")
+
+    async def previous_page_on_click(self, _):
+        if self.page_index > 0:
+            self.page_index -= 1
+            self.render_cards()
+
+    async def next_page_on_click(self, _):
+        self.page_index += 1
+        self.render_cards()
 
-            if not filtered_ids:
-                await self.app.snack_bar.show_snack_bar(self._["not_search_result"], duration=2000)
-            return filtered_ids
+    async def filter_recordings(self, query):
+        self.search_query = query.strip()
+        await self.apply_filter()
+        if self.search_query and not self.filtered_ids:
+            await self.app.snack_bar.show_snack_bar(self._["not_search_result"], duration=2000)
+        return set(self.filtered_ids)
 
     def create_recordings_content_area(self):
         return ft.Column(
@@ -426,6 +470,7 @@ class RecordingsPage(PageBase):
                     alignment=ft.alignment.center
                 ),
                 self.recording_card_area,
+                self.pager_area,
             ],
             scroll=ft.ScrollMode.AUTO if not self.app.is_mobile else ft.ScrollMode.HIDDEN,
         )
@@ -435,41 +480,10 @@ class RecordingsPage(PageBase):
         self.loading_indicator.visible = True
         self.loading_indicator.update()
 
-        cards_to_create = []
-        existing_cards = []
-        
-        for recording in self.app.record_manager.recordings:
-            if recording.rec_id not in self.app.record_card_manager.cards_obj:
-                cards_to_create.append(recording)
-            else:
-                existing_card = self.app.record_card_manager.cards_obj[recording.rec_id]["card"]
-                existing_card.visible = True
-                existing_cards.append(existing_card)
-        
-        async def create_card_with_time_range(_recording: Recording):
-            _card = await self.app.record_card_manager.create_card(_recording)
-            _recording.scheduled_time_range = await self.app.record_manager.get_scheduled_time_range(
-                _recording.scheduled_start_time, _recording.monitor_hours
-            )
-            return _card, _recording
-        
-        if cards_to_create:
-            results = await asyncio.gather(*[
-                create_card_with_time_range(recording)
-                for recording in cards_to_create
-            ])
-            
-            for card, recording in results:
-                self.recording_card_area.content.controls.append(card)
-                self.app.record_card_manager.cards_obj[recording.rec_id]["card"] = card
-            
-            if existing_cards:
-                for card in existing_cards:
-                    self.recording_card_area.content.controls.append(card)
+        await self.app.record_card_manager.initialize_recordings(self.app.record_manager.recordings)
 
         self.loading_indicator.visible = False
         self.loading_indicator.update()
-        self.recording_card_area.update()
         
         if not self.app.record_manager.periodic_task_started:
             self.page.run_task(
@@ -477,15 +491,7 @@ class RecordingsPage(PageBase):
                 self.app.record_manager.loop_time_seconds
             )
         
-        await self.apply_filter()
-
-    async def show_all_cards(self):
-        cards_obj = self.app.record_card_manager.cards_obj
-        for card in cards_obj.values():
-            card["card"].visible = True
-        self.recording_card_area.update()
-        
-        await self.apply_filter()
+        await self.apply_filter(reset_page=False)
 
     async def add_recording(self, recordings_info):
         user_config = self.app.settings.user_config
@@ -510,6 +516,8 @@ class RecordingsPage(PageBase):
                     enabled_message_push=recording_info["enabled_message_push"],
                     only_notify_no_record=recording_info["only_notify_no_record"],
                     flv_use_direct_download=recording_info["flv_use_direct_download"],
+                    hot_standby=recording_info.get("hot_standby", False),
+                    priority=recording_info.get("priority", RecordingPriority.NORMAL),
                 )
             else:
                 recording = Recording(
@@ -541,29 +549,104 @@ class RecordingsPage(PageBase):
             new_recordings.append(recording)
 
         if new_recordings:
-            async def create_card_with_time_range(rec):
-                _card = await self.app.record_card_manager.create_card(rec)
-                rec.scheduled_time_range = await self.app.record_manager.get_scheduled_time_range(
-                    rec.scheduled_start_time, rec.monitor_hours
+            await self.app.record_card_manager.initialize_recordings(new_recordings)
+            for recording in new_recordings:
+                self.app.page.pubsub.send_others_on_topic("add", recording)
+
+            await self.apply_filter(reset_page=False)
+
+            await self.app.snack_bar.show_snack_bar(self._["add_recording_success_tip"], bgcolor=ft.Colors.GREEN)
+
+    async def import_recordings(self, rows, on_unsupported=None):
+        """
+        Import rows through the bulk import and create the cards of the new recordings afterwards.
+
+        :param on_unsupported: Awaited with each url of an unsupported platform before the result is shown.
+        """
+        self.loading_indicator.visible = True
+        self.loading_indicator.update()
+        last_report = time.monotonic()
+
+        async def on_progress(progress):
+            nonlocal last_report
+            if time.monotonic() - last_report >= 1:
+                last_report = time.monotonic()
+                await self.app.snack_bar.show_snack_bar(
+                    self._["import_recordings_progress_tip"].format(read=progress.read, added=progress.added),
+                    duration=1500,
                 )
-                return _card, rec
 
-            results = await asyncio.gather(*[
-                create_card_with_time_range(rec)
-                for rec in new_recordings
-            ])
+        progress = await self.app.record_manager.import_recordings(rows, on_progress)
+        if progress.added:
+            await self.add_record_cards()
+            self.app.page.pubsub.send_others_on_topic("import", None)
+        else:
+            self.loading_indicator.visible = False
+            self.loading_indicator.update()
 
-            for card, recording in results:
-                self.recording_card_area.content.controls.append(card)
-                self.app.record_card_manager.cards_obj[recording.rec_id]["card"] = card
-                self.app.page.pubsub.send_others_on_topic("add", recording)
-            
-            self.recording_card_area.update()
-            
-            self.content_area.controls[1] = self.create_filter_area()
-            self.content_area.update()
+        if on_unsupported:
+            for url in progress.unsupported_urls:
+                await on_unsupported(url)
+        await self.app.snack_bar.show_snack_bar(
+            self._["import_recordings_result_tip"].format(
+                added=progress.added,
+                duplicates=progress.duplicates,
+                unsupported=progress.unsupported,
+                invalid=progress.invalid,
+            ),
+            bgcolor=ft.Colors.GREEN if progress.added else None,
+            duration=3000,
+        )
 
-            await self.app.snack_bar.show_snack_bar(self._["add_recording_success_tip"], bgcolor=ft.Colors.GREEN)
+    async def import_recordings_on_click(self, _e):
+        if self.import_file_picker is None:
+            self.import_file_picker = ft.FilePicker(on_result=self.on_import_file_picked)
+            self.page.overlay.append(self.import_file_picker)
+            self.page.update()
+        self.import_file_picker.pick_files(
+            dialog_title=self._["import_recordings"], allowed_extensions=["csv", "jsonl", "ndjson", "txt"]
+        )
+
+    async def on_import_file_picked(self, e: ft.FilePickerResultEvent):
+        if not e.files or e.files[0].path is None:
+            return
+        path = e.files[0].path
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as file:
+                await self.import_recordings(iter_rows(file, BulkFormat.from_path(path)))
+        except (OSError, UnicodeDecodeError) as err:
+            logger.error(f"Import recordings failed: {path}: {err}")
+            self.loading_indicator.visible = False
+            self.loading_indicator.update()
+            await self.app.snack_bar.show_snack_bar(
+                self._["import_recordings_failed_tip"].format(error=err), bgcolor=ft.Colors.RED
+            )
+
+    async def export_recordings_on_click(self, _e):
+        if self.export_file_picker is None:
+            self.export_file_picker = ft.FilePicker(on_result=self.on_export_file_picked)
+            self.page.overlay.append(self.export_file_picker)
+            self.page.update()
+        self.export_file_picker.save_file(
+            dialog_title=self._["export_recordings"],
+            file_name="recordings.csv",
+            allowed_extensions=BulkFormat.get_formats(),
+        )
+
+    async def on_export_file_picked(self, e: ft.FilePickerResultEvent):
+        if not e.path:
+            return
+        try:
+            count = await self.app.record_manager.export_recordings(e.path)
+        except OSError as err:
+            logger.error(f"Export recordings failed: {e.path}: {err}")
+            await self.app.snack_bar.show_snack_bar(
+                self._["export_recordings_failed_tip"].format(error=err), bgcolor=ft.Colors.RED
+            )
+            return
+        await self.app.snack_bar.show_snack_bar(
+            self._["export_recordings_success_tip"].format(count=count), bgcolor=ft.Colors.GREEN
+        )
 
     async def search_on_click(self, _e):
         """Open the search dialog when the search button is clicked."""
@@ -580,28 +663,13 @@ class RecordingsPage(PageBase):
         self.loading_indicator.visible = True
         self.loading_indicator.update()
         
-        cards_obj = self.app.record_card_manager.cards_obj
-        recordings = self.app.record_manager.recordings
         selected_cards = self.app.record_card_manager.selected_cards
-        new_ids = {rec.rec_id for rec in recordings}
-        to_remove = []
-        for card_id, card in cards_obj.items():
-            if card_id not in new_ids:
-                to_remove.append(card)
-                continue
-            if card_id in selected_cards:
-                selected_cards[card_id].selected = False
-                card["card"].content.bgcolor = None
-                card["card"].update()
-
-        for card in to_remove:
-            card_key = card["card"].key
-            cards_obj.pop(card_key, None)
-            self.recording_card_area.controls.remove(card["card"])
-        await self.show_all_cards()
-        
-        self.content_area.controls[1] = self.create_filter_area()
-        self.content_area.update()
+        for recording in selected_cards.values():
+            recording.selected = False
+        selected_cards.clear()
+
+        self.search_query = ""
+        await self.apply_filter(reset_page=False)
         
         self.loading_indicator.visible = False
         self.loading_indicator.update()
@@ -662,40 +730,24 @@ class RecordingsPage(PageBase):
         self.page.update()
 
     async def delete_all_recording_cards(self):
-        self.recording_card_area.content.controls.clear()
-        self.recording_card_area.update()
-        self.app.record_card_manager.cards_obj = {}
-        
+        self.app.record_card_manager.selected_cards.clear()
+        self.app.record_card_manager.initialized_ids.clear()
         self.current_platform_filter = "all"
-        
-        self.content_area.controls[1] = self.create_filter_area()
-        self.content_area.update()
+        self.search_query = ""
+        self.filtered_ids = []
+        self.render_cards()
+        await self.apply_filter()
 
     async def subscribe_del_all_cards(self, *_):
         await self.delete_all_recording_cards()
 
+    async def subscribe_import_cards(self, *_):
+        await self.add_record_cards()
+
     async def subscribe_add_cards(self, _, recording: Recording):
         """Handle the subscription of adding cards from other clients"""
-        
-        self.loading_indicator.visible = True
-        self.loading_indicator.update()
-        
-        if recording.rec_id not in self.app.record_card_manager.cards_obj:
-            card = await self.app.record_card_manager.create_card(recording)
-            recording.scheduled_time_range = await self.app.record_manager.get_scheduled_time_range(
-                recording.scheduled_start_time, recording.monitor_hours
-            )
-            
-            self.recording_card_area.content.controls.append(card)
-            self.app.record_card_manager.cards_obj[recording.rec_id]["card"] = card
-            
-            self.loading_indicator.visible = False
-            self.loading_indicator.update()
-            
-            self.recording_card_area.update()
-            
-            self.content_area.controls[1] = self.create_filter_area()
-            self.content_area.update()
+        await self.app.record_card_manager.initialize_recordings([recording])
+        await self.apply_filter(reset_page=False)
 
     async def update_grid_layout(self, _):
         self.page.run_task(self.recalculate_grid_columns)
@@ -4,6 +4,7 @@ import os
 import flet as ft
 
 from ...core.auth.tiktok_auth import TikTokAuth
+from ...core.config.recording_store import RecordingStorageBackend
 from ...models.media.audio_format_model import AudioFormat
 from ...models.media.video_format_model import VideoFormat
 from ...models.media.video_quality_model import VideoQuality
@@ -400,6 +401,26 @@ class SettingsPage(PageBase):
                                 on_change=self.on_change,
                             ),
                         ),
+                        self.create_setting_row(
+                            self._["stall_timeout_seconds"],
+                            ft.TextField(
+                                value=self.get_config_value("stall_timeout_seconds"),
+                                width=100,
+                                data="stall_timeout_seconds",
+                                on_change=self.on_change,
+                                hint_text=self._["stall_timeout_seconds_tip"],
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["preroll_buffer_seconds"],
+                            ft.TextField(
+                                value=self.get_config_value("preroll_buffer_seconds"),
+                                width=100,
+                                data="preroll_buffer_seconds",
+                                on_change=self.on_change,
+                                hint_text=self._["preroll_buffer_seconds_tip"],
+                            ),
+                        ),
                         self.create_setting_row(
                             self._["segment_time"],
                             ft.TextField(
@@ -425,6 +446,39 @@ class SettingsPage(PageBase):
                                 on_change=self.on_change,
                             ),
                         ),
+                        self.create_setting_row(
+                            self._["remux_engine"],
+                            ft.Dropdown(
+                                options=[ft.dropdown.Option(i) for i in ["ffmpeg", "pyav"]],
+                                value=self.get_config_value("remux_engine", "ffmpeg"),
+                                width=200,
+                                data="remux_engine",
+                                on_change=self.on_change,
+                                tooltip=self._["remux_engine_tip"],
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["audio_extract_format"],
+                            ft.Dropdown(
+                                options=[ft.dropdown.Option(key="", text=self._["disabled"])] + [
+                                    ft.dropdown.Option(key=i, text=i.upper()) for i in ["mp3", "m4a"]
+                                ],
+                                value=self.get_config_value("audio_extract_format", ""),
+                                width=200,
+                                data="audio_extract_format",
+                                on_change=self.on_change,
+                                tooltip=self._["audio_extract_format_tip"],
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["local_hls_preview"],
+                            ft.Switch(
+                                value=self.get_config_value("local_hls_preview"),
+                                data="local_hls_preview",
+                                on_change=self.on_change,
+                                tooltip=self._["local_hls_preview_tip"],
+                            ),
+                        ),
                         self.create_setting_row(
                             self._["generate_timestamps_subtitle"],
                             ft.Switch(
@@ -433,6 +487,49 @@ class SettingsPage(PageBase):
                                 on_change=self.on_change,
                             ),
                         ),
+                        self.create_setting_row(
+                            self._["time_subtitle_format"],
+                            ft.Dropdown(
+                                options=[ft.dropdown.Option(i) for i in ["srt", "vtt"]],
+                                value=self.get_config_value("time_subtitle_format", "srt"),
+                                width=200,
+                                data="time_subtitle_format",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["time_subtitle_interval"],
+                            ft.TextField(
+                                value=self.get_config_value("time_subtitle_interval"),
+                                width=100,
+                                data="time_subtitle_interval",
+                                on_change=self.on_change,
+                                hint_text=self._["time_subtitle_interval_tip"],
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["generate_keyframe_index"],
+                            ft.Switch(
+                                value=self.get_config_value("generate_keyframe_index", True),
+                                data="generate_keyframe_index",
+                                on_change=self.on_change,
+                                tooltip=self._["generate_keyframe_index_tip"],
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["recordings_storage_backend"],
+                            ft.Dropdown(
+                                options=[
+                                    ft.dropdown.Option(key=i, text=self._[f"recordings_storage_{i}"])
+                                    for i in RecordingStorageBackend.get_backends()
+                                ],
+                                value=self.get_config_value("recordings_storage_backend", RecordingStorageBackend.JSON),
+                                width=200,
+                                data="recordings_storage_backend",
+                                on_change=self.on_change,
+                                tooltip=self._["recordings_storage_backend_tip"],
+                            ),
+                        ),
                         self.create_setting_row(
                             self._["custom_script"],
                             ft.Switch(
@@ -450,6 +547,26 @@ class SettingsPage(PageBase):
                                 on_change=self.on_change,
                             ),
                         ),
+                        self.create_setting_row(
+                            self._["script_max_concurrency"],
+                            ft.TextField(
+                                value=self.get_config_value("script_max_concurrency"),
+                                width=100,
+                                data="script_max_concurrency",
+                                on_change=self.on_change,
+                                hint_text=self._["script_max_concurrency_tip"],
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["script_timeout_seconds"],
+                            ft.TextField(
+                                value=self.get_config_value("script_timeout_seconds"),
+                                width=100,
+                                data="script_timeout_seconds",
+                                on_change=self.on_change,
+                                hint_text=self._["script_timeout_seconds_tip"],
+                            ),
+                        ),
                         self.create_setting_row(
                             self._["default_platform_with_proxy"],
                             ft.TextField(
@@ -469,6 +586,60 @@ class SettingsPage(PageBase):
                                 hint_text=self._["platform_max_concurrent_requests_tip"]
                             ),
                         ),
+                        self.create_setting_row(
+                            self._["max_concurrent_recordings"],
+                            ft.TextField(
+                                value=self.get_config_value("max_concurrent_recordings"),
+                                width=100,
+                                data="max_concurrent_recordings",
+                                on_change=self.on_change,
+                                hint_text=self._["max_concurrent_recordings_tip"],
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["ingest_bandwidth_budget_mbps"],
+                            ft.TextField(
+                                value=self.get_config_value("ingest_bandwidth_budget_mbps"),
+                                width=100,
+                                data="ingest_bandwidth_budget_mbps",
+                                on_change=self.on_change,
+                                hint_text=self._["ingest_bandwidth_budget_mbps_tip"],
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["admission_overflow_policy"],
+                            ft.Dropdown(
+                                options=[
+                                    ft.dropdown.Option(key=i, text=self._[f"admission_overflow_{i}"])
+                                    for i in ["queue", "downgrade", "notify_only"]
+                                ],
+                                value=self.get_config_value("admission_overflow_policy", "queue"),
+                                width=200,
+                                data="admission_overflow_policy",
+                                on_change=self.on_change,
+                                tooltip=self._["admission_overflow_policy_tip"],
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["pressure_ingest_mbps"],
+                            ft.TextField(
+                                value=self.get_config_value("pressure_ingest_mbps"),
+                                width=100,
+                                data="pressure_ingest_mbps",
+                                on_change=self.on_change,
+                                hint_text=self._["pressure_ingest_mbps_tip"],
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["pressure_disk_latency_ms"],
+                            ft.TextField(
+                                value=self.get_config_value("pressure_disk_latency_ms"),
+                                width=100,
+                                data="pressure_disk_latency_ms",
+                                on_change=self.on_change,
+                                hint_text=self._["pressure_disk_latency_ms_tip"],
+                            ),
+                        ),
                     ],
                     is_mobile,
                 ),
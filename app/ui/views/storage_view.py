@@ -5,6 +5,9 @@ from concurrent.futures import ThreadPoolExecutor
 import flet as ft
 from dotenv import find_dotenv, load_dotenv
 
+from ...core.media.clip_extractor import ClipExtractor, ClipJobStatus
+from ...core.media.ffmpeg_builders import PREVIEW_DIR_NAME
+from ...core.media.keyframe_index import INDEX_SUFFIX, KeyframeIndex
 from ...utils.logger import logger
 from ..base_page import PageBase as BasePage
 
@@ -103,6 +106,8 @@ class StoragePage(BasePage):
                 _items = []
                 with os.scandir(self.current_path) as it:
                     for entry in it:
+                        if entry.name == PREVIEW_DIR_NAME or entry.name.endswith(INDEX_SUFFIX):
+                            continue
                         _items.append((entry.name, entry.is_dir(), entry.path))
                 return sorted(_items, key=lambda x: (-x[1], x[0].lower()))
             except Exception as e:
@@ -114,11 +119,19 @@ class StoragePage(BasePage):
         buttons = []
         is_mobile = self.app.is_mobile
         for name, is_dir, full_path in items:
+            clip_button = None
+            if not is_dir and KeyframeIndex.is_supported(name):
+                clip_button = ft.IconButton(
+                    icon=ft.icons.CONTENT_CUT,
+                    tooltip=self._["create_clip"],
+                    on_click=lambda e, path=full_path: self.app.page.run_task(self.show_clip_dialog, path)
+                )
             if is_mobile:
                 icon = ft.Icon(ft.icons.FOLDER, color=ft.colors.BLUE) if is_dir else ft.Icon(ft.icons.INSERT_DRIVE_FILE)
                 item = ft.ListTile(
                     leading=icon,
                     title=ft.Text(name),
+                    trailing=clip_button,
                     on_click=lambda e, path=full_path, is_directory=is_dir: self.app.page.run_task(
                         self.navigate_to if is_directory else self.preview_file, 
                         path
@@ -136,6 +149,8 @@ class StoragePage(BasePage):
                         f"📄 {name}",
                         on_click=lambda e, path=full_path: self.app.page.run_task(self.preview_file, path)
                     )
+                    if clip_button:
+                        btn = ft.Row(controls=[btn, clip_button], spacing=2)
                 buttons.append(btn)
 
         self.file_list.controls.extend(buttons)
@@ -171,6 +186,55 @@ class StoragePage(BasePage):
         await self.update_file_list()
         self.content.update()
 
+    async def show_clip_dialog(self, file_path):
+        start_field = ft.TextField(label=self._["clip_start"], hint_text="00:00:00", width=160)
+        end_field = ft.TextField(label=self._["clip_end"], hint_text="00:01:00", width=160)
+
+        async def close_dialog(_):
+            try:
+                clip_dialog.open = False
+                clip_dialog.update()
+            except (ft.core.page.PageDisconnectedException, AssertionError) as e:
+                logger.debug(f"Close clip dialog failed: {e}")
+
+        async def confirm_dlg(_):
+            try:
+                start = ClipExtractor.parse_time(start_field.value)
+                end = ClipExtractor.parse_time(end_field.value)
+            except ValueError:
+                await self.app.snack_bar.show_snack_bar(self._["clip_invalid_time"])
+                return
+            await close_dialog(None)
+            await self.create_clip(file_path, start, end)
+
+        clip_dialog = ft.AlertDialog(
+            title=ft.Text(self._["create_clip"]),
+            content=ft.Column(
+                controls=[ft.Text(os.path.basename(file_path), selectable=True), start_field, end_field],
+                tight=True,
+            ),
+            actions=[
+                ft.TextButton(text=self._["cancel"], on_click=close_dialog),
+                ft.TextButton(text=self._["sure"], on_click=confirm_dlg),
+            ],
+            actions_alignment=ft.MainAxisAlignment.END,
+            modal=False,
+        )
+        clip_dialog.open = True
+        self.app.dialog_area.content = clip_dialog
+        self.app.page.update()
+
+    async def create_clip(self, file_path, start, end):
+        await self.app.snack_bar.show_snack_bar(self._["clip_started"])
+        job = await self.app.clip_extractor.run(file_path, start, end)
+        if job["status"] == ClipJobStatus.DONE:
+            clip_name = os.path.basename(job["result"]["output_path"])
+            await self.app.snack_bar.show_snack_bar(self._["clip_created"].format(name=clip_name))
+            if os.path.dirname(file_path) == self.current_path:
+                await self.update_file_list()
+        else:
+            await self.app.snack_bar.show_snack_bar(self._["clip_failed"].format(error=job["error"]))
+
     async def preview_file(self, file_path, room_url=None):
         import urllib.parse
 
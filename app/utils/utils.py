@@ -8,6 +8,7 @@ import shutil
 import string
 import subprocess
 import sys
+import tempfile
 import traceback
 from datetime import datetime, time, timedelta
 from pathlib import Path
@@ -72,6 +73,15 @@ def get_file_paths(directory: str) -> list:
     return file_paths
 
 
+def make_temp_path(path: str) -> str:
+    """Create an empty temp file next to a file that is about to be replaced, unique per call."""
+    fd, temp_path = tempfile.mkstemp(
+        prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(path) or None
+    )
+    os.close(fd)
+    return temp_path
+
+
 def remove_emojis(text: str, replace_text: str = "") -> str:
     emoji_pattern = re.compile(
         "["
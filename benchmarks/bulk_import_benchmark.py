@@ -0,0 +1,57 @@
+"""
+Measure the bulk import and export of recordings with every recording store backend.
+
+The second import reads the exported CSV back, so every row is a duplicate and only parsing and the
+url checks are timed on top of loading the store.
+
+Usage:
+    python -m benchmarks.bulk_import_benchmark --recordings 100000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from app.core.config.recording_store import RecordingStorageBackend
+from app.core.recording.bulk_transfer import export_file, import_file
+
+
+def write_input(path: str, count: int) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        file.writelines(f"0,https://www.tiktok.com/@streamer{i}/live,streamer{i}\n" for i in range(count))
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = asyncio.run(func())
+    print(f"  {label:<10} {(time.perf_counter() - start) * 1000:9.1f}ms  {result}")
+
+
+def run(backend: str, count: int) -> None:
+    with tempfile.TemporaryDirectory() as run_path:
+        os.makedirs(os.path.join(run_path, "config"))
+        with open(os.path.join(run_path, "config", "user_settings.json"), "w", encoding="utf-8") as file:
+            json.dump({"recordings_storage_backend": backend}, file)
+        input_path = os.path.join(run_path, "input.txt")
+        export_path = os.path.join(run_path, "export.csv")
+        write_input(input_path, count)
+
+        print(backend)
+        timed("import", lambda: import_file(run_path, input_path))
+        timed("export", lambda: export_file(run_path, export_path))
+        timed("reimport", lambda: import_file(run_path, export_path))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the bulk import and export of recordings")
+    parser.add_argument("--recordings", type=int, default=100000, help="Number of entries to import")
+    args = parser.parse_args()
+
+    for backend in RecordingStorageBackend.get_backends():
+        run(backend, args.recordings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Measure memory and (de)serialization throughput of the Recording model.
+
+Usage:
+    python -m benchmarks.recording_model_benchmark --recordings 50000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from app.core.recording.recording_index import RecordingIndex
+from app.models.recording.recording_model import Recording
+
+
+def make_records(count: int) -> list[dict]:
+    return [
+        {
+            "rec_id": f"rec-{i:06d}",
+            "url": f"https://www.tiktok.com/@streamer{i}/live",
+            "streamer_name": f"streamer{i}",
+            "record_format": "ts",
+            "quality": "OD",
+            "segment_record": True,
+            "segment_time": "1800",
+            "monitor_status": True,
+            "scheduled_recording": False,
+            "scheduled_start_time": "18:00:00",
+            "monitor_hours": "3",
+            "recording_dir": "",
+            "enabled_message_push": False,
+            "platform": "TikTok",
+            "platform_key": "tiktok",
+            "only_notify_no_record": False,
+            "flv_use_direct_download": False,
+            "hot_standby": False,
+            "priority": "NORMAL",
+        }
+        for i in range(count)
+    ]
+
+
+def timed(label: str, count: int, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed * 1000:9.1f}ms  {count / elapsed:12,.0f}/s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Recording model")
+    parser.add_argument("--recordings", type=int, default=50000, help="Number of recordings")
+    args = parser.parse_args()
+
+    # Watch the same attributes as the running app does
+    index = RecordingIndex()
+    Recording.add_update_listener(index.on_recording_update, RecordingIndex.INDEXED_ATTRIBUTES)
+    records = make_records(args.recordings)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    recordings = [Recording.from_dict(record) for record in records]
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"{'memory':<10} {used / 1024 / 1024:9.1f}MB  {used / args.recordings:12,.0f} bytes per recording")
+
+    timed("from_dict", args.recordings, lambda: [Recording.from_dict(record) for record in records])
+    timed("to_dict", args.recordings, lambda: [recording.to_dict() for recording in recordings])
+    timed("construct", args.recordings, lambda: [
+        Recording(
+            record["rec_id"], record["url"], record["streamer_name"], record["record_format"], record["quality"],
+            record["segment_record"], record["segment_time"], record["monitor_status"],
+            record["scheduled_recording"], record["scheduled_start_time"], record["monitor_hours"],
+            record["recording_dir"], record["enabled_message_push"], record["only_notify_no_record"],
+            record["flv_use_direct_download"],
+        )
+        for record in records
+    ])
+
+
+if __name__ == "__main__":
+    main()
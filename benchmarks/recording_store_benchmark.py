@@ -0,0 +1,74 @@
+"""
+Compare save and load times of the recording store backends.
+
+Each round changes the monitor status of a few recordings and saves, like toggling cards in the UI.
+The JSON backend rewrites the whole file, the journal appends the changed fields and SQLite upserts the rows.
+
+Usage:
+    python -m benchmarks.recording_store_benchmark --recordings 10000 --rounds 50 --changes 1
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+from app.core.config.config_manager import ConfigManager
+from app.core.config.recording_store import RecordingStorageBackend, create_recording_store
+from app.models.recording.recording_model import Recording
+
+
+def make_recordings(count: int) -> list[Recording]:
+    recordings = []
+    for i in range(count):
+        recording = Recording(
+            f"rec-{i:06d}", f"https://www.tiktok.com/@streamer{i}/live", f"streamer{i}", "ts", "OD",
+            True, "1800", True, False, "18:00:00", "3", "", False, False, False,
+        )
+        recording.platform, recording.platform_key = "TikTok", "tiktok"
+        recordings.append(recording)
+    return recordings
+
+
+async def run(backend: str, count: int, rounds: int, changes: int) -> None:
+    with tempfile.TemporaryDirectory() as run_path:
+        config_manager = ConfigManager(run_path)
+        store = create_recording_store(config_manager, backend)
+        recordings = make_recordings(count)
+        store.load()
+        await store.save(store.snapshot(recordings, None))
+
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            dirty = rng.sample(recordings, changes)
+            for recording in dirty:
+                recording.update({"monitor_status": not recording.monitor_status})
+            await store.save(store.snapshot(recordings, {recording.rec_id for recording in dirty}))
+        save_time = (time.perf_counter() - start) / rounds
+
+        if hasattr(store, "close"):
+            store.close()
+        start = time.perf_counter()
+        loaded = create_recording_store(config_manager, backend).load()
+        load_time = time.perf_counter() - start
+
+        expected = {recording.rec_id: recording.monitor_status for recording in recordings}
+        assert {record["rec_id"]: record["monitor_status"] for record in loaded} == expected
+        print(f"{backend:<8} save {save_time * 1000:9.2f}ms  load {load_time * 1000:9.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the recording store backends")
+    parser.add_argument("--recordings", type=int, default=10000, help="Number of recordings")
+    parser.add_argument("--rounds", type=int, default=50, help="Number of saves")
+    parser.add_argument("--changes", type=int, default=1, help="Recordings changed per save")
+    args = parser.parse_args()
+
+    print(f"{args.recordings} recordings, {args.changes} changed per save, {args.rounds} saves")
+    for backend in RecordingStorageBackend.get_backends():
+        asyncio.run(run(backend, args.recordings, args.rounds, args.changes))
+
+
+if __name__ == "__main__":
+    main()
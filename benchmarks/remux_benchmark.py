@@ -0,0 +1,74 @@
+"""
+Compare the ffmpeg subprocess remux path with the in-process PyAV remuxer.
+
+Usage:
+    python -m benchmarks.remux_benchmark --files 20 --duration 10
+"""
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+
+from app.core.media.remuxer import InProcessRemuxer
+
+
+def make_sample_ts(path: str, duration: int) -> None:
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"testsrc=size=1280x720:rate=30:duration={duration}",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={duration}",
+            "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac",
+            "-f", "mpegts", path,
+        ],
+        check=True,
+    )
+
+
+def remux_with_ffmpeg(input_path: str, output_path: str) -> None:
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-i", input_path, "-c:v", "copy", "-c:a", "copy", "-f", "mp4",
+         output_path],
+        check=True,
+    )
+
+
+def run(label: str, func, inputs: list[str]) -> float:
+    start = time.perf_counter()
+    for input_path in inputs:
+        func(input_path, input_path.rsplit(".", maxsplit=1)[0] + f".{label}.mp4")
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} total {elapsed:8.3f}s  per file {elapsed / len(inputs) * 1000:8.1f}ms")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark TS to MP4 remux engines")
+    parser.add_argument("--files", type=int, default=20, help="Number of TS segments to remux")
+    parser.add_argument("--duration", type=int, default=10, help="Duration of each segment in seconds")
+    args = parser.parse_args()
+
+    if not InProcessRemuxer.is_available():
+        raise SystemExit("PyAV is not installed: pip install av")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        sample_path = os.path.join(work_dir, "sample.ts")
+        make_sample_ts(sample_path, args.duration)
+        inputs = []
+        with open(sample_path, "rb") as f:
+            data = f.read()
+        for i in range(args.files):
+            path = os.path.join(work_dir, f"segment_{i:03d}.ts")
+            with open(path, "wb") as f:
+                f.write(data)
+            inputs.append(path)
+
+        print(f"{args.files} files, {len(data) / 1024 / 1024:.2f} MB each")
+        ffmpeg_time = run("ffmpeg", remux_with_ffmpeg, inputs)
+        pyav_time = run("pyav", InProcessRemuxer().remux, inputs)
+        print(f"speedup  {ffmpeg_time / pyav_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import argparse
+import asyncio
 import multiprocessing
 import os
+import sys
 
 import flet as ft
 from dotenv import load_dotenv
@@ -8,6 +10,8 @@ from screeninfo import get_monitors
 
 from app.app_manager import App, execute_dir
 from app.auth.auth_manager import AuthManager
+from app.core.recording.bulk_transfer import BulkFormat, export_file, import_file
+from app.core.runtime.instance_lock import InstanceLock
 from app.lifecycle.app_close_handler import handle_app_close
 from app.lifecycle.tray_manager import TrayManager
 from app.ui.components.common.save_progress_overlay import SaveProgressOverlay
@@ -79,6 +83,8 @@ def handle_disconnect(page: ft.Page) -> callable:
 
     def disconnect(_: ft.ControlEvent) -> None:
         page.pubsub.unsubscribe_all()
+        page.data.config_watcher.unregister(page.data)
+        page.data.record_card_manager.stop_update_task()
 
     return disconnect
 
@@ -136,9 +142,7 @@ async def main(page: ft.Page) -> None:
         page.on_route_change = handle_route_change(page, app)
         page.window.prevent_close = True
         page.window.on_event = handle_window_event(page, app, save_progress_overlay)
-        if is_web:
-            page.on_disconnect = handle_disconnect(page)
-        elif page.platform.value == "windows":
+        if not is_web and page.platform.value == "windows":
             if hasattr(app, "tray_manager"):
                 try:
                     app.tray_manager.start(page)
@@ -147,8 +151,11 @@ async def main(page: ft.Page) -> None:
 
         page.update()
         page.on_route_change(ft.RouteChangeEvent(route=page.route))
+        await app.config_watcher.register(app)
 
     if is_web:
+        # Set before the login page, so sessions closed there are cleaned up too
+        page.on_disconnect = handle_disconnect(page)
         auth_manager = AuthManager(app)
         app.auth_manager = auth_manager
         await auth_manager.initialize()
@@ -189,20 +196,43 @@ if __name__ == "__main__":
     parser.add_argument("--web", action="store_true", help="Run the app in web mode")
     parser.add_argument("--host", type=str, default=default_host, help=f"Host address (default: {default_host})")
     parser.add_argument("--port", type=int, default=default_port, help=f"Port number (default: {default_port})")
+    parser.add_argument(
+        "--import-recordings", metavar="PATH", help="Import recordings from a CSV, JSONL or text file and exit"
+    )
+    parser.add_argument("--export-recordings", metavar="PATH", help="Export the recordings to a file and exit")
+    parser.add_argument(
+        "--format", choices=BulkFormat.get_formats(), help="Import/export file format (default: from the extension)"
+    )
     args = parser.parse_args()
 
     multiprocessing.freeze_support()
-    if args.web or platform == "web":
-        logger.debug("Running in web mode on http://" + args.host + ":" + str(args.port))
-        ft.app(
-            target=main,
-            view=ft.AppView.WEB_BROWSER,
-            host=args.host,
-            port=args.port,
-            assets_dir=ASSETS_DIR,
-            use_color_emoji=True,
-            web_renderer=ft.WebRenderer.CANVAS_KIT
-        )
-
+    if args.import_recordings:
+        try:
+            result = asyncio.run(import_file(execute_dir, args.import_recordings, args.format))
+        except RuntimeError as e:
+            logger.error(f"Import recordings refused: {e}")
+            sys.exit(1)
+        logger.info(f"Imported {args.import_recordings}: {result}")
+    elif args.export_recordings:
+        count = asyncio.run(export_file(execute_dir, args.export_recordings, args.format))
+        logger.info(f"Exported {count} recordings to {args.export_recordings}")
     else:
-        ft.app(target=main, assets_dir=ASSETS_DIR)
+        # Held until the process exits, the offline import refuses to run meanwhile
+        instance_lock = InstanceLock(os.path.join(execute_dir, "config"))
+        if not instance_lock.acquire():
+            logger.warning("Another instance of the app is using this config directory")
+
+        if args.web or platform == "web":
+            logger.debug("Running in web mode on http://" + args.host + ":" + str(args.port))
+            ft.app(
+                target=main,
+                view=ft.AppView.WEB_BROWSER,
+                host=args.host,
+                port=args.port,
+                assets_dir=ASSETS_DIR,
+                use_color_emoji=True,
+                web_renderer=ft.WebRenderer.CANVAS_KIT
+            )
+
+        else:
+            ft.app(target=main, assets_dir=ASSETS_DIR)